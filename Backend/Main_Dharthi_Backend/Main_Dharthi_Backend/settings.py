@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'api',
     'rest_framework',
+    'django_filters',
     'corsheaders',
 ]
 
@@ -83,18 +84,71 @@ WSGI_APPLICATION = 'Main_Dharthi_Backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.mysql')
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    # Local development and CI:
+    #   DB_ENGINE=django.db.backends.sqlite3 SECRET_KEY=dev python manage.py test
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            # Take the write lock at BEGIN and wait for it, so concurrent
+            # writers queue up instead of failing with "database is locked".
+            'OPTIONS': {'timeout': 20, 'transaction_mode': 'IMMEDIATE'},
+            # A file (not the shared in-memory default) so that thread-based
+            # concurrency tests get real locking.
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME',''),
+            'USER': os.getenv('DB_USER',''),
+            'PASSWORD': os.getenv('DB_PASSWORD',''),
+            'HOST': os.getenv('DB_HOST',''),
+            'PORT': os.getenv('DB_PORT',''),
+        }
+    }
+
+AUTH_USER_MODEL='api.User'
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Any Django cache backend works (e.g. django.core.cache.backends.redis.RedisCache
+# with CACHE_LOCATION=redis://127.0.0.1:6379); locmem is per-process, see API_CACHE_ENABLED.
+
+CACHES = {
     'default': {
-        'ENGINE':'django.db.backends.mysql',
-        'NAME': os.getenv('DB_NAME',''),
-        'USER': os.getenv('DB_USER',''),
-        'PASSWORD': os.getenv('DB_PASSWORD',''),
-        'HOST': os.getenv('DB_HOST',''),
-        'PORT': os.getenv('DB_PORT',''),
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'dharti-api'),
     }
 }
 
-AUTH_USER_MODEL='api.User'
+# Catalog and product list/detail responses (api/cache.py)
+API_CACHE_ALIAS = 'default'
+# Writes retire cached responses through counters in the cache, so every worker
+# process must see the same cache. locmem does not: under several gunicorn
+# workers the others would keep serving stale responses. The response cache is
+# therefore off with locmem unless DEBUG (one runserver process) is on;
+# API_CACHE_ENABLED=True/False overrides that.
+API_CACHE_ENABLED = os.getenv(
+    'API_CACHE_ENABLED', str(DEBUG or CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache'),
+) == 'True'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', '300'))
+
+# Retention of ai-logs and transactions (api/archive.py, manage.py archive_old_rows)
+ARCHIVE_DIR = Path(os.getenv('ARCHIVE_DIR') or BASE_DIR / 'archive')
+ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '90'))
+ARCHIVE_CHUNK_ROWS = int(os.getenv('ARCHIVE_CHUNK_ROWS', '5000'))
+
+# Restock suggestions from sales velocity (api/restock.py, manage.py suggest_restock)
+RESTOCK_VELOCITY_DAYS = int(os.getenv('RESTOCK_VELOCITY_DAYS', '28'))
+RESTOCK_LEAD_DAYS = int(os.getenv('RESTOCK_LEAD_DAYS', '7'))
+RESTOCK_COVER_DAYS = int(os.getenv('RESTOCK_COVER_DAYS', '14'))
+RESTOCK_SAFETY_Z = float(os.getenv('RESTOCK_SAFETY_Z', '1.65'))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -142,6 +196,6 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.IdCursorPagination',
     'PAGE_SIZE': 10,
 }
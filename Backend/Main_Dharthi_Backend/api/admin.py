@@ -1,3 +1,59 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import User, Product, Catalog, CatalogProduct, Transaction, RestockReminder, AILog
+
+# Every model's __str__ reads a related row, so each changelist joins those
+# relations up front instead of issuing one query per row.
+
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    list_display = ('username', 'phone', 'role', 'created_at')
+    list_filter = ('role',)
+    search_fields = ('username', 'phone')
+
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'category', 'price', 'stock_qty', 'created_at')
+    list_filter = ('category',)
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('name', 'description')
+
+
+@admin.register(Catalog)
+class CatalogAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'created_at')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(CatalogProduct)
+class CatalogProductAdmin(admin.ModelAdmin):
+    list_display = ('__str__',)
+    list_select_related = ('catalog', 'product')
+    raw_id_fields = ('catalog', 'product')
+
+
+@admin.register(Transaction)
+class TransactionAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'amount', 'status', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('user', 'product')
+    raw_id_fields = ('user', 'product')
+
+
+@admin.register(RestockReminder)
+class RestockReminderAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'season_note', 'created_at')
+    list_select_related = ('user', 'product')
+    raw_id_fields = ('user', 'product')
+
+
+@admin.register(AILog)
+class AILogAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'timestamp')
+    list_filter = ('action_type',)
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
@@ -0,0 +1,159 @@
+"""Retention for the append-only tables: old rows move to gzip JSONL files.
+
+``archive_rows`` takes the rows of a kind that are older than a cutoff, writes
+them to ``ARCHIVE_DIR/<kind>/<user>/<YYYY-MM>/<first_id>-<last_id>.jsonl.gz``
+(one user and one calendar month per file, at most ``ARCHIVE_CHUNK_ROWS``
+rows), records each file as an ``ArchiveChunk`` and deletes the rows from the
+hot table. Rows are stored exactly as the list endpoint serializes them.
+
+``read_archive`` answers "rows of user X between two times" from the chunk
+index, opening only the files whose user and time span can match.
+"""
+import gzip
+import heapq
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import AILog, ArchiveChunk, Transaction
+from .serializers import AILogSerializer, TransactionSerializer
+
+DELETE_BATCH = 500
+
+
+@dataclass(frozen=True)
+class Archivable:
+    model: type
+    time_field: str
+    serializer_class: type
+    # Rows that must stay in the hot table whatever their age.
+    keep: dict = field(default_factory=dict)
+
+    def old_rows(self, cutoff):
+        return self.model.objects.filter(**{f'{self.time_field}__lt': cutoff}).exclude(**self.keep)
+
+
+ARCHIVABLE = {
+    'ai-logs': Archivable(AILog, 'timestamp', AILogSerializer),
+    # A pending sale can still be completed, so it is never archived.
+    'transactions': Archivable(Transaction, 'created_at', TransactionSerializer, keep={'status': 'pending'}),
+}
+
+
+def _month_bounds(moment):
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+def _chunk_path(kind, user_id, first, last):
+    month = getattr(first, ARCHIVABLE[kind].time_field).strftime('%Y-%m')
+    return os.path.join(kind, str(user_id), month, f'{first.pk}-{last.pk}.jsonl.gz')
+
+
+def _write_chunk(path, rows):
+    """Write ``rows`` to ``path`` under ``ARCHIVE_DIR`` atomically (a reader never sees half a file)."""
+    full_path = os.path.join(settings.ARCHIVE_DIR, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    tmp_path = f'{full_path}.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row, separators=(',', ':')))
+            f.write('\n')
+    os.replace(tmp_path, full_path)
+
+
+def _read_chunk(path):
+    with gzip.open(os.path.join(settings.ARCHIVE_DIR, path), 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def _archive_chunk(kind, rows):
+    archivable = ARCHIVABLE[kind]
+    first, last = rows[0], rows[-1]
+    path = _chunk_path(kind, first.user_id, first, last)
+    _write_chunk(path, archivable.serializer_class(rows, many=True).data)
+    ids = [row.pk for row in rows]
+    try:
+        with transaction.atomic():
+            ArchiveChunk.objects.create(
+                kind=kind, user_id=first.user_id, first_id=min(ids), last_id=max(ids),
+                start=getattr(first, archivable.time_field), end=getattr(last, archivable.time_field),
+                rows=len(rows), path=path,
+            )
+            for i in range(0, len(ids), DELETE_BATCH):
+                archivable.model.objects.filter(pk__in=ids[i:i + DELETE_BATCH]).delete()
+    except Exception:
+        os.remove(os.path.join(settings.ARCHIVE_DIR, path))
+        raise
+
+
+def archive_rows(kind, cutoff, chunk_rows=None, dry_run=False):
+    """Move the rows of ``kind`` older than ``cutoff`` to the archive.
+
+    Returns ``{'rows': ..., 'chunks': ...}``; with ``dry_run`` nothing is
+    written and only ``rows`` (the number that would move) is filled in.
+    """
+    archivable = ARCHIVABLE[kind]
+    chunk_rows = chunk_rows or settings.ARCHIVE_CHUNK_ROWS
+    old_rows = archivable.old_rows(cutoff)
+    if dry_run:
+        return {'rows': old_rows.count(), 'chunks': 0}
+
+    moved = chunks = 0
+    user_ids = list(old_rows.order_by().values_list('user_id', flat=True).distinct())
+    for user_id in user_ids:
+        user_rows = old_rows.filter(user_id=user_id).order_by(archivable.time_field, 'id')
+        while True:
+            # Each archived chunk is deleted, so the oldest row left starts the next one.
+            oldest = user_rows.values_list(archivable.time_field, flat=True).first()
+            if oldest is None:
+                break
+            month_start, month_end = _month_bounds(oldest)
+            rows = list(user_rows.filter(**{
+                f'{archivable.time_field}__gte': month_start, f'{archivable.time_field}__lt': month_end,
+            })[:chunk_rows])
+            _archive_chunk(kind, rows)
+            moved += len(rows)
+            chunks += 1
+    return {'rows': moved, 'chunks': chunks}
+
+
+def read_archive(kind, user_id=None, after=None, before=None, before_id=None, limit=10):
+    """Archived rows of ``kind``, newest id first, at most ``limit`` of them.
+
+    ``after``/``before`` bound the row time (both inclusive) and
+    ``before_id`` continues a previous page. Returns ``(rows, more)``.
+    """
+    archivable = ARCHIVABLE[kind]
+    chunks = ArchiveChunk.objects.filter(kind=kind)
+    if user_id is not None:
+        chunks = chunks.filter(user_id=user_id)
+    if after is not None:
+        chunks = chunks.filter(end__gte=after)
+    if before is not None:
+        chunks = chunks.filter(start__lte=before)
+    if before_id is not None:
+        chunks = chunks.filter(first_id__lt=before_id)
+
+    # Chunks of different users overlap in id, so keep reading (highest
+    # last_id first) until no unread chunk can hold an id above the page.
+    found = []
+    for chunk in chunks.order_by('-last_id').only('path', 'last_id').iterator():
+        if len(found) > limit and chunk.last_id < found[0][0]:
+            break
+        for row in _read_chunk(chunk.path):
+            if before_id is not None and row['id'] >= before_id:
+                continue
+            time = parse_datetime(row[archivable.time_field])
+            if (after is not None and time < after) or (before is not None and time > before):
+                continue
+            heapq.heappush(found, (row['id'], row))
+            if len(found) > limit + 1:
+                heapq.heappop(found)
+    rows = [row for _, row in sorted(found, key=lambda item: item[0], reverse=True)]
+    return rows[:limit], len(rows) > limit
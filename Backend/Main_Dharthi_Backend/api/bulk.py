@@ -0,0 +1,147 @@
+import copy
+
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .cache import invalidate
+
+MAX_BULK_ITEMS = 500
+
+
+class BulkModelMixin:
+    """Adds ``<resource>/bulk/`` to a ModelViewSet.
+
+    - ``POST``   a list of objects to create them.
+    - ``PATCH``  a list of ``{"id": ..., <fields>}`` to partially update them;
+      an id may appear once, later items with the same id are errors.
+    - ``DELETE`` ``{"ids": [...]}`` to delete them.
+
+    Every item is validated with the viewset's serializer, all valid items are
+    written in one database transaction with ``bulk_create``/``bulk_update``,
+    and the response carries one result per item, in request order.
+
+    On databases that do not return primary keys from a multi-row INSERT
+    (MySQL), created rows are saved one by one so the response can carry
+    their ids, unless ``bulk_create_returns_ids`` is False.
+    """
+
+    bulk_create_returns_ids = True
+
+    def bulk_written(self, changes):
+        """Called inside the write's transaction for rows written without ``save()``.
+
+        ``changes`` is a list of ``(previous, instance)``, ``previous`` being
+        None for created rows; model signals did not run for any of them.
+        """
+
+    def _bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return None, Response({'detail': 'Expected a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > MAX_BULK_ITEMS:
+            return None, Response(
+                {'detail': f'At most {MAX_BULK_ITEMS} items per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return items, None
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        if request.method == 'POST':
+            return self.bulk_create(request)
+        if request.method == 'PATCH':
+            return self.bulk_update(request)
+        return self.bulk_destroy(request)
+
+    def bulk_create(self, request):
+        items, error = self._bulk_items(request)
+        if error:
+            return error
+        model = self.get_queryset().model
+        results, instances = [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                instances.append((index, model(**serializer.validated_data)))
+                results.append(None)
+            else:
+                results.append({'index': index, 'status': 'error', 'errors': serializer.errors})
+
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert or not self.bulk_create_returns_ids:
+                model.objects.bulk_create([instance for _, instance in instances])
+                self.bulk_written([(None, instance) for _, instance in instances])
+            else:
+                # MySQL does not hand back primary keys from a multi-row INSERT.
+                for _, instance in instances:
+                    instance.save(force_insert=True)
+            invalidate(model._meta.label_lower)
+
+        for index, instance in instances:
+            results[index] = {'index': index, 'status': 'created', 'data': self.get_serializer(instance).data}
+        code = status.HTTP_201_CREATED if instances else status.HTTP_400_BAD_REQUEST
+        return Response({'results': results}, status=code)
+
+    def bulk_update(self, request):
+        items, error = self._bulk_items(request)
+        if error:
+            return error
+        ids = [item.get('id') for item in items if isinstance(item, dict) and isinstance(item.get('id'), int)]
+        with transaction.atomic():
+            existing = self.get_queryset().select_for_update().in_bulk(ids)
+            results, previous, updated, changed_fields, seen = [], [], [], set(), set()
+            for index, item in enumerate(items):
+                if not isinstance(item, dict) or not isinstance(item.get('id'), int):
+                    results.append({'index': index, 'status': 'error',
+                                    'errors': {'id': ['A valid integer is required.']}})
+                    continue
+                instance = existing.get(item['id'])
+                if instance is None:
+                    results.append({'index': index, 'status': 'error', 'errors': {'id': ['Not found.']}})
+                    continue
+                if instance.pk in seen:
+                    # One change per row: bulk_written gets one (previous, final) pair each.
+                    results.append({'index': index, 'status': 'error',
+                                    'errors': {'id': ['Duplicate id in this request.']}})
+                    continue
+                seen.add(instance.pk)
+                serializer = self.get_serializer(instance, data=item, partial=True)
+                if not serializer.is_valid():
+                    results.append({'index': index, 'status': 'error', 'errors': serializer.errors})
+                    continue
+                previous.append(copy.copy(instance))
+                for field, value in serializer.validated_data.items():
+                    setattr(instance, field, value)
+                changed_fields.update(serializer.validated_data)
+                updated.append(instance)
+                results.append({'index': index, 'status': 'updated', 'data': None})
+            if updated and changed_fields:
+                self.get_queryset().model.objects.bulk_update(updated, sorted(changed_fields))
+                self.bulk_written(list(zip(previous, updated)))
+                invalidate(self.get_queryset().model._meta.label_lower)
+
+        for result in results:
+            if result['status'] == 'updated':
+                result['data'] = self.get_serializer(existing[items[result['index']]['id']]).data
+        return Response({'results': results})
+
+    def bulk_destroy(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) for pk in ids):
+            return Response({'detail': 'Expected {"ids": [<int>, ...]}.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_BULK_ITEMS:
+            return Response(
+                {'detail': f'At most {MAX_BULK_ITEMS} items per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=ids)
+            found = set(queryset.values_list('pk', flat=True))
+            queryset.delete()
+        results = [
+            {'index': index, 'id': pk, 'status': 'deleted' if pk in found else 'not_found'}
+            for index, pk in enumerate(ids)
+        ]
+        return Response({'results': results})
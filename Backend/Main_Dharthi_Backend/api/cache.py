@@ -0,0 +1,124 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+
+STATS_KEYS = ('hit', 'miss', 'not_modified')
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _generation_key(label):
+    return f'api:gen:{label}'
+
+
+def _generations(labels):
+    cache = get_cache()
+    keys = [_generation_key(label) for label in labels]
+    found = cache.get_many(keys)
+    return [str(found.get(key, 0)) for key in keys]
+
+
+def invalidate(*labels):
+    """Retire every cached response that depends on the given model labels.
+
+    Responses are keyed on a per-label generation counter, so bumping the
+    counter makes all older entries unreachable (they age out on their TTL).
+    The bump waits for the surrounding transaction to commit, otherwise a
+    concurrent reader could re-cache the pre-commit rows under the new
+    generation.
+    """
+    def bump():
+        cache = get_cache()
+        for label in labels:
+            key = _generation_key(label)
+            cache.add(key, 0, timeout=None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def record(event):
+    cache = get_cache()
+    key = f'api:stats:{event}'
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def stats():
+    cache = get_cache()
+    found = cache.get_many([f'api:stats:{event}' for event in STATS_KEYS])
+    counts = {event: found.get(f'api:stats:{event}', 0) for event in STATS_KEYS}
+    lookups = counts['hit'] + counts['miss']
+    counts['hit_ratio'] = round(counts['hit'] / lookups, 4) if lookups else 0.0
+    return counts
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(',')}
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+class CachedResponseMixin:
+    """Read-through cache for ``list`` and ``retrieve`` JSON responses.
+
+    Entries are keyed on the full request URI (object id and query params)
+    plus the generation of every model in ``cache_dependencies``; the
+    ``post_save``/``post_delete`` handlers in ``signals.py`` bump those
+    generations. Responses carry an ``ETag`` and answer a matching
+    ``If-None-Match`` with ``304``. Off unless ``API_CACHE_ENABLED``.
+    """
+    cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, view, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if renderer.format != 'json' or not settings.API_CACHE_ENABLED:
+            # The browsable API renders forms and is not worth caching.
+            return view(request, *args, **kwargs)
+
+        # Absolute URI: the cursor links inside a page include the host.
+        uri = request.build_absolute_uri()
+        fingerprint = ':'.join([uri, *_generations(self.cache_dependencies)])
+        key = f'api:resp:{self.basename}:{hashlib.md5(fingerprint.encode()).hexdigest()}'
+        cache = get_cache()
+        entry = cache.get(key)
+
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            content = renderer.render(response.data, request.accepted_media_type, self.get_renderer_context())
+            entry = {'content': content, 'etag': f'"{hashlib.md5(content).hexdigest()}"'}
+            cache.set(key, entry, settings.API_CACHE_TIMEOUT)
+            state = 'miss'
+        else:
+            state = 'hit'
+
+        record(state)
+        if _etag_matches(request, entry['etag']):
+            record('not_modified')
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry['content'], content_type=renderer.media_type)
+        response['ETag'] = entry['etag']
+        response['X-Cache'] = state.upper()
+        return response
@@ -0,0 +1,47 @@
+import django_filters
+from .models import Catalog, Product, RestockReminder, Transaction
+
+
+class ProductFilter(django_filters.FilterSet):
+    # Plain id filters: a ModelChoiceFilter would first fetch the user row just to validate it.
+    user = django_filters.NumberFilter(field_name='user_id')
+    min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    min_stock = django_filters.NumberFilter(field_name='stock_qty', lookup_expr='gte')
+    max_stock = django_filters.NumberFilter(field_name='stock_qty', lookup_expr='lte')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lte')
+
+    class Meta:
+        model = Product
+        fields = ['category']
+
+
+class TransactionFilter(django_filters.FilterSet):
+    user = django_filters.NumberFilter(field_name='user_id')
+    product = django_filters.NumberFilter(field_name='product_id')
+    min_amount = django_filters.NumberFilter(field_name='amount', lookup_expr='gte')
+    max_amount = django_filters.NumberFilter(field_name='amount', lookup_expr='lte')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lte')
+
+    class Meta:
+        model = Transaction
+        fields = ['status']
+
+
+class CatalogFilter(django_filters.FilterSet):
+    user = django_filters.NumberFilter(field_name='user_id')
+
+    class Meta:
+        model = Catalog
+        fields = []
+
+
+class RestockReminderFilter(django_filters.FilterSet):
+    user = django_filters.NumberFilter(field_name='user_id')
+    product = django_filters.NumberFilter(field_name='product_id')
+
+    class Meta:
+        model = RestockReminder
+        fields = ['source']
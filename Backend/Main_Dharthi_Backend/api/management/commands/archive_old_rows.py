@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.archive import ARCHIVABLE, archive_rows
+
+
+class Command(BaseCommand):
+    help = 'Move ai-logs and finished transactions older than the retention period to gzip JSONL archive files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_RETENTION_DAYS,
+                            help='Archive rows older than this many days (default: ARCHIVE_RETENTION_DAYS).')
+        parser.add_argument('--kind', choices=sorted(ARCHIVABLE), action='append',
+                            help='Only archive this kind; may be repeated (default: all).')
+        parser.add_argument('--chunk-rows', type=int, default=settings.ARCHIVE_CHUNK_ROWS,
+                            help='Most rows per archive file.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be archived.')
+
+    def handle(self, *args, days, kind, chunk_rows, dry_run, **options):
+        cutoff = timezone.now() - timedelta(days=days)
+        for name in kind or sorted(ARCHIVABLE):
+            result = archive_rows(name, cutoff, chunk_rows=chunk_rows, dry_run=dry_run)
+            if dry_run:
+                self.stdout.write(f'{name}: {result["rows"]} rows older than {cutoff:%Y-%m-%d %H:%M} would be archived')
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{name}: archived {result["rows"]} rows in {result["chunks"]} files under {settings.ARCHIVE_DIR}'
+                ))
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.restock import suggest_restock
+
+
+class Command(BaseCommand):
+    help = 'Write restock reminders for every product from its sales velocity, stock and last year\'s season.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='Only this user\'s products; may be repeated (default: all users).')
+        parser.add_argument('--window', type=int, default=settings.RESTOCK_VELOCITY_DAYS,
+                            help='Days of sales the velocity is measured over.')
+        parser.add_argument('--lead-days', type=int, default=settings.RESTOCK_LEAD_DAYS,
+                            help='Days between ordering and the stock arriving.')
+        parser.add_argument('--cover-days', type=int, default=settings.RESTOCK_COVER_DAYS,
+                            help='Days of sales the delivery should last.')
+        parser.add_argument('--dry-run', action='store_true', help='Only print how many reminders would be written.')
+
+    def handle(self, *args, users, window, lead_days, cover_days, dry_run, **options):
+        suggestions = suggest_restock(
+            user_ids=users, window=window, lead_days=lead_days, cover_days=cover_days, dry_run=dry_run,
+        )
+        verb = 'would write' if dry_run else 'wrote'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {len(suggestions)} restock reminders for {suggestions["user_id"].nunique()} users'
+            f' ({int(suggestions["suggested_qty"].sum())} units)'
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ailog',
+            index=models.Index(fields=['user', 'action_type', 'timestamp'], name='ailog_user_action_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['user', 'category'], name='product_user_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restockreminder',
+            index=models.Index(fields=['product', 'created_at'], name='restock_product_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'status', 'created_at'], name='txn_user_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='quantity',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.2 on 2026-10-17 22:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    # Sales completed before the rollups existed.
+    Transaction = apps.get_model('api', 'Transaction')
+    DailySalesRollup = apps.get_model('api', 'DailySalesRollup')
+    totals = (
+        Transaction.objects.filter(status='completed')
+        .values('user_id', 'product_id', day=TruncDate('created_at'))
+        .annotate(count=Count('id'), amount=Sum('amount'), units=Sum('quantity'))
+        .order_by()
+    )
+    DailySalesRollup.objects.bulk_create((DailySalesRollup(**row) for row in totals.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_archive_chunks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='api.product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'day'], name='rollup_user_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'product', 'day'), name='rollup_user_product_day_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 22:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_daily_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restockreminder',
+            name='source',
+            field=models.CharField(choices=[('manual', 'Manual'), ('engine', 'Sales velocity')], default='manual', max_length=10),
+        ),
+    ]
@@ -28,6 +28,12 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     remarks = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # "products for user X by category"
+            models.Index(fields=['user', 'category'], name='product_user_category_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.user.username}"
 
@@ -59,19 +65,59 @@ class Transaction(models.Model):
     payment_link = models.URLField(default="http://example.com/payment")
     reference_no = models.CharField(max_length=100, default=uuid.uuid4, editable=False, unique=True)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField(default=1)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # "transactions for user X by status ordered by created_at"
+            models.Index(fields=['user', 'status', 'created_at'], name='txn_user_status_created_idx'),
+        ]
+
     def __str__(self):
         return f"Transaction: {self.user.username} -> {self.product.name} ({self.status})"
 
+class DailySalesRollup(models.Model):
+    """Completed sales of one product on one day, kept current by api/rollups.py."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sales_rollups')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='sales_rollups')
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product', 'day'], name='rollup_user_product_day_uniq'),
+        ]
+        indexes = [
+            # "sales of user X between two days"
+            models.Index(fields=['user', 'day'], name='rollup_user_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"Sales: {self.product.name} on {self.day} ({self.count})"
+
 class RestockReminder(models.Model):
+    SOURCE_CHOICES = [
+        ('manual', 'Manual'),
+        ('engine', 'Sales velocity'),
+    ]
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='restock_reminders')
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='restock_reminders')
     suggested_qty = models.IntegerField()
     season_note = models.CharField(max_length=255)
+    # 'engine' reminders are rewritten on every run of suggest_restock (api/restock.py).
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='manual')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # "reminders per product", newest first
+            models.Index(fields=['product', 'created_at'], name='restock_product_created_idx'),
+        ]
+
     def __str__(self):
         return f"Restock: {self.product.name} for {self.user.username} ({self.suggested_qty})"
 
@@ -87,5 +133,40 @@ class AILog(models.Model):
     ai_output = models.JSONField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # "AI logs by user and action_type in time order"
+            models.Index(fields=['user', 'action_type', 'timestamp'], name='ailog_user_action_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"AILog: {self.user.username} - {self.action_type}"
+
+class ArchiveChunk(models.Model):
+    """Index of one gzip JSONL file of rows moved out of a hot table (see api/archive.py).
+
+    A chunk holds rows of one user from one calendar month, in id order.
+    """
+    KIND_CHOICES = [
+        ('ai-logs', 'AI Logs'),
+        ('transactions', 'Transactions'),
+    ]
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Plain ids: the archive outlives the rows (and users) it was made from.
+    user_id = models.BigIntegerField()
+    first_id = models.BigIntegerField()
+    last_id = models.BigIntegerField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    rows = models.PositiveIntegerField()
+    path = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # "archived rows of user X between two times"
+            models.Index(fields=['kind', 'user_id', 'end'], name='archive_kind_user_end_idx'),
+        ]
+
     def __str__(self):
-        return f"AILog: {self.user.username} - {self.action_type}"
\ No newline at end of file
+        return f"Archive: {self.kind} of user {self.user_id} ({self.rows} rows)"
@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination on ``-id``, the ordering every ViewSet already uses.
+
+    Each page is a ``WHERE id < <cursor>`` range scan on the primary key, so
+    the cost of a page does not grow with how deep into the list it is.
+    """
+    ordering = '-id'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
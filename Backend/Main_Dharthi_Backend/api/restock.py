@@ -0,0 +1,147 @@
+"""Restock suggestions for every product at once, from sales velocity.
+
+Sales come from the daily rollups (``DailySalesRollup``), so a run reads one
+row per product and selling day however many transactions there were, and
+archived transactions still count. For each product, with ``W`` the velocity
+window, ``L`` the supplier lead time and ``C`` the days of stock to cover
+after delivery:
+
+- velocity: units sold per day over the last ``W`` days, and the daily spread;
+- season: units per day in the ``L + C`` days that follow this date last
+  year, relative to the ``W`` days before it (1 without last year's sales,
+  clipped to ``SEASON_FACTOR_RANGE``);
+- suggested quantity: ``velocity * season * (L + C)``, plus safety stock
+  ``z * spread * sqrt(L)``, minus ``stock_qty``, rounded up.
+
+Everything is computed on whole columns with pandas/NumPy. Products with a
+positive suggestion get a ``RestockReminder`` with ``source='engine'``;
+a run replaces the engine reminders of the users it covered and leaves
+manual ones alone.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import DailySalesRollup, Product, RestockReminder
+
+DAYS_PER_YEAR = 365
+SEASON_FACTOR_RANGE = (0.5, 3.0)
+WRITE_BATCH = 1000
+
+
+def _frame(queryset, columns):
+    """Rows of a ``values_list`` queryset as a DataFrame, straight from the cursor.
+
+    Skips building a Python tuple per row through the ORM's converters; the
+    columns are converted whole afterwards.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
+def load_products(user_ids=None):
+    products = Product.objects.all()
+    if user_ids:
+        products = products.filter(user_id__in=user_ids)
+    return _frame(products.order_by('id').values_list('id', 'user_id', 'stock_qty'),
+                  ['product_id', 'user_id', 'stock_qty'])
+
+
+def load_sales(since, user_ids=None):
+    """Daily units per product from ``since`` on; ``day`` as datetime64."""
+    rollups = DailySalesRollup.objects.filter(day__gte=since)
+    if user_ids:
+        rollups = rollups.filter(user_id__in=user_ids)
+    sales = _frame(rollups.values_list('product_id', 'day', 'units'), ['product_id', 'day', 'units'])
+    sales['day'] = pd.to_datetime(sales['day'])
+    return sales
+
+
+def _units(sales, product_ids, mask, values=None):
+    """Per-product sum of ``values`` (default units) over the rows in ``mask``, aligned to ``product_ids``."""
+    values = sales['units'] if values is None else values
+    return values[mask].groupby(sales['product_id'][mask]).sum().reindex(product_ids, fill_value=0).to_numpy(float)
+
+
+def compute_suggestions(products, sales, today, window=None, lead_days=None, cover_days=None, z=None):
+    """Suggested restock quantity and note for every product that needs one.
+
+    Returns a DataFrame with ``product_id``, ``user_id``, ``suggested_qty``
+    and ``season_note``, one row per product whose suggestion is above 0.
+    """
+    window = window or settings.RESTOCK_VELOCITY_DAYS
+    lead_days = settings.RESTOCK_LEAD_DAYS if lead_days is None else lead_days
+    cover_days = settings.RESTOCK_COVER_DAYS if cover_days is None else cover_days
+    z = settings.RESTOCK_SAFETY_Z if z is None else z
+    horizon = lead_days + cover_days
+
+    ids = products['product_id'].to_numpy()
+    age = (pd.Timestamp(today) - sales['day']).dt.days.to_numpy()
+    units = sales['units'].astype(float)
+
+    recent = age < window
+    sold = _units(sales, ids, recent)
+    velocity = sold / window
+    spread = np.sqrt(np.maximum(_units(sales, ids, recent, units ** 2) / window - velocity ** 2, 0))
+
+    ahead = _units(sales, ids, (age >= DAYS_PER_YEAR - horizon) & (age < DAYS_PER_YEAR)) / max(horizon, 1)
+    before = _units(sales, ids, (age >= DAYS_PER_YEAR) & (age < DAYS_PER_YEAR + window)) / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        season = np.where((ahead > 0) & (before > 0), ahead / before, 1.0)
+    season = np.clip(season, *SEASON_FACTOR_RANGE)
+
+    stock = products['stock_qty'].to_numpy(float)
+    demand = velocity * season * horizon + z * spread * np.sqrt(lead_days)
+    suggested = np.ceil(np.maximum(demand - stock, 0)).astype(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_left = np.where(velocity > 0, stock / velocity, np.inf)
+
+    need = suggested > 0
+    notes = [
+        f'Sells {v:.1f}/day (last {window} days), season x{f:.2f}; '
+        f'{int(s)} in stock lasts {"-" if np.isinf(d) else f"{d:.0f}"} days; covers {lead_days}-day lead time + {cover_days} days'
+        for v, f, s, d in zip(velocity[need], season[need], stock[need], days_left[need])
+    ]
+    return pd.DataFrame({
+        'product_id': ids[need],
+        'user_id': products['user_id'].to_numpy()[need],
+        'suggested_qty': suggested[need],
+        'season_note': notes,
+    })
+
+
+def write_reminders(suggestions, user_ids=None):
+    """Replace the engine reminders of ``user_ids`` (all users when None) with ``suggestions``."""
+    reminders = (
+        RestockReminder(user_id=user_id, product_id=product_id, suggested_qty=qty, season_note=note, source='engine')
+        for product_id, user_id, qty, note in zip(
+            suggestions['product_id'].tolist(), suggestions['user_id'].tolist(),
+            suggestions['suggested_qty'].tolist(), suggestions['season_note'].tolist(),
+        )
+    )
+    with transaction.atomic():
+        stale = RestockReminder.objects.filter(source='engine')
+        if user_ids:
+            stale = stale.filter(user_id__in=user_ids)
+        stale.delete()
+        RestockReminder.objects.bulk_create(reminders, batch_size=WRITE_BATCH)
+
+
+def suggest_restock(user_ids=None, today=None, window=None, lead_days=None, cover_days=None, z=None, dry_run=False):
+    """Compute and (unless ``dry_run``) write restock reminders; returns the suggestions."""
+    today = today or timezone.localdate()
+    window = window or settings.RESTOCK_VELOCITY_DAYS
+    # Far enough back for the window before this date last year.
+    since = today - timedelta(days=DAYS_PER_YEAR + window)
+    products = load_products(user_ids)
+    sales = load_sales(since, user_ids)
+    suggestions = compute_suggestions(products, sales, today, window, lead_days, cover_days, z)
+    if not dry_run:
+        write_reminders(suggestions, user_ids)
+    return suggestions
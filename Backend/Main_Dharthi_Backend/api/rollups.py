@@ -0,0 +1,100 @@
+"""Daily per-product totals of completed sales, kept current as transactions change.
+
+A transaction counts towards the ``DailySalesRollup`` of its user, product
+and creation day while its status is ``completed``. Every write that can
+change that reports ``(previous, current)`` pairs to ``record_changes`` in its
+own database transaction:
+
+- ``complete_transaction`` (pending -> completed),
+- ``save()`` of a single transaction, through the signals in ``signals.py``,
+- the bulk endpoints, which skip ``save()``, through ``BulkModelMixin.bulk_written``.
+
+Deleting a transaction, by hand or with ``archive_old_rows``, leaves the
+totals alone: the rollups are the sales history.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import DailySalesRollup
+
+# What a transaction's contribution depends on; enough to load for record_changes.
+SALE_FIELDS = ('user', 'product', 'status', 'amount', 'quantity', 'created_at')
+
+
+def _sale(txn):
+    """``(key, amount, units)`` the transaction adds to the rollups, or None."""
+    if txn is None or txn.status != 'completed':
+        return None
+    day = timezone.localdate(txn.created_at)
+    return (txn.user_id, txn.product_id, day), Decimal(txn.amount), txn.quantity
+
+
+def record_changes(changes):
+    """Apply ``[(previous, current), ...]`` transaction changes to the rollups.
+
+    ``previous`` is None for a created transaction. Only the difference is
+    written, one conditional UPDATE (or INSERT for a new day) per touched
+    rollup row, in key order so concurrent writers lock rows in the same order.
+    """
+    deltas = defaultdict(lambda: [0, Decimal(0), 0])
+    for previous, current in changes:
+        for txn, sign in ((previous, -1), (current, 1)):
+            sale = _sale(txn)
+            if sale is None:
+                continue
+            key, amount, units = sale
+            delta = deltas[key]
+            delta[0] += sign
+            delta[1] += sign * amount
+            delta[2] += sign * units
+    deltas = sorted((key, delta) for key, delta in deltas.items() if any(delta))
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        for (user_id, product_id, day), (count, amount, units) in deltas:
+            rollup = DailySalesRollup.objects.filter(user_id=user_id, product_id=product_id, day=day)
+            increments = {'count': F('count') + count, 'amount': F('amount') + amount, 'units': F('units') + units}
+            if rollup.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    DailySalesRollup.objects.create(
+                        user_id=user_id, product_id=product_id, day=day, count=count, amount=amount, units=units,
+                    )
+            except IntegrityError:
+                # Another writer created the day's row first.
+                rollup.update(**increments)
+
+
+def sales_summary(user_id=None, product_id=None, start=None, end=None, top=10, order='amount', daily=False):
+    """Totals, best-selling products and (optionally) per-day totals from the rollups.
+
+    ``start``/``end`` are inclusive days. Reads one rollup row per product and
+    day, however many transactions those days had.
+    """
+    rollups = DailySalesRollup.objects.all()
+    if user_id is not None:
+        rollups = rollups.filter(user_id=user_id)
+    if product_id is not None:
+        rollups = rollups.filter(product_id=product_id)
+    if start is not None:
+        rollups = rollups.filter(day__gte=start)
+    if end is not None:
+        rollups = rollups.filter(day__lte=end)
+
+    sums = {'count': Sum('count'), 'amount': Sum('amount'), 'units': Sum('units')}
+    totals = rollups.aggregate(**sums)
+    summary = {
+        'totals': {'count': totals['count'] or 0, 'amount': totals['amount'] or Decimal(0), 'units': totals['units'] or 0},
+        'top_products': list(
+            rollups.values('product', product_name=F('product__name')).annotate(**sums).order_by(f'-{order}', 'product')[:top]
+        ),
+    }
+    if daily:
+        summary['daily'] = list(rollups.values('day').annotate(**sums).order_by('day'))
+    return summary
@@ -1,32 +1,75 @@
 from rest_framework import serializers
 from .models import User, Product, Catalog, CatalogProduct, Transaction, RestockReminder, AILog
 
+
+def requested_fields(request):
+    """Field names from a ``?fields=a,b,c`` query param on a read request, or None."""
+    if request is None or request.method != 'GET':
+        return None
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return {name.strip() for name in fields.split(',') if name.strip()}
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """Drops every field not named in ``?fields=`` when the request asks for a projection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = '__all__'
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Product
         fields = '__all__'
 
+class ProductSummarySerializer(serializers.ModelSerializer):
+    """Compact read-only product used inside catalog responses."""
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'category', 'price', 'stock_qty', 'image_url']
+
 class CatalogSerializer(serializers.ModelSerializer):
     class Meta:
         model = Catalog
         fields = '__all__'
 
+class CatalogDetailSerializer(CatalogSerializer):
+    """A catalog together with its products.
+
+    Expects ``catalog_products`` to be prefetched with ``product`` selected,
+    as ``CatalogViewSet`` does for ``retrieve``.
+    """
+    products = serializers.SerializerMethodField()
+
+    def get_products(self, catalog):
+        products = [item.product for item in catalog.catalog_products.all()]
+        return ProductSummarySerializer(products, many=True).data
+
 class CatalogProductSerializer(serializers.ModelSerializer):
+    product_detail = ProductSummarySerializer(source='product', read_only=True)
+
     class Meta:
         model = CatalogProduct
         fields = '__all__'
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Transaction
         fields = '__all__'
 
 class RestockReminderSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
     class Meta:
         model = RestockReminder
         fields = '__all__'
@@ -35,3 +78,38 @@ class AILogSerializer(serializers.ModelSerializer):
     class Meta:
         model = AILog
         fields = '__all__'
+
+class ArchiveQuerySerializer(serializers.Serializer):
+    """Query parameters of the archive read endpoint (``api/archive.py``)."""
+    user = serializers.IntegerField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    before_id = serializers.IntegerField(required=False, min_value=1)
+    page_size = serializers.IntegerField(required=False, min_value=1)
+
+class SalesSummaryQuerySerializer(serializers.Serializer):
+    """Query parameters of the sales summary endpoint (``api/rollups.py``)."""
+    user = serializers.IntegerField(required=False)
+    product = serializers.IntegerField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    top = serializers.IntegerField(required=False, min_value=1, max_value=100, default=10)
+    order = serializers.ChoiceField(choices=['amount', 'units', 'count'], required=False, default='amount')
+    daily = serializers.BooleanField(required=False)
+
+class SalesTotalsSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+
+class ProductSalesSerializer(SalesTotalsSerializer):
+    product = serializers.IntegerField()
+    product_name = serializers.CharField()
+
+class DailySalesSerializer(SalesTotalsSerializer):
+    day = serializers.DateField()
+
+class SalesSummarySerializer(serializers.Serializer):
+    totals = SalesTotalsSerializer()
+    top_products = ProductSalesSerializer(many=True)
+    daily = DailySalesSerializer(many=True, required=False)
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models import F
+
+from .cache import invalidate
+from .models import Product, Transaction
+from .rollups import SALE_FIELDS, record_changes
+
+
+class TransactionStateError(Exception):
+    """The transaction is not pending, so it cannot be completed."""
+
+
+class InsufficientStockError(Exception):
+    """Completing the transaction would take the product's stock below zero."""
+
+
+def complete_transaction(transaction_id):
+    """Mark a pending transaction completed and take its quantity out of stock.
+
+    Both writes are conditional UPDATEs inside one atomic block, so the
+    database row locks serialise concurrent completions: a transaction is
+    completed at most once, and stock never goes negative (the whole
+    completion is rolled back instead). The sale is added to the day's
+    ``DailySalesRollup`` in the same transaction.
+    """
+    with transaction.atomic():
+        txn = Transaction.objects.only(*SALE_FIELDS).get(pk=transaction_id)
+        claimed = Transaction.objects.filter(pk=txn.pk, status='pending').update(status='completed')
+        if not claimed:
+            raise TransactionStateError('Only pending transactions can be completed.')
+        decremented = Product.objects.filter(pk=txn.product_id, stock_qty__gte=txn.quantity).update(
+            stock_qty=F('stock_qty') - txn.quantity,
+        )
+        if not decremented:
+            raise InsufficientStockError('Not enough stock to complete this transaction.')
+        # The F() updates skip post_save, so retire cached product reads and
+        # count the sale here.
+        invalidate('api.product')
+        txn.status = 'completed'
+        record_changes([(None, txn)])
+    return Transaction.objects.get(pk=transaction_id)
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .models import Product, Catalog, CatalogProduct, Transaction
+from .rollups import SALE_FIELDS, record_changes
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Catalog)
+@receiver([post_save, post_delete], sender=CatalogProduct)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(sender._meta.label_lower)
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_sale(sender, instance, raw=False, **kwargs):
+    instance._previous_sale = None
+    if not raw and not instance._state.adding:
+        instance._previous_sale = Transaction.objects.only(*SALE_FIELDS).filter(pk=instance.pk).first()
+
+
+@receiver(post_save, sender=Transaction)
+def update_sales_rollups(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes([(instance._previous_sale, instance)])
@@ -1,3 +1,702 @@
-from django.test import TestCase
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .models import User, Product, Catalog, CatalogProduct, Transaction, RestockReminder, AILog, ArchiveChunk, DailySalesRollup
+from .restock import suggest_restock
+from .services import complete_transaction, TransactionStateError, InsufficientStockError
+
+
+class APITestCase(TestCase):
+    """Starts every test with an empty response cache and a fresh API client."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+
+def make_user(username='farmer1', phone='9000000001', role='farmer'):
+    return User.objects.create(username=username, phone=phone, role=role)
+
+
+def make_product(user, name='Rice', category='Grains', price=40, stock_qty=10):
+    return Product.objects.create(
+        user=user, name=name, description=f'{name} from the farm',
+        category=category, price=price, stock_qty=stock_qty,
+    )
+
+
+class QueryPlanTests(TestCase):
+    """The hot access patterns must be served by the composite indexes in 0002."""
+
+    def setUp(self):
+        self.user = make_user()
+        self.product = make_product(self.user)
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor != 'sqlite':
+            self.skipTest('query plan assertions are written against SQLite EXPLAIN QUERY PLAN')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_products_by_user_and_category(self):
+        qs = Product.objects.filter(user=self.user, category='Grains').order_by('-id')
+        self.assertUsesIndex(qs, 'product_user_category_idx')
+
+    def test_transactions_by_user_and_status_in_time_order(self):
+        qs = Transaction.objects.filter(user=self.user, status='pending').order_by('-created_at')
+        self.assertUsesIndex(qs, 'txn_user_status_created_idx')
+
+    def test_ai_logs_by_user_and_action_in_time_order(self):
+        qs = AILog.objects.filter(user=self.user, action_type='voice').order_by('timestamp')
+        self.assertUsesIndex(qs, 'ailog_user_action_time_idx')
+
+    def test_reminders_per_product(self):
+        qs = RestockReminder.objects.filter(product=self.product).order_by('-created_at')
+        self.assertUsesIndex(qs, 'restock_product_created_idx')
+
+
+class FilteredListQueryCountTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        for i in range(30):
+            product = make_product(self.user, name=f'Rice {i}', price=10 + i)
+            Transaction.objects.create(user=self.user, product=product, amount=product.price)
+
+    def test_filtered_product_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/products/', {
+                'user': self.user.id, 'category': 'Grains', 'max_price': 50, 'search': 'Rice',
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_filtered_transaction_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/transactions/', {
+                'user': self.user.id, 'status': 'pending', 'page_size': 25,
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 25)
+
+    def test_catalogs_and_reminders_by_user(self):
+        other = make_user(username='artisan1', phone='9000000002')
+        product = Product.objects.filter(user=self.user).first()
+        Catalog.objects.create(user=self.user, title='Grains')
+        RestockReminder.objects.create(user=self.user, product=product, suggested_qty=5, season_note='-')
+        for i in range(60):
+            # Newer rows of another user must not push these out of the first page.
+            Catalog.objects.create(user=other, title=f'Crafts {i}')
+            RestockReminder.objects.create(user=other, product=product, suggested_qty=1, season_note='-')
+        for path in ('/api/catalogs/', '/api/restock-reminders/'):
+            response = self.client.get(path, {'user': self.user.id})
+            self.assertEqual([row['user'] for row in response.json()['results']], [self.user.id], msg=path)
+
+    def test_field_projection_only_loads_requested_columns(self):
+        with self.assertNumQueries(1) as ctx:
+            response = self.client.get('/api/products/', {'fields': 'id,name'})
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'name'})
+        self.assertNotIn('description', ctx.captured_queries[0]['sql'])
+
+
+class ListFilterTests(APITestCase):
+    """Each filter must keep the rows that match and drop the ones that do not."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.rice = make_product(cls.user, name='Basmati Rice', category='Grains', price=40, stock_qty=5)
+        cls.dal = make_product(cls.user, name='Toor Dal', category='Pulses', price=120, stock_qty=50)
+        cls.shawl = make_product(cls.user, name='Pashmina Shawl', category='Crafts', price=900, stock_qty=1)
+        # Dal is described as going well with rice, so search also covers descriptions.
+        Product.objects.filter(pk=cls.dal.pk).update(description='Goes well with rice')
+        for month, product in [(1, cls.rice), (3, cls.dal), (5, cls.shawl)]:
+            Product.objects.filter(pk=product.pk).update(created_at=datetime(2024, month, 1, tzinfo=timezone.utc))
+        cls.sales = {
+            status: Transaction.objects.create(user=cls.user, product=product, amount=amount, status=status)
+            for status, product, amount in [('pending', cls.rice, 40), ('completed', cls.dal, 240),
+                                            ('failed', cls.shawl, 900)]
+        }
+        for month, txn in [(1, 'pending'), (3, 'completed'), (5, 'failed')]:
+            Transaction.objects.filter(pk=cls.sales[txn].pk).update(created_at=datetime(2024, month, 1, tzinfo=timezone.utc))
+
+    def names(self, **params):
+        response = self.client.get('/api/products/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['name'] for row in response.json()['results']}
+
+    def statuses(self, **params):
+        response = self.client.get('/api/transactions/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['status'] for row in response.json()['results']}
+
+    def test_product_filters(self):
+        cases = [
+            ({'min_price': 100}, {'Toor Dal', 'Pashmina Shawl'}),
+            ({'max_price': 120}, {'Basmati Rice', 'Toor Dal'}),
+            ({'min_price': 50, 'max_price': 500}, {'Toor Dal'}),
+            ({'min_stock': 5}, {'Basmati Rice', 'Toor Dal'}),
+            ({'max_stock': 5}, {'Basmati Rice', 'Pashmina Shawl'}),
+            ({'created_after': '2024-02-01T00:00:00Z'}, {'Toor Dal', 'Pashmina Shawl'}),
+            ({'created_before': '2024-04-01T00:00:00Z'}, {'Basmati Rice', 'Toor Dal'}),
+            ({'category': 'Crafts'}, {'Pashmina Shawl'}),
+            ({'search': 'rice'}, {'Basmati Rice', 'Toor Dal'}),
+            ({'search': 'shawl'}, {'Pashmina Shawl'}),
+            ({'category': 'Grains', 'max_price': 30}, set()),
+        ]
+        for params, expected in cases:
+            with self.subTest(**params):
+                self.assertEqual(self.names(**params), expected)
+
+    def test_transaction_filters(self):
+        cases = [
+            ({'status': 'completed'}, {'completed'}),
+            ({'status': 'pending'}, {'pending'}),
+            ({'min_amount': 200}, {'completed', 'failed'}),
+            ({'max_amount': 240}, {'pending', 'completed'}),
+            ({'created_after': '2024-02-01T00:00:00Z'}, {'completed', 'failed'}),
+            ({'created_before': '2024-04-01T00:00:00Z'}, {'pending', 'completed'}),
+            ({'product': self.shawl.id}, {'failed'}),
+            ({'search': 'dal'}, {'completed'}),
+        ]
+        for params, expected in cases:
+            with self.subTest(**params):
+                self.assertEqual(self.statuses(**params), expected)
+
+    def test_invalid_filter_values_are_rejected(self):
+        for params in ({'min_price': 'cheap'}, {'created_after': 'yesterday'}, {'status': 'lost'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get('/api/transactions/' if 'status' in params else '/api/products/',
+                                                 params).status_code, 400)
+
+
+class EndpointQueryCountTests(APITestCase):
+    """Listing endpoints must cost a fixed number of queries, however many rows there are."""
+
+    ITEMS = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        products = Product.objects.bulk_create([
+            Product(user=cls.user, name=f'Item {i}', description='-', category='Grains', price=10, stock_qty=5)
+            for i in range(cls.ITEMS)
+        ])
+        cls.catalog = Catalog.objects.create(user=cls.user, title='Market day')
+        CatalogProduct.objects.bulk_create([CatalogProduct(catalog=cls.catalog, product=p) for p in products])
+        Transaction.objects.bulk_create([
+            Transaction(user=cls.user, product=p, amount=10, reference_no=f'ref-{p.id}') for p in products[:100]
+        ])
+        RestockReminder.objects.bulk_create([
+            RestockReminder(user=cls.user, product=p, suggested_qty=20, season_note='Diwali') for p in products[:100]
+        ])
+        AILog.objects.bulk_create([
+            AILog(user=cls.user, action_type='voice', input_data={'q': i}, ai_output={'a': i}) for i in range(100)
+        ])
+
+
+    def assertListQueries(self, url, num):
+        with self.assertNumQueries(num):
+            response = self.client.get(url, {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 100)
+        return response.json()['results']
+
+    def test_list_endpoints(self):
+        for url in ('/api/products/', '/api/catalog-products/', '/api/transactions/',
+                    '/api/restock-reminders/', '/api/ai-logs/'):
+            with self.subTest(url=url):
+                self.assertListQueries(url, 1)
+
+    def test_catalog_products_embed_product(self):
+        results = self.assertListQueries('/api/catalog-products/', 1)
+        self.assertEqual(results[0]['product_detail']['id'], results[0]['product'])
+
+    def test_restock_reminders_embed_product_name(self):
+        results = self.assertListQueries('/api/restock-reminders/', 1)
+        self.assertTrue(results[0]['product_name'].startswith('Item '))
+
+    def test_catalog_detail_with_all_products(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/catalogs/{self.catalog.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['products']), self.ITEMS)
+
+    def test_admin_changelists(self):
+        admin_user = User.objects.create_superuser(username='admin', phone='9000000002', password='x')
+        self.client.force_login(admin_user)
+        # session, user, count, full count, page (+ distinct categories for the product filter)
+        expected = {'product': 6, 'catalogproduct': 5, 'transaction': 5, 'restockreminder': 5, 'ailog': 5}
+        for model, num in expected.items():
+            with self.subTest(model=model):
+                with self.assertNumQueries(num):
+                    response = self.client.get(f'/admin/api/{model}/')
+                self.assertEqual(response.status_code, 200)
+
+
+class BulkEndpointTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+
+    def product_payload(self, name, **extra):
+        return dict({'user': self.user.id, 'name': name, 'description': '-', 'category': 'Vegetables',
+                     'price': '20.00', 'stock_qty': 5}, **extra)
+
+    def test_bulk_create_reports_each_item(self):
+        response = self.client.post('/api/products/bulk/', [
+            self.product_payload('Tomato'),
+            self.product_payload('Onion', price='not a price'),
+            self.product_payload('Potato'),
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'error', 'created'])
+        self.assertIn('price', results[1]['errors'])
+        self.assertEqual(Product.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(results[2]['data']['id'], Product.objects.get(name='Potato').id)
+
+    def test_bulk_update_applies_one_write_per_batch(self):
+        products = [make_product(self.user, name=f'Item {i}', stock_qty=1) for i in range(20)]
+        payload = [{'id': p.id, 'stock_qty': 50 + i} for i, p in enumerate(products)] + [{'id': 999999, 'stock_qty': 1}]
+        # select_for_update + bulk UPDATE, whatever the batch size (plus savepoint bookkeeping).
+        with self.assertNumQueries(4):
+            response = self.client.patch('/api/products/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        statuses = [r['status'] for r in response.json()['results']]
+        self.assertEqual(statuses, ['updated'] * 20 + ['error'])
+        self.assertEqual(
+            list(Product.objects.order_by('id').values_list('stock_qty', flat=True)),
+            [50 + i for i in range(20)],
+        )
+
+    def test_bulk_delete(self):
+        product = make_product(self.user)
+        reminder = RestockReminder.objects.create(user=self.user, product=product, suggested_qty=5, season_note='-')
+        response = self.client.delete('/api/restock-reminders/bulk/', {'ids': [reminder.id, 424242]}, format='json')
+        self.assertEqual([r['status'] for r in response.json()['results']], ['deleted', 'not_found'])
+        self.assertFalse(RestockReminder.objects.exists())
+
+    def test_bulk_create_ai_logs_in_one_insert(self):
+        payload = [{'user': self.user.id, 'action_type': 'voice', 'input_data': {'q': i}, 'ai_output': {'a': i}}
+                   for i in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/ai-logs/bulk/', payload, format='json')
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual({r['status'] for r in response.json()['results']}, {'created'})
+        self.assertEqual(AILog.objects.filter(user=self.user).count(), 50)
+
+    def test_bulk_create_without_returned_ids(self):
+        # What MySQL does: no primary keys back from a multi-row INSERT.
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            with CaptureQueriesContext(connection) as queries:
+                logs = self.client.post('/api/ai-logs/bulk/', [
+                    {'user': self.user.id, 'action_type': 'voice', 'input_data': {}, 'ai_output': {}}] * 3, format='json')
+            log_inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+            products = self.client.post('/api/products/bulk/', [
+                self.product_payload('Tomato'), self.product_payload('Onion')], format='json')
+        # Nobody reads ai-log ids back, so they still go in one INSERT ...
+        self.assertEqual((logs.status_code, len(log_inserts)), (201, 1))
+        self.assertEqual(AILog.objects.count(), 3)
+        # ... while created products are saved one by one to report theirs.
+        self.assertEqual([r['data']['id'] for r in products.json()['results']],
+                         [Product.objects.get(name=name).id for name in ('Tomato', 'Onion')])
+
+    def test_bulk_update_rejects_ids_that_are_not_integers(self):
+        product = make_product(self.user, stock_qty=1)
+        response = self.client.patch('/api/products/bulk/', [
+            {'id': [product.id], 'stock_qty': 9}, {'id': str(product.id), 'stock_qty': 9}, 'oops',
+            {'id': product.id, 'stock_qty': 3},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['error', 'error', 'error', 'updated'])
+        self.assertIn('id', results[0]['errors'])
+        product.refresh_from_db()
+        self.assertEqual(product.stock_qty, 3)
+
+    def test_bulk_rejects_non_list(self):
+        response = self.client.post('/api/transactions/bulk/', {'user': self.user.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class CompleteTransactionTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.product = make_product(self.user, stock_qty=5)
+
+    def test_completion_decrements_stock(self):
+        txn = Transaction.objects.create(user=self.user, product=self.product, amount=80, quantity=2)
+        response = self.client.post(f'/api/transactions/{txn.id}/complete/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'completed')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock_qty, 3)
+
+    def test_oversell_is_rejected_and_rolled_back(self):
+        txn = Transaction.objects.create(user=self.user, product=self.product, amount=240, quantity=6)
+        response = self.client.post(f'/api/transactions/{txn.id}/complete/')
+        self.assertEqual(response.status_code, 409)
+        txn.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertEqual(txn.status, 'pending')
+        self.assertEqual(self.product.stock_qty, 5)
+
+    def test_completing_twice_is_rejected(self):
+        txn = Transaction.objects.create(user=self.user, product=self.product, amount=40)
+        self.client.post(f'/api/transactions/{txn.id}/complete/')
+        response = self.client.post(f'/api/transactions/{txn.id}/complete/')
+        self.assertEqual(response.status_code, 409)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock_qty, 4)
+
+
+class ConcurrentCompletionTests(TransactionTestCase):
+    """Many sales of one product completing at once must never oversell."""
+
+    STOCK = 40
+    SALES = 100
+    WORKERS = 8
+
+    @staticmethod
+    def _complete(transaction_id):
+        try:
+            complete_transaction(transaction_id)
+            return 'completed'
+        except InsufficientStockError:
+            return 'rejected'
+        except TransactionStateError:
+            return 'duplicate'
+        finally:
+            connection.close()
+
+    def test_parallel_completions(self):
+        user = make_user()
+        product = make_product(user, stock_qty=self.STOCK)
+        txns = Transaction.objects.bulk_create([
+            Transaction(user=user, product=product, amount=40, reference_no=f'sale-{i}') for i in range(self.SALES)
+        ])
+        # Also race duplicate completions of one sale. It is of a product with
+        # stock to spare, so it succeeds exactly once whichever thread runs first.
+        spare = make_product(user, name='Wheat', stock_qty=1)
+        duplicated = Transaction.objects.create(user=user, product=spare, amount=40)
+        ids = [t.id for t in txns] + [duplicated.id] * 11
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            outcomes = list(pool.map(self._complete, ids))
+
+        product.refresh_from_db()
+        self.assertEqual(product.stock_qty, 0)
+        self.assertEqual(outcomes.count('completed'), self.STOCK + 1)
+        self.assertEqual(outcomes.count('duplicate'), 10)
+        self.assertEqual(Transaction.objects.filter(product=product, status='completed').count(), self.STOCK)
+        self.assertEqual(DailySalesRollup.objects.get(product=product).count, self.STOCK)
+        self.assertEqual(DailySalesRollup.objects.get(product=spare).count, 1)
+
+
+class SalesRollupTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.rice = make_product(self.user, name='Rice', stock_qty=100)
+        self.dal = make_product(self.user, name='Dal', stock_qty=100)
+
+    def sale(self, product, amount, quantity=1, day=None, **extra):
+        txn = Transaction.objects.create(user=self.user, product=product, amount=amount, quantity=quantity, **extra)
+        if day:
+            Transaction.objects.filter(pk=txn.pk).update(created_at=datetime(2026, 3, day, 12, tzinfo=timezone.utc))
+        return txn
+
+    def totals(self, **params):
+        return self.client.get('/api/sales-summary/', dict({'user': self.user.id}, **params)).json()['totals']
+
+    def test_completing_a_sale_counts_it(self):
+        txn = self.sale(self.rice, 80, quantity=2)
+        self.assertEqual(self.totals(), {'count': 0, 'amount': '0.00', 'units': 0})
+        self.client.post(f'/api/transactions/{txn.id}/complete/')
+        self.assertEqual(self.totals(), {'count': 1, 'amount': '80.00', 'units': 2})
+
+    def test_every_write_path_keeps_rollups_current(self):
+        payload = {'user': self.user.id, 'product': self.rice.id, 'amount': '50.00', 'quantity': 1, 'status': 'completed'}
+        created = self.client.post('/api/transactions/', payload, format='json').json()
+        self.client.post('/api/transactions/bulk/', [payload, dict(payload, product=self.dal.id)], format='json')
+        self.assertEqual(self.totals(), {'count': 3, 'amount': '150.00', 'units': 3})
+
+        self.client.patch(f'/api/transactions/{created["id"]}/', {'status': 'failed'}, format='json')
+        self.assertEqual(self.totals(), {'count': 2, 'amount': '100.00', 'units': 2})
+
+        dal_sale = Transaction.objects.get(product=self.dal)
+        self.client.patch('/api/transactions/bulk/', [{'id': dal_sale.id, 'amount': '70.00', 'quantity': 4}],
+                          format='json')
+        self.assertEqual(self.totals(), {'count': 2, 'amount': '120.00', 'units': 5})
+
+        # Deleting (or archiving) a sale does not rewrite history.
+        self.client.delete(f'/api/transactions/{dal_sale.id}/')
+        self.assertEqual(self.totals(), {'count': 2, 'amount': '120.00', 'units': 5})
+
+    def test_bulk_update_counts_a_row_once(self):
+        txn = self.sale(self.rice, 10)
+        response = self.client.patch('/api/transactions/bulk/', [
+            {'id': txn.id, 'status': 'completed'},
+            {'id': txn.id, 'amount': '20.00'},
+        ], format='json')
+        self.assertEqual([r['status'] for r in response.json()['results']], ['updated', 'error'])
+        self.assertIn('id', response.json()['results'][1]['errors'])
+        txn.refresh_from_db()
+        self.assertEqual((txn.status, txn.amount), ('completed', 10))
+        self.assertEqual(self.totals(), {'count': 1, 'amount': '10.00', 'units': 1})
+
+    def test_summary_by_product_and_day(self):
+        for product, amount, day in [(self.rice, 40, 1), (self.rice, 40, 1), (self.dal, 100, 2), (self.rice, 40, 9)]:
+            complete_transaction(self.sale(product, amount, day=day).id)
+        self.sale(self.dal, 500, day=2)  # pending
+
+        response = self.client.get('/api/sales-summary/', {
+            'user': self.user.id, 'start': '2026-03-01', 'end': '2026-03-02', 'daily': 'true',
+        }).json()
+        self.assertEqual(response['totals'], {'count': 3, 'amount': '180.00', 'units': 3})
+        self.assertEqual([(p['product_name'], p['amount']) for p in response['top_products']],
+                         [('Dal', '100.00'), ('Rice', '80.00')])
+        self.assertEqual([(d['day'], d['count']) for d in response['daily']], [('2026-03-01', 2), ('2026-03-02', 1)])
+
+        by_count = self.client.get('/api/sales-summary/', {'user': self.user.id, 'order': 'count', 'top': 1}).json()
+        self.assertEqual([(p['product_name'], p['count']) for p in by_count['top_products']], [('Rice', 3)])
+        self.assertNotIn('daily', by_count)
+
+    def test_summary_cost_does_not_grow_with_transactions(self):
+        for day in range(1, 4):
+            for _ in range(20):
+                complete_transaction(self.sale(self.rice, 10, day=day).id)
+        self.assertEqual(DailySalesRollup.objects.count(), 3)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/sales-summary/', {'user': self.user.id, 'daily': 'true'})
+        self.assertEqual(response.json()['totals']['count'], 60)
+
+    def test_summary_rejects_bad_params(self):
+        self.assertEqual(self.client.get('/api/sales-summary/', {'order': 'price'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/sales-summary/', {'start': 'March'}).status_code, 400)
+
+
+@override_settings(API_CACHE_ENABLED=True)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.product = make_product(self.user, name='Mango', stock_qty=10)
+        self.catalog = Catalog.objects.create(user=self.user, title='Summer')
+        CatalogProduct.objects.create(catalog=self.catalog, product=self.product)
+
+    def test_repeat_reads_skip_the_database(self):
+        first = self.client.get(f'/api/products/{self.product.id}/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(f'/api/products/{self.product.id}/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(self.client.get('/api/cache-stats/').json()['hit'], 1)
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_disabled_cache_always_reads_the_database(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                response = self.client.get(f'/api/products/{self.product.id}/')
+            self.assertNotIn('X-Cache', response)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get('/api/products/', {'search': 'Mango'})
+        response = self.client.get('/api/products/', {'search': 'Guava'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'], [])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(f'/api/catalogs/{self.catalog.id}/')['ETag']
+        response = self.client.get(f'/api/catalogs/{self.catalog.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_product_save_invalidates_product_and_catalog_reads(self):
+        self.client.get(f'/api/products/{self.product.id}/')
+        etag = self.client.get(f'/api/catalogs/{self.catalog.id}/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/products/{self.product.id}/', {'price': '55.00'}, format='json')
+        self.assertEqual(self.client.get(f'/api/products/{self.product.id}/').json()['price'], '55.00')
+        response = self.client.get(f'/api/catalogs/{self.catalog.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['products'][0]['price'], '55.00')
+
+    def test_catalog_item_delete_invalidates_catalog(self):
+        self.client.get(f'/api/catalogs/{self.catalog.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            CatalogProduct.objects.all().delete()
+        self.assertEqual(self.client.get(f'/api/catalogs/{self.catalog.id}/').json()['products'], [])
+
+    def test_writes_that_skip_signals_still_invalidate(self):
+        self.client.get(f'/api/products/{self.product.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/products/bulk/', [{'id': self.product.id, 'stock_qty': 7}], format='json')
+        self.assertEqual(self.client.get(f'/api/products/{self.product.id}/').json()['stock_qty'], 7)
+
+        txn = Transaction.objects.create(user=self.user, product=self.product, amount=40, quantity=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/transactions/{txn.id}/complete/')
+        self.assertEqual(self.client.get(f'/api/products/{self.product.id}/').json()['stock_qty'], 5)
+
+
+class ArchiveTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ARCHIVE_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.archive_dir = tmp.name
+        self.user = make_user()
+        self.other = make_user(username='farmer2', phone='9000000002')
+
+    def make_logs(self, user, month, count):
+        logs = AILog.objects.bulk_create([
+            AILog(user=user, action_type='voice', input_data={'q': i}, ai_output={'a': i}) for i in range(count)
+        ])
+        AILog.objects.filter(id__in=[log.id for log in logs]).update(timestamp=datetime(2024, month, 10, tzinfo=timezone.utc))
+
+    def archive(self, *args):
+        call_command('archive_old_rows', *args, stdout=StringIO())
+
+    def test_old_rows_move_to_chunked_files(self):
+        self.make_logs(self.user, 1, 5)
+        self.make_logs(self.user, 2, 3)
+        self.make_logs(self.other, 1, 2)
+        recent = AILog.objects.create(user=self.user, action_type='voice', input_data={}, ai_output={})
+        self.archive('--kind', 'ai-logs', '--chunk-rows', '4')
+
+        self.assertEqual(list(AILog.objects.values_list('id', flat=True)), [recent.id])
+        chunks = ArchiveChunk.objects.filter(kind='ai-logs').order_by('first_id')
+        # user 1: January in two files (4 + 1 rows), February in one; user 2: one file.
+        self.assertEqual(sorted(chunk.rows for chunk in chunks), [1, 2, 3, 4])
+        for chunk in chunks:
+            self.assertTrue(os.path.exists(os.path.join(self.archive_dir, chunk.path)))
+
+    def test_pending_transactions_stay_hot(self):
+        product = make_product(self.user)
+        done = Transaction.objects.create(user=self.user, product=product, amount=40, status='completed')
+        pending = Transaction.objects.create(user=self.user, product=product, amount=40)
+        Transaction.objects.update(created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        self.archive('--kind', 'transactions', '--dry-run')
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.archive('--kind', 'transactions')
+        self.assertEqual(list(Transaction.objects.values_list('id', flat=True)), [pending.id])
+        results = self.client.get('/api/archive/transactions/').json()['results']
+        self.assertEqual([(r['id'], r['amount'], r['status']) for r in results], [(done.id, '40.00', 'completed')])
+
+    def test_read_archive_by_user_and_time(self):
+        self.make_logs(self.user, 1, 3)
+        self.make_logs(self.other, 2, 2)
+        self.make_logs(self.user, 3, 4)
+        self.archive('--chunk-rows', '2')
+
+        response = self.client.get('/api/archive/ai-logs/', {
+            'user': self.user.id, 'created_after': '2024-02-01T00:00:00Z', 'created_before': '2024-12-31T00:00:00Z',
+        })
+        self.assertEqual(response.status_code, 200)
+        ids = [r['id'] for r in response.json()['results']]
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertTrue(all(r['user'] == self.user.id and r['timestamp'].startswith('2024-03')
+                            for r in response.json()['results']))
+
+    def test_read_archive_pages_newest_first(self):
+        self.make_logs(self.user, 1, 3)
+        self.make_logs(self.other, 1, 3)
+        self.make_logs(self.user, 1, 3)
+        self.archive('--chunk-rows', '2')
+
+        seen, url = [], '/api/archive/ai-logs/?page_size=4'
+        while url:
+            page = self.client.get(url).json()
+            seen += [r['id'] for r in page['results']]
+            url = page['next']
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(seen), 9)
+        self.assertEqual(len(set(seen)), 9)
+
+    def test_read_archive_rejects_bad_params(self):
+        self.assertEqual(self.client.get('/api/archive/ai-logs/', {'created_after': 'soon'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/archive/products/').status_code, 404)
+
+
+class RestockEngineTests(TestCase):
+    TODAY = date(2026, 10, 17)
+
+    def setUp(self):
+        self.user = make_user()
+        self.rice = make_product(self.user, name='Rice', stock_qty=10)
+        self.dal = make_product(self.user, name='Dal', stock_qty=1000)
+        self.salt = make_product(self.user, name='Salt', stock_qty=0)
+
+    def sold(self, product, units, days_ago):
+        DailySalesRollup.objects.bulk_create([
+            DailySalesRollup(user=self.user, product=product, day=self.TODAY - timedelta(days=ago),
+                             count=1, amount=units * 10, units=units)
+            for ago in days_ago
+        ])
+
+    def suggest(self, **kwargs):
+        return suggest_restock(today=self.TODAY, window=28, lead_days=7, cover_days=14, **kwargs)
+
+    def test_suggests_from_velocity_and_stock(self):
+        self.sold(self.rice, 5, range(28))
+        self.sold(self.dal, 1, range(28))
+        manual = RestockReminder.objects.create(user=self.user, product=self.dal, suggested_qty=3, season_note='Holi')
+        self.suggest()
+        self.suggest()  # a second run replaces, not adds
+
+        engine = RestockReminder.objects.filter(source='engine')
+        # 5/day for 7 + 14 days, nothing for safety (steady sales), minus 10 in stock.
+        self.assertEqual([(r.product_id, r.suggested_qty) for r in engine], [(self.rice.id, 95)])
+        self.assertIn('Sells 5.0/day', engine[0].season_note)
+        self.assertTrue(RestockReminder.objects.filter(pk=manual.pk).exists())
+
+    def test_last_years_season_scales_demand(self):
+        self.sold(self.rice, 5, range(28))
+        self.sold(self.rice, 10, range(365 - 21, 365))  # the 21 days ahead, last year
+        self.sold(self.rice, 5, range(365, 365 + 28))  # the 28 days before them
+        suggestions = self.suggest(dry_run=True)
+        self.assertEqual(suggestions['suggested_qty'].tolist(), [5 * 2 * 21 - 10])
+        self.assertFalse(RestockReminder.objects.exists())
+
+    def test_uneven_sales_add_safety_stock(self):
+        self.sold(self.rice, 10, range(0, 28, 2))  # 5/day on average, in bursts
+        qty = self.suggest(dry_run=True)['suggested_qty'].tolist()
+        self.assertEqual(len(qty), 1)
+        self.assertGreater(qty[0], 95)
+
+    def test_command_scoped_to_user(self):
+        other = make_user(username='farmer2', phone='9000000002')
+        wheat = make_product(other, name='Wheat', stock_qty=0)
+        DailySalesRollup.objects.create(user=other, product=wheat, day=date.today(), count=1, amount=10, units=1)
+        RestockReminder.objects.create(user=self.user, product=self.rice, suggested_qty=1, season_note='-',
+                                       source='engine')
+        call_command('suggest_restock', '--user', str(other.id), stdout=StringIO())
+        self.assertEqual(
+            sorted(RestockReminder.objects.values_list('product__name', flat=True)), ['Rice', 'Wheat'],
+        )
+
+    def test_no_products(self):
+        RestockReminder.objects.all().delete()
+        Product.objects.all().delete()
+        self.assertEqual(len(self.suggest()), 0)
@@ -15,4 +15,7 @@ router.register(r'ai-logs', views.AILogViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('login/', views.LoginView.as_view(), name='login'),
+    path('archive/<str:kind>/', views.ArchiveView.as_view(), name='archive'),
+    path('sales-summary/', views.SalesSummaryView.as_view(), name='sales-summary'),
+    path('cache-stats/', views.CacheStatsView.as_view(), name='cache-stats'),
 ]
@@ -1,37 +1,153 @@
-from rest_framework import viewsets
+from django.db.models import Prefetch
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.filters import SearchFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from .models import *
 from .serializers import *
+from .filters import CatalogFilter, ProductFilter, RestockReminderFilter, TransactionFilter
+from .bulk import BulkModelMixin
+from .services import complete_transaction, TransactionStateError, InsufficientStockError
+from .cache import CachedResponseMixin, stats
+from .archive import ARCHIVABLE, read_archive
+from .rollups import record_changes, sales_summary
+from .pagination import IdCursorPagination
 from rest_framework.views import APIView
 from rest_framework.response import Response    
 
 
+class FieldProjectionMixin:
+    """Loads only the columns named in ``?fields=`` so large text/JSON columns stay in the DB."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = requested_fields(self.request)
+        if fields:
+            concrete = {f.name for f in queryset.model._meta.concrete_fields}
+            queryset = queryset.only('id', *(fields & concrete))
+        return queryset
+
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('-id')
     serializer_class = UserSerializer
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(CachedResponseMixin, BulkModelMixin, FieldProjectionMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all().order_by('-id')
+    cache_dependencies = ('api.product',)
     serializer_class = ProductSerializer
+    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filterset_class = ProductFilter
+    search_fields = ['name', 'description']
 
-class CatalogViewSet(viewsets.ModelViewSet):
+class CatalogViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Catalog.objects.all().order_by('-id')
+    # The detail response embeds the catalog's products.
+    cache_dependencies = ('api.catalog', 'api.catalogproduct', 'api.product')
     serializer_class = CatalogSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = CatalogFilter
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            # One extra query for all items of the catalog, products joined in.
+            queryset = queryset.prefetch_related(Prefetch(
+                'catalog_products',
+                queryset=CatalogProduct.objects.select_related('product').order_by('id'),
+            ))
+        return queryset
 
-class CatalogProductViewSet(viewsets.ModelViewSet):
-    queryset = CatalogProduct.objects.all().order_by('-id')
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return CatalogDetailSerializer
+        return CatalogSerializer
+
+class CatalogProductViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = CatalogProduct.objects.select_related('product').order_by('-id')
+    cache_dependencies = ('api.catalogproduct', 'api.product')
     serializer_class = CatalogProductSerializer
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(BulkModelMixin, FieldProjectionMixin, viewsets.ModelViewSet):
     queryset = Transaction.objects.all().order_by('-id')
     serializer_class = TransactionSerializer
+    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filterset_class = TransactionFilter
+    search_fields = ['reference_no', 'product__name']
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Complete a pending sale and take its quantity out of the product's stock."""
+        txn = self.get_object()
+        try:
+            txn = complete_transaction(txn.pk)
+        except (TransactionStateError, InsufficientStockError) as e:
+            return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(txn).data)
 
-class RestockReminderViewSet(viewsets.ModelViewSet):
-    queryset = RestockReminder.objects.all().order_by('-id')
+    def bulk_written(self, changes):
+        record_changes(changes)
+
+class RestockReminderViewSet(BulkModelMixin, viewsets.ModelViewSet):
+    queryset = RestockReminder.objects.select_related('product').order_by('-id')
     serializer_class = RestockReminderSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = RestockReminderFilter
 
-class AILogViewSet(viewsets.ModelViewSet):
+class AILogViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = AILog.objects.all().order_by('-id')
     serializer_class = AILogSerializer
+    # The MCP server's log queue only counts the created rows.
+    bulk_create_returns_ids = False
+
+
+class ArchiveView(APIView):
+    """Archived ai-logs or transactions, filtered by user and time, newest first."""
+
+    def get(self, request, kind, *args, **kwargs):
+        if kind not in ARCHIVABLE:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        query = ArchiveQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        page_size = min(params.get('page_size', IdCursorPagination.page_size), IdCursorPagination.max_page_size)
+        rows, more = read_archive(
+            kind,
+            user_id=params.get('user'),
+            after=params.get('created_after'),
+            before=params.get('created_before'),
+            before_id=params.get('before_id'),
+            limit=page_size,
+        )
+        next_link = None
+        if more:
+            next_link = replace_query_param(request.build_absolute_uri(), 'before_id', rows[-1]['id'])
+        return Response({'next': next_link, 'results': rows})
+
+
+class SalesSummaryView(APIView):
+    """Completed sales totals from the daily rollups: overall, best-selling products, per day."""
+
+    def get(self, request, *args, **kwargs):
+        query = SalesSummaryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        summary = sales_summary(
+            user_id=params.get('user'),
+            product_id=params.get('product'),
+            start=params.get('start'),
+            end=params.get('end'),
+            top=params['top'],
+            order=params['order'],
+            daily=params.get('daily', False),
+        )
+        return Response(SalesSummarySerializer(summary).data)
+
+
+class CacheStatsView(APIView):
+    def get(self, request, *args, **kwargs):
+        return Response(stats())
 
 
 # Login Bypass View
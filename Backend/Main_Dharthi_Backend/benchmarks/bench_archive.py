@@ -0,0 +1,155 @@
+"""AI log list latency against table size, before and after ``archive_old_rows``.
+
+Runs against a throw-away test database created from the configured backend::
+
+    DB_ENGINE=django.db.backends.sqlite3 SECRET_KEY=dev python benchmarks/bench_archive.py --sizes 10000 50000 200000
+
+For each size the table is filled with AI logs spread evenly over the last
+``--months`` months (``--payload`` bytes of JSON per row, like voice prompts
+and replies), then timed:
+
+- ``first page``: ``GET /api/ai-logs/``, the endpoint the MCP server lists.
+- ``user+week``: one user's logs of the last 7 days, newest first, as an ORM
+  query on the ``(user, action_type, timestamp)`` index.
+- ``count``: ``SELECT COUNT(*)``, standing in for any full scan (backups,
+  reports, migrations that rewrite the table).
+
+After archiving everything older than ``--days`` the same queries run on the
+smaller hot table, plus ``archive user+month``: one user's archived logs of
+one month through ``GET /api/archive/ai-logs/``.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Main_Dharthi_Backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.models import AILog, ArchiveChunk, User  # noqa: E402
+
+USERS = 50
+
+
+def fill(size, months, payload):
+    User.objects.bulk_create([User(username=f'bench{i}', phone=f'9{i:09d}') for i in range(USERS)])
+    users = list(User.objects.order_by('id'))
+    text = 'x' * (payload // 2)
+    per_month = size // months
+    now = timezone.now()
+    for month in range(months, 0, -1):
+        AILog.objects.bulk_create([
+            AILog(user=users[i % USERS], action_type='voice', input_data={'prompt': text}, ai_output={'reply': text})
+            for i in range(per_month)
+        ], batch_size=2000)
+        # Oldest month first, so ids grow with time as they do in production.
+        AILog.objects.filter(timestamp__gt=now).update(timestamp=now - timedelta(days=30 * month - 27))
+    return users
+
+
+def table_bytes():
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = %s", [AILog._meta.db_table])
+        return cursor.fetchone()[0]
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def measure(label, client, user, repeat):
+    week_ago = timezone.now() - timedelta(days=7)
+
+    def first_page():
+        assert client.get('/api/ai-logs/').status_code == 200
+
+    def user_week():
+        list(AILog.objects.filter(user=user, action_type='voice', timestamp__gte=week_ago).order_by('-id')[:10])
+
+    def count():
+        AILog.objects.count()
+
+    size = table_bytes()
+    print(f'  {label:<8} rows {AILog.objects.count():>8}'
+          f'  table {"n/a" if size is None else f"{size / 2 ** 20:7.1f} MiB"}'
+          f'  first page {timed(first_page, repeat):7.2f} ms'
+          f'  user+week {timed(user_week, repeat):7.2f} ms'
+          f'  count {timed(count, repeat):7.2f} ms')
+
+
+def run(size, args):
+    AILog.objects.all().delete()
+    ArchiveChunk.objects.all().delete()
+    User.objects.all().delete()
+    users = fill(size, args.months, args.payload)
+    client = APIClient()
+    print(f'size {size}')
+    measure('hot', client, users[0], args.repeat)
+
+    start = time.perf_counter()
+    call_command('archive_old_rows', '--kind', 'ai-logs', '--days', str(args.days), stdout=StringIO())
+    elapsed = time.perf_counter() - start
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM')
+    measure('archived', client, users[0], args.repeat)
+
+    month_start = timezone.now() - timedelta(days=30 * (args.months // 2))
+    params = {'user': users[0].id, 'created_after': month_start.isoformat(),
+              'created_before': (month_start + timedelta(days=30)).isoformat()}
+    archive_ms = timed(lambda: client.get('/api/archive/ai-logs/', params), args.repeat)
+    files = sum(len(names) for _, _, names in os.walk(settings.ARCHIVE_DIR))
+    archive_mib = sum(
+        os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(settings.ARCHIVE_DIR) for name in names
+    ) / 2 ** 20
+    print(f'  archive  {ArchiveChunk.objects.count()} chunks, {files} files, {archive_mib:.1f} MiB gzip,'
+          f' written in {elapsed:.1f} s; archive user+month {archive_ms:.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000])
+    parser.add_argument('--months', type=int, default=24)
+    parser.add_argument('--payload', type=int, default=1000, help='JSON bytes per row')
+    parser.add_argument('--days', type=int, default=90, help='retention, as archive_old_rows --days')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    archive_dir = tempfile.mkdtemp(prefix='dharti-archive-')
+    settings.ARCHIVE_DIR = archive_dir
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f'backend={connection.vendor} months={args.months} payload={args.payload}B retention={args.days}d')
+        for size in args.sizes:
+            shutil.rmtree(archive_dir)
+            os.makedirs(archive_dir)
+            run(size, args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        shutil.rmtree(archive_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
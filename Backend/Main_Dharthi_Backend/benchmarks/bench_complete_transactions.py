@@ -0,0 +1,83 @@
+"""Sustained completions/sec of ``complete_transaction`` under thread contention.
+
+Runs against a throw-away test database created from the configured backend,
+so it is safe to point at a development server::
+
+    DB_ENGINE=django.db.backends.sqlite3 SECRET_KEY=dev python benchmarks/bench_complete_transactions.py
+    DB_ENGINE=django.db.backends.mysql DB_NAME=dharti DB_USER=root DB_PASSWORD=... DB_HOST=127.0.0.1 DB_PORT=3306 \\
+        SECRET_KEY=dev python benchmarks/bench_complete_transactions.py   # MySQL / MariaDB
+
+Every worker completes sales of the same few products, the worst case for
+row contention. The run checks that no product was oversold.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Main_Dharthi_Backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from api.models import User, Product, Transaction  # noqa: E402
+from api.services import complete_transaction, InsufficientStockError  # noqa: E402
+
+
+def run(sales, products, stock, workers):
+    user = User.objects.create(username='bench', phone='0000000000')
+    items = Product.objects.bulk_create([
+        Product(user=user, name=f'P{i}', description='-', category='bench', price=1, stock_qty=stock)
+        for i in range(products)
+    ])
+    txns = Transaction.objects.bulk_create([
+        Transaction(user=user, product=items[i % products], amount=1, reference_no=f'bench-{i}')
+        for i in range(sales)
+    ])
+    ids = [t.id for t in txns]
+    if not ids[0]:
+        ids = list(Transaction.objects.order_by('id').values_list('id', flat=True))
+
+    def complete(transaction_id):
+        try:
+            complete_transaction(transaction_id)
+            return True
+        except InsufficientStockError:
+            return False
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        completed = sum(pool.map(complete, ids))
+    elapsed = time.perf_counter() - start
+
+    oversold = Product.objects.filter(stock_qty__lt=0).count()
+    expected = min(sales, products * stock)
+    print(f'backend={connection.vendor} workers={workers} sales={sales} products={products}')
+    print(f'completed={completed} expected={expected} oversold_products={oversold}')
+    print(f'{sales / elapsed:.1f} completion attempts/s, {completed / elapsed:.1f} completions/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sales', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=5)
+    parser.add_argument('--stock', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        run(args.sales, args.products, args.stock, args.workers)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
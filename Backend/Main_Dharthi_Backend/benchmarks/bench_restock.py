@@ -0,0 +1,158 @@
+"""Restock suggestions for a whole catalogue: vectorized engine vs. one product at a time.
+
+Usage::
+
+    DB_ENGINE=django.db.backends.sqlite3 SECRET_KEY=dev python benchmarks/bench_restock.py
+    DB_ENGINE=django.db.backends.sqlite3 SECRET_KEY=dev python benchmarks/bench_restock.py --db-products 20000
+
+Synthetic data: ``--products`` products with skewed popularity and
+``--transactions`` completed sales spread over the last year and a month,
+with a yearly seasonal swing. Sales are aggregated per product and day, as
+``DailySalesRollup`` holds them.
+
+- ``per product``: the same formula in plain Python, one product at a time
+  over its own sales history (already grouped, so this is the best case).
+- ``vectorized``: ``api.restock.compute_suggestions`` over all products.
+- ``db``: ``suggest_restock`` end to end on a throw-away test database
+  (load products and rollups, compute, replace the reminders), for
+  ``--db-products`` products and the same share of the sales.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Main_Dharthi_Backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from api import restock  # noqa: E402
+from api.models import DailySalesRollup, Product, RestockReminder, User  # noqa: E402
+
+TODAY = date(2026, 10, 17)
+USERS = 100
+
+
+def synthetic(products, transactions, seed=7):
+    rng = np.random.default_rng(seed)
+    days = restock.DAYS_PER_YEAR + settings.RESTOCK_VELOCITY_DAYS
+    popularity = rng.lognormal(0, 1.5, products)
+    product = rng.choice(products, transactions, p=popularity / popularity.sum())
+    # More sales around the same time every year.
+    season = 1 + 0.5 * np.sin(2 * np.pi * np.arange(days) / restock.DAYS_PER_YEAR)
+    age = rng.choice(days, transactions, p=season / season.sum())
+    sales = pd.DataFrame({'product_id': product + 1, 'age': age, 'units': rng.integers(1, 6, transactions)})
+    sales = sales.groupby(['product_id', 'age'], as_index=False)['units'].sum()
+    sales['day'] = pd.Timestamp(TODAY) - pd.to_timedelta(sales.pop('age'), unit='D')
+    catalogue = pd.DataFrame({
+        'product_id': np.arange(1, products + 1),
+        'user_id': rng.integers(1, USERS + 1, products),
+        'stock_qty': rng.integers(0, 30, products),
+    })
+    return catalogue, sales
+
+
+def per_product(catalogue, sales, window, lead_days, cover_days, z):
+    """The engine's formula written the straightforward way, product by product."""
+    horizon = lead_days + cover_days
+    ages = (pd.Timestamp(TODAY) - sales['day']).dt.days.tolist()
+    history = {}
+    for product_id, age, units in zip(sales['product_id'].tolist(), ages, sales['units'].tolist()):
+        history.setdefault(product_id, []).append((age, units))
+
+    suggested = {}
+    for product_id, stock in zip(catalogue['product_id'].tolist(), catalogue['stock_qty'].tolist()):
+        sold = squares = ahead = before = 0
+        for age, units in history.get(product_id, ()):
+            if age < window:
+                sold += units
+                squares += units * units
+            if restock.DAYS_PER_YEAR - horizon <= age < restock.DAYS_PER_YEAR:
+                ahead += units
+            if restock.DAYS_PER_YEAR <= age < restock.DAYS_PER_YEAR + window:
+                before += units
+        velocity = sold / window
+        spread = math.sqrt(max(squares / window - velocity ** 2, 0))
+        season = (ahead / max(horizon, 1)) / (before / window) if ahead and before else 1.0
+        season = min(max(season, restock.SEASON_FACTOR_RANGE[0]), restock.SEASON_FACTOR_RANGE[1])
+        qty = math.ceil(max(velocity * season * horizon + z * spread * math.sqrt(lead_days) - stock, 0))
+        if qty > 0:
+            suggested[product_id] = qty
+    return suggested
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def in_memory(args, params):
+    catalogue, sales = synthetic(args.products, args.transactions)
+    print(f'{args.products} products, {args.transactions} transactions -> {len(sales)} product-day rows')
+
+    loop_s, expected = timed(lambda: per_product(catalogue, sales, **params))
+    vector_s, suggestions = timed(lambda: restock.compute_suggestions(catalogue, sales, TODAY, **params))
+    got = dict(zip(suggestions['product_id'].tolist(), suggestions['suggested_qty'].tolist()))
+    mismatched = sum(got.get(pid) != qty for pid, qty in expected.items()) + len(got.keys() - expected.keys())
+    print(f'  per product  {loop_s * 1000:8.0f} ms')
+    print(f'  vectorized   {vector_s * 1000:8.0f} ms  ({loop_s / vector_s:.1f}x)  '
+          f'{len(suggestions)} suggestions, {mismatched} differ from per product')
+
+
+def in_database(args, params):
+    share = args.db_products / args.products
+    catalogue, sales = synthetic(args.db_products, int(args.transactions * share))
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        User.objects.bulk_create([User(id=i, username=f'bench{i}', phone=f'9{i:09d}') for i in range(1, USERS + 1)])
+        Product.objects.bulk_create([
+            Product(id=pid, user_id=uid, name=f'P{pid}', description='-', category='bench', price=10, stock_qty=stock)
+            for pid, uid, stock in catalogue.itertuples(index=False)
+        ], batch_size=5000)
+        owner = dict(zip(catalogue['product_id'], catalogue['user_id']))
+        DailySalesRollup.objects.bulk_create([
+            DailySalesRollup(user_id=owner[pid], product_id=pid, day=day.date(), count=1, amount=units * 10, units=units)
+            for pid, units, day in sales[['product_id', 'units', 'day']].itertuples(index=False)
+        ], batch_size=5000)
+
+        since = TODAY - timedelta(days=restock.DAYS_PER_YEAR + params['window'])
+        load_s, (products, loaded) = timed(lambda: (restock.load_products(), restock.load_sales(since)))
+        compute_s, suggestions = timed(lambda: restock.compute_suggestions(products, loaded, TODAY, **params))
+        write_s, _ = timed(lambda: restock.write_reminders(suggestions))
+        rewrite_s, _ = timed(lambda: restock.suggest_restock(today=TODAY, **params))
+        print(f'db ({connection.vendor}): {args.db_products} products, {len(sales)} rollup rows')
+        print(f'  load {load_s * 1000:.0f} ms  compute {compute_s * 1000:.0f} ms  '
+              f'write {RestockReminder.objects.count()} reminders {write_s * 1000:.0f} ms  '
+              f'full re-run {rewrite_s * 1000:.0f} ms')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--transactions', type=int, default=1_000_000)
+    parser.add_argument('--db-products', type=int, default=100_000, help='0 skips the database run')
+    args = parser.parse_args()
+    params = {'window': settings.RESTOCK_VELOCITY_DAYS, 'lead_days': settings.RESTOCK_LEAD_DAYS,
+              'cover_days': settings.RESTOCK_COVER_DAYS, 'z': settings.RESTOCK_SAFETY_Z}
+
+    in_memory(args, params)
+    if args.db_products:
+        in_database(args, params)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Sales questions answered from the daily rollups vs. from every transaction.
+
+Runs against a throw-away test database created from the configured backend::
+
+    DB_ENGINE=django.db.backends.sqlite3 SECRET_KEY=dev python benchmarks/bench_sales_summary.py --sizes 1000 10000 50000
+
+One user sells ``--products`` products over ``--days`` days. For each size:
+
+- ``scan``: what ``get_all_transactions`` had to do for "total earnings" or
+  "what sold most": page through ``/api/transactions/?user=..&status=completed``
+  and add the rows up (the agent then also reads every row).
+- ``summary``: ``GET /api/sales-summary/?user=..&daily=true``, same totals,
+  best sellers and per-day figures from the rollups.
+- ``complete``: cost of ``POST /api/transactions/<id>/complete/``, which now
+  also updates the day's rollup.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Main_Dharthi_Backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.models import DailySalesRollup, Product, Transaction, User  # noqa: E402
+from api.rollups import record_changes  # noqa: E402
+
+
+def fill(size, products, days):
+    user = User.objects.create(username='bench', phone='0000000000')
+    items = Product.objects.bulk_create([
+        Product(user=user, name=f'P{i}', description='-', category='bench', price=10, stock_qty=10 ** 6)
+        for i in range(products)
+    ])
+    items = list(Product.objects.filter(user=user).order_by('id')) if not items[0].pk else items
+    now = timezone.now()
+    per_day = size // days
+    for day in range(days, 0, -1):
+        Transaction.objects.bulk_create([
+            Transaction(user=user, product=items[i % products], amount=10 * (1 + i % 5), quantity=1 + i % 3,
+                        status='completed', reference_no=f'bench-{day}-{i}')
+            for i in range(per_day)
+        ], batch_size=2000)
+        fresh = Transaction.objects.filter(created_at__gt=now)
+        fresh.update(created_at=now - timedelta(days=day))
+        # Rows written outside save() report themselves, as the bulk endpoint does.
+        record_changes((None, txn) for txn in Transaction.objects.filter(reference_no__startswith=f'bench-{day}-'))
+    return user, items
+
+
+def scan(client, user):
+    count, amount, units, by_product = 0, Decimal(0), 0, Counter()
+    url, params = '/api/transactions/', {'user': user.id, 'status': 'completed', 'page_size': 100}
+    while url:
+        page = client.get(url, params).json()
+        for row in page['results']:
+            count += 1
+            amount += Decimal(row['amount'])
+            units += row['quantity']
+            by_product[row['product']] += Decimal(row['amount'])
+        url, params = page['next'], None
+    return {'count': count, 'amount': f'{amount:.2f}', 'units': units}, by_product.most_common(1)[0][1]
+
+
+def summary(client, user):
+    response = client.get('/api/sales-summary/', {'user': user.id, 'daily': 'true'}).json()
+    return response['totals'], Decimal(response['top_products'][0]['amount'])
+
+
+def timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def run(size, args):
+    Transaction.objects.all().delete()
+    DailySalesRollup.objects.all().delete()
+    Product.objects.all().delete()
+    User.objects.all().delete()
+    user, items = fill(size, args.products, args.days)
+    client = APIClient()
+
+    scan_ms, scanned = timed(lambda: scan(client, user), max(1, args.repeat // 10))
+    summary_ms, summed = timed(lambda: summary(client, user), args.repeat)
+    assert scanned == summed, (scanned, summed)
+
+    pending = Transaction.objects.bulk_create([
+        Transaction(user=user, product=items[i % args.products], amount=10, reference_no=f'pending-{i}')
+        for i in range(args.repeat)
+    ])
+    pending = pending if pending[0].pk else Transaction.objects.filter(reference_no__startswith='pending-')
+    ids = iter([txn.pk for txn in pending])
+    complete_ms, _ = timed(lambda: client.post(f'/api/transactions/{next(ids)}/complete/'), args.repeat)
+
+    print(f'transactions {Transaction.objects.count():>7}  rollup rows {DailySalesRollup.objects.count():>5}'
+          f'  scan {scan_ms:9.1f} ms  summary {summary_ms:6.2f} ms  complete {complete_ms:5.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--products', type=int, default=20)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f'backend={connection.vendor} products={args.products} days={args.days}')
+        for size in args.sizes:
+            run(size, args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
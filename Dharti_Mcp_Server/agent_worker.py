@@ -0,0 +1,103 @@
+import asyncio
+import os
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentFinish
+from mcp_use import MCPAgent
+from pydantic import PrivateAttr
+from response_cache import is_write
+
+# The agent stack (LangChain, mcp_use) takes a second or more to import, so
+# client_api only imports this module when it spawns the first pool worker.
+
+# Tool calls of one model step that may run at the same time.
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
+
+
+class StepExecutor(AgentExecutor):
+    """AgentExecutor that bounds and orders the tool calls of one model step.
+
+    LangChain starts every call of a step at once. Here at most
+    ``tool_concurrency`` run together; reads run side by side, while a write
+    waits for the calls listed before it and holds back the ones after it, so
+    a step like [update_product, get_product] reads its own write. Results
+    come back in the order the model asked for them.
+
+    ``finished`` tells whether a step ended the run with the model's answer.
+    It stays False when the run was cut short by an error or the step limit.
+    """
+
+    tool_concurrency: int = TOOL_CONCURRENCY
+    finished: bool = False
+    _calls: list = PrivateAttr(default_factory=list)
+    _slots: asyncio.Semaphore | None = PrivateAttr(default=None)
+
+    async def _aiter_next_step(self, *args, **kwargs):
+        self._calls = []
+        async for item in super()._aiter_next_step(*args, **kwargs):
+            if isinstance(item, AgentFinish):
+                self.finished = True
+            yield item
+
+    async def _aperform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None):
+        # The calls of a step start in the order they were listed, so
+        # everything up to the first await sees only the calls before this one.
+        write = is_write(agent_action.tool)
+        earlier = list(self._calls)
+        done = asyncio.Event()
+        self._calls.append((write, done))
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.tool_concurrency)
+        try:
+            for earlier_write, earlier_done in earlier:
+                if write or earlier_write:
+                    await earlier_done.wait()
+            async with self._slots:
+                return await super()._aperform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+        finally:
+            done.set()
+
+
+class ScopedAgent(MCPAgent):
+    """An MCPAgent whose tools can be narrowed per run without reconnecting."""
+
+    async def initialize(self):
+        await super().initialize()
+        self._all_tools = self._tools
+        self._executors = {None: (self._tools, self._agent_executor)}
+
+    def expose(self, names=None):
+        """Offer only the tools in ``names`` (all of them for ``None``) from the next run on."""
+        key = frozenset(names) if names is not None else None
+        if key not in self._executors:
+            self._tools = [tool for tool in self._all_tools if tool.name in key]
+            self._executors[key] = (self._tools, self._create_agent())
+        self._tools, self._agent_executor = self._executors[key]
+
+    @property
+    def finished(self):
+        """Whether the last run ended with the model's answer.
+
+        mcp_use turns step errors and the step limit into ordinary text
+        results, which must not be cached as answers.
+        """
+        return self._agent_executor.finished
+
+    async def stream(self, *args, **kwargs):
+        self._agent_executor.finished = False
+        async for item in super().stream(*args, **kwargs):
+            yield item
+
+    async def stream_events(self, *args, **kwargs):
+        self._agent_executor.finished = False
+        async for event in super().stream_events(*args, **kwargs):
+            yield event
+
+    def _create_agent(self):
+        executor = super()._create_agent()
+        return StepExecutor(
+            agent=executor.agent,
+            tools=self._tools,
+            max_iterations=self.max_steps,
+            verbose=self.verbose,
+            tool_concurrency=TOOL_CONCURRENCY,
+        )
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import os
+from collections import deque
+
+import httpx
+
+from backend_client import api_post
+from tool_cache import tool_cache
+
+# AI logs are written off the conversation's critical path: create_ai_log only
+# queues the entry, and a background task sends the queue to the bulk endpoint
+# in batches, when a batch is full or every AI_LOG_FLUSH_INTERVAL seconds.
+AI_LOG_QUEUE_SIZE = int(os.getenv("AI_LOG_QUEUE_SIZE", "5000"))
+# At most MAX_BULK_ITEMS (500) per request on the backend.
+AI_LOG_BATCH_SIZE = int(os.getenv("AI_LOG_BATCH_SIZE", "200"))
+AI_LOG_FLUSH_INTERVAL = float(os.getenv("AI_LOG_FLUSH_INTERVAL", "1"))
+# How long shutdown may spend sending what is still queued.
+AI_LOG_SHUTDOWN_TIMEOUT = float(os.getenv("AI_LOG_SHUTDOWN_TIMEOUT", "5"))
+
+# This runs inside the stdio MCP server, where stdout is the JSON-RPC channel:
+# report problems through logging (stderr), never print().
+logger = logging.getLogger(__name__)
+
+
+async def post_batch(batch: list) -> dict:
+    try:
+        return await api_post("ai-logs/bulk/", batch)
+    finally:
+        tool_cache.invalidate("ai_logs")
+
+
+class AILogQueue:
+    """Bounded in-memory queue of AI log entries, sent in batches by a background task.
+
+    ``log()`` never waits. When the queue is full the oldest entry is dropped
+    to make room (recent logs are the useful ones) and counted in ``dropped``.
+    A batch that fails to reach the backend goes back to the front of the
+    queue and is retried on the next flush; entries the backend rejects are
+    counted in ``rejected`` and not retried.
+    """
+
+    def __init__(self, maxsize=AI_LOG_QUEUE_SIZE, batch_size=AI_LOG_BATCH_SIZE, flush_interval=AI_LOG_FLUSH_INTERVAL,
+                 sender=post_batch):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sender = sender
+        self._entries = deque()
+        self._wakeup = asyncio.Event()
+        self._flushing = asyncio.Lock()
+        self._task = None
+        self.queued = self.sent = self.rejected = self.dropped = self.batches = self.send_errors = 0
+
+    def log(self, entry: dict):
+        if len(self._entries) >= self.maxsize:
+            self._entries.popleft()
+            self.dropped += 1
+        self._entries.append(entry)
+        self.queued += 1
+        if len(self._entries) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """Send everything queued; returns False if the backend could not be reached."""
+        async with self._flushing:
+            while self._entries:
+                batch = [self._entries.popleft() for _ in range(min(self.batch_size, len(self._entries)))]
+                try:
+                    response = await self.sender(batch)
+                except asyncio.CancelledError:
+                    self._entries.extendleft(reversed(batch))
+                    raise
+                except (httpx.HTTPError, ValueError) as e:
+                    # Keep the batch for the next flush, as far as there is room.
+                    self.send_errors += 1
+                    kept = batch[max(0, len(batch) - (self.maxsize - len(self._entries))):]
+                    self._entries.extendleft(reversed(kept))
+                    self.dropped += len(batch) - len(kept)
+                    logger.warning("Error sending AI logs: %s", e)
+                    return False
+                self.batches += 1
+                results = response.get("results") if isinstance(response, dict) else None
+                created = sum(result.get("status") == "created" for result in results or ())
+                self.sent += created
+                self.rejected += len(batch) - created
+        return True
+
+    async def close(self, timeout=AI_LOG_SHUTDOWN_TIMEOUT):
+        """Stop the background task and send what is left, within ``timeout`` seconds."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if self._entries:
+            logger.warning("Could not send %d AI logs before shutdown", len(self._entries))
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._entries),
+            "maxsize": self.maxsize,
+            "queued": self.queued,
+            "sent": self.sent,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "send_errors": self.send_errors,
+        }
+
+
+ai_log_queue = AILogQueue()
@@ -0,0 +1,143 @@
+import os
+from contextlib import aclosing
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+DJANGO_API = os.getenv("DJANGO_API", "http://localhost:8001/api")
+
+# Pool settings for the shared client. Every tool talks to the same Django host,
+# so these limits are effectively per-host limits.
+MAX_CONNECTIONS = int(os.getenv("DJANGO_API_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("DJANGO_API_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("DJANGO_API_KEEPALIVE_EXPIRY", "30"))
+REQUEST_TIMEOUT = float(os.getenv("DJANGO_API_TIMEOUT", "10"))
+CONNECT_TIMEOUT = float(os.getenv("DJANGO_API_CONNECT_TIMEOUT", "5"))
+
+# List tools follow the backend's cursor links page by page. PAGE_SIZE matches
+# IdCursorPagination.max_page_size; LIST_LIMIT is the default row cap per call.
+PAGE_SIZE = int(os.getenv("DJANGO_API_PAGE_SIZE", "100"))
+LIST_LIMIT = int(os.getenv("DJANGO_API_LIST_LIMIT", "50"))
+
+_client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+class BackendError(Exception):
+    """A non-2xx answer to a list page; ``body`` is the backend's error."""
+
+    def __init__(self, status_code: int, body: dict):
+        super().__init__(f"backend answered {status_code}: {body}")
+        self.status_code = status_code
+        self.body = body
+
+
+def _url(path: str) -> str:
+    return f"{DJANGO_API}/{path.lstrip('/')}"
+
+
+def _json(response: httpx.Response):
+    """The JSON body; a non-JSON error page (e.g. an HTML 500) becomes ``{"detail": ...}``."""
+    try:
+        return response.json()
+    except ValueError:
+        if response.is_success:
+            raise
+        return {"detail": f"Backend error {response.status_code} {response.reason_phrase}".strip()}
+
+
+async def api_get(path: str, params: dict = None) -> dict:
+    response = await get_client().get(_url(path), params=params)
+    return _json(response)
+
+
+async def api_post(path: str, data) -> dict:
+    response = await get_client().post(_url(path), json=data)
+    return _json(response)
+
+
+async def api_put(path: str, data) -> dict:
+    response = await get_client().put(_url(path), json=data)
+    return _json(response)
+
+
+async def api_patch(path: str, data) -> dict:
+    response = await get_client().patch(_url(path), json=data)
+    return _json(response)
+
+
+async def api_delete(path: str, data=None) -> dict:
+    if data is not None:
+        # Bulk deletes carry their ids in the body and answer with per-item results.
+        response = await get_client().request("DELETE", _url(path), json=data)
+        return _json(response)
+    response = await get_client().delete(_url(path))
+    return {"deleted": response.status_code == 204}
+
+
+async def iter_rows(path: str, params: dict = None, page_size: int = PAGE_SIZE):
+    """Yield rows of a cursor-paginated list endpoint, fetching pages lazily."""
+    url = _url(path)
+    params = {key: value for key, value in (params or {}).items() if value is not None}
+    params["page_size"] = page_size
+    while url:
+        response = await get_client().get(url, params=params)
+        if not response.is_success:
+            # A bad filter (400) or a stale cursor (404) is not an empty list.
+            raise BackendError(response.status_code, _json(response))
+        page = response.json()
+        if isinstance(page, list):
+            for row in page:
+                yield row
+            return
+        for row in page.get("results", []):
+            yield row
+        # The next link already carries the cursor and the original query.
+        url, params = page.get("next"), None
+
+
+async def api_list(path: str, params: dict = None, limit: int = None, fields: list = None) -> dict:
+    """Collect at most ``limit`` rows, keeping only ``fields`` when given.
+
+    A page the backend refuses gives its error body instead, as the
+    single-object calls return it.
+    """
+    limit = limit if limit and limit > 0 else LIST_LIMIT
+    if fields:
+        # Endpoints that support ?fields= project in the database; the
+        # per-row projection below covers the ones that ignore it.
+        params = dict(params or {}, fields=",".join(fields))
+    rows, has_more = [], False
+    try:
+        async with aclosing(iter_rows(path, params, page_size=min(limit + 1, PAGE_SIZE))) as pages:
+            async for row in pages:
+                if len(rows) == limit:
+                    has_more = True
+                    break
+                if fields and isinstance(row, dict):
+                    row = {key: row[key] for key in fields if key in row}
+                rows.append(row)
+    except BackendError as e:
+        return e.body
+    return {"results": rows, "count": len(rows), "has_more": has_more}
@@ -0,0 +1,284 @@
+from backend_client import LIST_LIMIT, api_get, api_list, api_post, api_put, api_patch, api_delete
+from tool_cache import cached_tool, invalidates
+
+# The tools that only call the Django API. They live apart from server_code.py,
+# which registers them on the MCP server, so that the FastAPI process (intent
+# router, response cache) can import them without building FastMCP.
+
+# Entity families whose cached reads a write can make stale. Catalog details
+# embed products and reminders embed product names; deletes cascade.
+PRODUCT_READS = ("products", "catalogs", "restock_reminders")
+PRODUCT_CASCADE = ("products", "catalogs", "transactions", "restock_reminders")
+ALL_FAMILIES = ("products", "catalogs", "transactions", "users", "restock_reminders", "ai_logs")
+
+# (function, description) of every tool below, in definition order.
+TOOLS = []
+
+
+def tool(description: str):
+    """Record a tool for server_code.py to register; the function is returned unchanged."""
+    def register(fn):
+        TOOLS.append((fn, description))
+        return fn
+    return register
+
+
+@tool(description="Create a new product")
+@invalidates(*PRODUCT_READS)
+async def create_product(data: dict) -> dict:
+    return await api_post("products/", data)
+
+@tool(description="Get all products, newest first. limit caps the number of rows returned (has_more tells if there are more); fields keeps only the listed keys of each row. "
+                  "Filters run in the database: user (user ID), category, search (matches name or description), min_price/max_price, min_stock/max_stock, "
+                  "created_after/created_before (ISO datetimes)")
+@cached_tool("products")
+async def get_all_products(
+    limit: int = LIST_LIMIT,
+    fields: list[str] | None = None,
+    user: int | None = None,
+    category: str | None = None,
+    search: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_stock: int | None = None,
+    max_stock: int | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> dict:
+    params = {
+        "user": user, "category": category, "search": search,
+        "min_price": min_price, "max_price": max_price,
+        "min_stock": min_stock, "max_stock": max_stock,
+        "created_after": created_after, "created_before": created_before,
+    }
+    return await api_list("products/", params, limit=limit, fields=fields)
+
+@tool(description="Get a product by ID")
+@cached_tool("products")
+async def get_product(product_id: int) -> dict:
+    return await api_get(f"products/{product_id}/")
+
+@tool(description="Update a product by ID")
+@invalidates(*PRODUCT_READS)
+async def update_product(product_id: int, data: dict) -> dict:
+    return await api_put(f"products/{product_id}/", data)
+
+@tool(description="Delete a product by ID")
+@invalidates(*PRODUCT_CASCADE)
+async def delete_product(product_id: int) -> dict:
+    return await api_delete(f"products/{product_id}/")
+
+@tool(description="Create many products in one step. items is a list of product objects (same fields as create_product); returns one result per item")
+@invalidates(*PRODUCT_READS)
+async def bulk_create_products(items: list[dict]) -> dict:
+    return await api_post("products/bulk/", items)
+
+@tool(description="Update many products in one step. items is a list of objects with the product id plus only the fields to change, e.g. [{\"id\": 3, \"stock_qty\": 40}]; returns one result per item")
+@invalidates(*PRODUCT_READS)
+async def bulk_update_products(items: list[dict]) -> dict:
+    return await api_patch("products/bulk/", items)
+
+@tool(description="Delete many products by ID in one step; returns one result per ID")
+@invalidates(*PRODUCT_CASCADE)
+async def bulk_delete_products(ids: list[int]) -> dict:
+    return await api_delete("products/bulk/", {"ids": ids})
+
+# ---------- CATALOG TOOLS ----------
+
+@tool(description="Create a new catalog")
+@invalidates("catalogs")
+async def create_catalog(data: dict) -> dict:
+    return await api_post("catalogs/", data)
+
+@tool(description="Get all catalogs, newest first. limit caps the number of rows returned (has_more tells if there are more); fields keeps only the listed keys of each row. "
+                  "user (user ID) keeps only that user's catalogs")
+@cached_tool("catalogs")
+async def get_all_catalogs(limit: int = LIST_LIMIT, fields: list[str] | None = None, user: int | None = None) -> dict:
+    return await api_list("catalogs/", {"user": user}, limit=limit, fields=fields)
+
+@tool(description="Get a catalog by ID")
+@cached_tool("catalogs")
+async def get_catalog(catalog_id: int) -> dict:
+    return await api_get(f"catalogs/{catalog_id}/")
+
+@tool(description="Update a catalog by ID")
+@invalidates("catalogs")
+async def update_catalog(catalog_id: int, data: dict) -> dict:
+    return await api_put(f"catalogs/{catalog_id}/", data)
+
+@tool(description="Delete a catalog by ID")
+@invalidates("catalogs")
+async def delete_catalog(catalog_id: int) -> dict:
+    return await api_delete(f"catalogs/{catalog_id}/")
+
+# ---------- TRANSACTION TOOLS ----------
+
+@tool(description="Create a new transaction")
+@invalidates("transactions")
+async def create_transaction(data: dict) -> dict:
+    return await api_post("transactions/", data)
+
+@tool(description="Get all transactions, newest first. limit caps the number of rows returned (has_more tells if there are more); fields keeps only the listed keys of each row. "
+                  "Filters run in the database: user (user ID), product (product ID), status (pending, completed or failed), search (matches reference number or product name), "
+                  "min_amount/max_amount, created_after/created_before (ISO datetimes)")
+@cached_tool("transactions")
+async def get_all_transactions(
+    limit: int = LIST_LIMIT,
+    fields: list[str] | None = None,
+    user: int | None = None,
+    product: int | None = None,
+    status: str | None = None,
+    search: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> dict:
+    params = {
+        "user": user, "product": product, "status": status, "search": search,
+        "min_amount": min_amount, "max_amount": max_amount,
+        "created_after": created_after, "created_before": created_before,
+    }
+    return await api_list("transactions/", params, limit=limit, fields=fields)
+
+@tool(description="Get a transaction by ID")
+@cached_tool("transactions")
+async def get_transaction(transaction_id: int) -> dict:
+    return await api_get(f"transactions/{transaction_id}/")
+
+@tool(description="Sales totals of completed transactions from daily rollups: count, amount earned and units sold overall, "
+                  "plus the best-selling products. Use this instead of get_all_transactions for earnings, \"what sold most\" "
+                  "or sales over a period. Filters: user (user ID), product (product ID), start/end (inclusive dates, YYYY-MM-DD); "
+                  "top products ranked by order (amount, units or count); daily adds one entry per day")
+@cached_tool("transactions")
+async def get_sales_summary(
+    user: int | None = None,
+    product: int | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    top: int = 5,
+    order: str = "amount",
+    daily: bool = False,
+) -> dict:
+    params = {"user": user, "product": product, "start": start, "end": end, "top": top, "order": order,
+              "daily": "true" if daily else None}
+    return await api_get("sales-summary/", {key: value for key, value in params.items() if value is not None})
+
+@tool(description="Update a transaction by ID")
+@invalidates("transactions")
+async def update_transaction(transaction_id: int, data: dict) -> dict:
+    return await api_put(f"transactions/{transaction_id}/", data)
+
+@tool(description="Complete a pending sale: marks the transaction completed and takes its quantity out of the product's stock in one step. "
+                  "Fails without changing anything if there is not enough stock or the transaction is not pending. Use this instead of update_transaction to record a finished sale")
+@invalidates("transactions", *PRODUCT_READS)
+async def complete_transaction(transaction_id: int) -> dict:
+    return await api_post(f"transactions/{transaction_id}/complete/", None)
+
+@tool(description="Delete a transaction by ID")
+@invalidates("transactions")
+async def delete_transaction(transaction_id: int) -> dict:
+    return await api_delete(f"transactions/{transaction_id}/")
+
+@tool(description="Create many transactions in one step. items is a list of transaction objects (same fields as create_transaction); returns one result per item")
+@invalidates("transactions")
+async def bulk_create_transactions(items: list[dict]) -> dict:
+    return await api_post("transactions/bulk/", items)
+
+@tool(description="Update many transactions in one step. items is a list of objects with the transaction id plus only the fields to change, e.g. [{\"id\": 3, \"status\": \"completed\"}]; returns one result per item")
+@invalidates("transactions")
+async def bulk_update_transactions(items: list[dict]) -> dict:
+    return await api_patch("transactions/bulk/", items)
+
+@tool(description="Delete many transactions by ID in one step; returns one result per ID")
+@invalidates("transactions")
+async def bulk_delete_transactions(ids: list[int]) -> dict:
+    return await api_delete("transactions/bulk/", {"ids": ids})
+
+# ---------- USER TOOLS ----------
+
+@tool(description="Create a new user")
+@invalidates("users")
+async def create_user(data: dict) -> dict:
+    return await api_post("users/", data)
+
+@tool(description="Login the user")
+async def login_user(data: str) -> dict:
+    return await api_post("login/", {"username":data})
+
+@tool(description="Get all users, newest first. limit caps the number of rows returned (has_more tells if there are more); fields keeps only the listed keys of each row")
+@cached_tool("users")
+async def get_all_users(limit: int = LIST_LIMIT, fields: list[str] | None = None) -> dict:
+    return await api_list("users/", limit=limit, fields=fields)
+
+@tool(description="Get a user by ID")
+@cached_tool("users")
+async def get_user(user_id: int) -> dict:
+    return await api_get(f"users/{user_id}/")
+
+@tool(description="Update a user by ID")
+@invalidates("users")
+async def update_user(user_id: int, data: dict) -> dict:
+    return await api_put(f"users/{user_id}/", data)
+
+@tool(description="Delete a user by ID")
+@invalidates(*ALL_FAMILIES)
+async def delete_user(user_id: int) -> dict:
+    return await api_delete(f"users/{user_id}/")
+
+# ---------- RESTOCK REMINDER TOOLS ----------
+
+@tool(description="Create a restock reminder")
+@invalidates("restock_reminders")
+async def create_restock_reminder(data: dict) -> dict:
+    return await api_post("restock-reminders/", data)
+
+@tool(description="Get all restock reminders, newest first. limit caps the number of rows returned (has_more tells if there are more); fields keeps only the listed keys of each row. "
+                  "Filters: user (user ID), product (product ID), source ('manual' or 'engine')")
+@cached_tool("restock_reminders")
+async def get_all_restock_reminders(
+    limit: int = LIST_LIMIT,
+    fields: list[str] | None = None,
+    user: int | None = None,
+    product: int | None = None,
+    source: str | None = None,
+) -> dict:
+    params = {"user": user, "product": product, "source": source}
+    return await api_list("restock-reminders/", params, limit=limit, fields=fields)
+
+@tool(description="Delete a restock reminder by ID")
+@invalidates("restock_reminders")
+async def delete_restock_reminder(reminder_id: int) -> dict:
+    return await api_delete(f"restock-reminders/{reminder_id}/")
+
+@tool(description="Create many restock reminders in one step. items is a list of restock reminder objects (same fields as create_restock_reminder); returns one result per item")
+@invalidates("restock_reminders")
+async def bulk_create_restock_reminders(items: list[dict]) -> dict:
+    return await api_post("restock-reminders/bulk/", items)
+
+@tool(description="Update many restock reminders in one step. items is a list of objects with the restock reminder id plus only the fields to change, e.g. [{\"id\": 3, \"suggested_qty\": 40}]; returns one result per item")
+@invalidates("restock_reminders")
+async def bulk_update_restock_reminders(items: list[dict]) -> dict:
+    return await api_patch("restock-reminders/bulk/", items)
+
+@tool(description="Delete many restock reminders by ID in one step; returns one result per ID")
+@invalidates("restock_reminders")
+async def bulk_delete_restock_reminders(ids: list[int]) -> dict:
+    return await api_delete("restock-reminders/bulk/", {"ids": ids})
+
+# Tool names by entity family. LLM_Client shows the model only the groups a
+# prompt is about, so each agent step carries fewer tool schemas. The AI log
+# tools are defined in server_code.py, next to the queue they write to.
+TOOL_GROUPS = {
+    "products": ("create_product", "get_all_products", "get_product", "update_product", "delete_product",
+                 "bulk_create_products", "bulk_update_products", "bulk_delete_products"),
+    "catalogs": ("create_catalog", "get_all_catalogs", "get_catalog", "update_catalog", "delete_catalog"),
+    "transactions": ("create_transaction", "get_all_transactions", "get_transaction", "get_sales_summary",
+                     "update_transaction", "complete_transaction", "delete_transaction", "bulk_create_transactions",
+                     "bulk_update_transactions", "bulk_delete_transactions"),
+    "users": ("create_user", "login_user", "get_all_users", "get_user", "update_user", "delete_user"),
+    "restock_reminders": ("create_restock_reminder", "get_all_restock_reminders", "delete_restock_reminder",
+                          "bulk_create_restock_reminders", "bulk_update_restock_reminders",
+                          "bulk_delete_restock_reminders"),
+    "ai_logs": ("create_ai_log", "get_all_ai_logs"),
+}
@@ -0,0 +1,82 @@
+"""/prompt throughput vs. agent pool size, with a stand-in for the agent.
+
+Usage::
+
+    python benchmarks/bench_agent_pool.py --users 16 --requests 64 --agent-latency 0.2
+
+Each fake agent sleeps for ``--agent-latency`` seconds per run, standing in
+for the Groq round trips and tool calls of a real MCPAgent. The pool, lease
+and history-reset logic are the real ``client_api.AgentPool``.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from client_api import AgentPool  # noqa: E402
+
+
+class FakeAgent:
+    client = None
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def initialize(self):
+        await asyncio.sleep(0.01)
+
+    async def run(self, prompt):
+        await asyncio.sleep(self.latency)
+        return "ok"
+
+    async def stream(self, prompt, external_history=None):
+        yield await self.run(prompt)
+
+    def expose(self, names=None):
+        pass
+
+    def clear_conversation_history(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+async def bench(pool_size, users, requests, latency):
+    pool = AgentPool(lambda: FakeAgent(latency), size=pool_size)
+    await pool.start()
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def user():
+        while not queue.empty():
+            queue.get_nowait()
+            async with pool.lease(timeout=600) as agent:
+                await agent.run("hello")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--agent-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"users={args.users} requests={args.requests} agent_latency={args.agent_latency}s")
+    for size in (1, 2, 4, 8, 16):
+        rps = asyncio.run(bench(size, args.users, args.requests, args.agent_latency))
+        print(f"pool_size={size:>2}: {rps:6.1f} prompts/s")
+
+
+if __name__ == "__main__":
+    main()
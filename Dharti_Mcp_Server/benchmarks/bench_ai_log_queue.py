@@ -0,0 +1,98 @@
+"""AI log writes: one POST per entry vs. the batching queue.
+
+Usage::
+
+    python benchmarks/bench_ai_log_queue.py --entries 2000 --latency 0.005
+
+- ``direct``: the old create_ai_log body, one awaited ``POST ai-logs/`` per
+  entry; the caller waits for every round trip.
+- ``queued``: ``server_code.create_ai_log`` as the agent calls it; the caller
+  only enqueues, and the queue drains to ``ai-logs/bulk/`` in the background.
+  "drained" is the time until every entry reached the backend.
+- ``backend down``: the queue pointed at a closed port, to show the bounded
+  queue dropping the oldest entries instead of growing.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_log_queue as queue_module  # noqa: E402
+import backend_client  # noqa: E402
+import server_code  # noqa: E402
+from ai_log_queue import AILogQueue  # noqa: E402
+from benchmarks.stub_backend import start_stub_backend  # noqa: E402
+
+
+def entry(i):
+    return {"user": 1, "action_type": "voice", "input_data": {"prompt": f"stock of item {i}"},
+            "ai_output": {"reply": f"item {i}: 12 kg in stock"}}
+
+
+async def direct(entries):
+    start = time.perf_counter()
+    for i in range(entries):
+        await backend_client.api_post("ai-logs/", entry(i))
+    elapsed = time.perf_counter() - start
+    await backend_client.close_client()
+    print(f"direct   caller {elapsed / entries * 1e6:8.0f} us/entry  drained {entries / elapsed:8.0f} entries/s  "
+          f"requests {entries}")
+
+
+async def queued(entries, args):
+    server_code.ai_log_queue = queue = AILogQueue(maxsize=args.queue_size, batch_size=args.batch_size)
+    queue.start()
+    start = time.perf_counter()
+    for i in range(entries):
+        await server_code.create_ai_log(entry(i))
+    caller = time.perf_counter() - start
+    await queue.close()
+    drained = time.perf_counter() - start
+    await backend_client.close_client()
+    stats = queue.stats()
+    print(f"queued   caller {caller / entries * 1e6:8.1f} us/entry  drained {entries / drained:8.0f} entries/s  "
+          f"requests {stats['batches']}  sent {stats['sent']}  dropped {stats['dropped']}")
+
+
+async def backend_down(entries, args):
+    backend_client.DJANGO_API = "http://127.0.0.1:9/api"
+    queue = AILogQueue(maxsize=args.queue_size, batch_size=args.batch_size, flush_interval=0.05)
+    queue.start()
+    for i in range(entries):
+        queue.log(entry(i))
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.2)
+    await queue.close(timeout=1)
+    await backend_client.close_client()
+    stats = queue.stats()
+    print(f"down     queued {stats['queued']}  pending {stats['pending']} (max {stats['maxsize']})  "
+          f"dropped {stats['dropped']}  send errors {stats['send_errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated backend time per request (s)")
+    parser.add_argument("--batch-size", type=int, default=queue_module.AI_LOG_BATCH_SIZE)
+    parser.add_argument("--queue-size", type=int, default=queue_module.AI_LOG_QUEUE_SIZE)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server, base_url = start_stub_backend(latency=args.latency)
+    backend_client.DJANGO_API = base_url
+    try:
+        asyncio.run(direct(args.entries))
+        asyncio.run(queued(args.entries, args))
+    finally:
+        server.shutdown()
+    args.queue_size = min(args.queue_size, args.entries // 4)
+    asyncio.run(backend_down(args.entries, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Agent steps that ask for several tools at once: one at a time vs. concurrent.
+
+Usage::
+
+    python benchmarks/bench_parallel_tools.py --latency 0.05 --runs 5
+
+Runs scripted prompts through ``LLM_Client.send_prompt`` with a real pool
+worker (a ``server_code.py`` child process) talking to the stub backend. The
+stub chat model answers each prompt with one step of several tool calls and
+then a final answer. Each prompt is run with ``TOOL_CONCURRENCY=1`` (the calls
+of a step one after another) and with the default limit. The tool cache is
+off in the worker, so every call reaches the backend.
+
+The last prompt updates a product and reads it back in the same step; "read
+own write" checks that the read saw the update under concurrency.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ["INTENT_ROUTER_ENABLED"] = "0"
+os.environ["MCP_USE_ANONYMIZED_TELEMETRY"] = "false"
+os.environ["args"] = os.path.join(os.path.dirname(HERE), "server_code.py")
+
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, ToolMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+
+import agent_worker  # noqa: E402
+import client_api  # noqa: E402
+from benchmarks.stub_backend import start_stub_backend  # noqa: E402
+from client_api import LLM_Client  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+# prompt -> the tool calls of its one step
+STEPS = {
+    "how is tomato doing": [
+        ("get_product", {"product_id": 1}),
+        ("get_all_restock_reminders", {}),
+        ("get_all_transactions", {"status": "pending"}),
+    ],
+    "morning overview": [
+        ("get_all_products", {"max_stock": 10}),
+        ("get_all_transactions", {"status": "pending"}),
+        ("get_all_restock_reminders", {}),
+        ("get_all_catalogs", {}),
+        ("get_product", {"product_id": 2}),
+        ("get_product", {"product_id": 3}),
+    ],
+    "rename product 4 to Desi Tamatar and show it": [
+        ("update_product", {"product_id": 4, "data": {"name": "Desi Tamatar"}}),
+        ("get_product", {"product_id": 4}),
+    ],
+}
+
+
+class MultiCallLLM(BaseChatModel):
+    """Asks for every tool of the prompt's step at once, then answers."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "multi-call"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError("async only")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if isinstance(messages[-1], ToolMessage):
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="done"))])
+        calls = [
+            {"name": tool, "args": args, "id": f"call_{i}", "type": "tool_call"}
+            for i, (tool, args) in enumerate(STEPS[messages[-1].content])
+        ]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="", tool_calls=calls))])
+
+
+async def run(concurrency, base_url, args):
+    agent_worker.TOOL_CONCURRENCY = concurrency
+    client_api.response_cache = ResponseCache(maxsize=0, similarity=0)
+    client = LLM_Client(pool_size=1)
+    client.config["mcpServers"]["DhartiMCPServer"]["env"] = {"DJANGO_API": base_url, "TOOL_CACHE_TTL": "0"}
+    client.llm = MultiCallLLM()
+    await client.start()
+    await client.pool.warm()
+    timings = {prompt: [] for prompt in STEPS}
+    ordered = own_write = True
+    try:
+        for _ in range(args.runs):
+            for prompt, step in STEPS.items():
+                results = []
+                start = time.perf_counter()
+                async with client.pool.lease() as agent:
+                    async for item in agent.stream(prompt):
+                        if not isinstance(item, str):
+                            results.append(item)
+                timings[prompt].append(time.perf_counter() - start)
+                ordered &= [action.tool for action, _ in results] == [tool for tool, _ in step]
+                if prompt.startswith("rename"):
+                    own_write &= "Desi Tamatar" in str(results[-1][1])
+    finally:
+        await client.close()
+
+    print(f"TOOL_CONCURRENCY={concurrency}")
+    for prompt, step in STEPS.items():
+        print(f"  {len(step)} calls  {statistics.median(timings[prompt]) * 1000:7.1f} ms  {prompt!r}")
+    print(f"  results in call order: {ordered}  read own write: {own_write}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated backend time per request (s)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    server, base_url = start_stub_backend(latency=args.latency)
+    try:
+        for concurrency in (1, agent_worker.TOOL_CONCURRENCY):
+            asyncio.run(run(concurrency, base_url, args))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""/prompt answers served by the response cache on a replayed prompt mix.
+
+Usage::
+
+    python benchmarks/bench_response_cache.py --requests 400 --agent-latency 0.3
+
+Drives ``LLM_Client.send_prompt`` with a pool of scripted agents: greetings and
+help questions call no tools, data questions call a read tool, and a few
+prompts add a product (a write), which must evict the cached data answers.
+The intent router is switched off so every prompt is a candidate for the
+cache. Prompts are drawn from paraphrase groups ("aap kaun ho" / "Aap kaun
+ho?" / "aap kon ho") with a skew towards the common ones.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ["INTENT_ROUTER_ENABLED"] = "0"
+
+import client_api  # noqa: E402
+from client_api import AgentPool, LLM_Client  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+GROUPS = [
+    ("", ["aap kaun ho", "Aap kaun ho?", "aap kon ho", "aap kaun ho ?"]),
+    ("", ["who are you", "Who are you?", "who are u"]),
+    ("", ["how do I add a product", "How do I add a product?", "how do i add a new product"]),
+    ("", ["what can you do", "What can you do?", "what all can you do"]),
+    ("get_all_products", ["show my products", "Show my products.", "show me my products"]),
+    ("get_all_transactions", ["any pending payments", "Any pending payments?"]),
+    ("get_all_restock_reminders", ["what should I restock", "What should I restock?"]),
+    ("create_product", ["add 10 kg tomato at 20 rupees"]),
+]
+
+
+class ScriptedAgent:
+    client = None
+    finished = True
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.runs = 0
+
+    async def initialize(self):
+        pass
+
+    async def stream(self, prompt, external_history=None):
+        tool = next((tool for tool, prompts in GROUPS if prompt in prompts), "")
+        await asyncio.sleep(self.latency)
+        self.runs += 1
+        if tool:
+            yield SimpleNamespace(tool=tool), "..."
+        yield f"answer to {prompt}"
+
+    def expose(self, names=None):
+        pass
+
+    def clear_conversation_history(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+async def bench(args):
+    rng = random.Random(11)
+    weights = [1 / (rank + 1) for rank in range(len(GROUPS))]
+    client = LLM_Client(pool_size=args.pool_size)
+    agents = []
+
+    def factory():
+        agents.append(ScriptedAgent(args.agent_latency))
+        return agents[-1]
+
+    client.pool = AgentPool(factory, size=args.pool_size)
+    await client.start()
+    latencies = []
+    for _ in range(args.requests):
+        _, prompts = rng.choices(GROUPS, weights=weights)[0]
+        start = time.perf_counter()
+        await client.send_prompt(rng.choice(prompts), user_id=1)
+        latencies.append(time.perf_counter() - start)
+    await client.close()
+
+    stats = client_api.response_cache.stats()
+    runs = sum(agent.runs for agent in agents)
+    print(
+        f"hit_ratio={stats['hit_ratio']:.3f} (exact {stats['hits'] - stats['similar_hits']}, "
+        f"similar {stats['similar_hits']}, miss {stats['misses']}, invalidated {stats['invalidations']})"
+    )
+    print(
+        f"agent runs={runs}/{args.requests}  mean={statistics.mean(latencies) * 1000:.1f} ms  "
+        f"p50={statistics.median(latencies) * 1000:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--agent-latency", type=float, default=0.3)
+    parser.add_argument("--data-ttl", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for similarity in (0.0, 0.7):
+        client_api.response_cache = ResponseCache(data_ttl=args.data_ttl, similarity=similarity)
+        print(f"similarity={similarity}")
+        asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Context sent to the model per turn: whole-conversation resend vs. sessions.
+
+Usage::
+
+    python benchmarks/bench_sessions.py --turns 20 --tool-result-chars 3000
+
+Replays one long conversation through ``LLM_Client.send_prompt`` with a
+session ID. The scripted agent records the history it is handed and answers
+with a product listing as a tool result on every other turn. For each turn
+it prints the estimated tokens of (a) the old approach (the instructions
+plus every earlier turn, verbatim, in the user message) and (b) the
+session history the agent actually got.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ["INTENT_ROUTER_ENABLED"] = "0"
+
+from client_api import AgentPool, LLM_Client  # noqa: E402
+from sessions import estimate_tokens  # noqa: E402
+
+
+class RecordingAgent:
+    client = None
+    finished = True
+
+    def __init__(self, tool_result_chars):
+        self.tool_result = "x" * tool_result_chars
+        self.histories = []
+
+    async def initialize(self):
+        pass
+
+    async def stream(self, prompt, external_history=None):
+        self.histories.append(external_history or [])
+        if len(self.histories) % 2:
+            yield SimpleNamespace(tool="get_all_products"), self.tool_result
+        yield f"Here is what I found for: {prompt}"
+
+    def expose(self, names=None):
+        pass
+
+    def clear_conversation_history(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+async def bench(args):
+    client = LLM_Client(pool_size=1)
+    agent = RecordingAgent(args.tool_result_chars)
+    client.pool = AgentPool(lambda: agent, size=1)
+    await client.start()
+
+    instructions = estimate_tokens(client.system_prompt)
+    transcript = 0
+    session_id = client.sessions.get().id
+    print(f"turn  resend-all  session-history   (budget {client.sessions.token_budget})")
+    for turn in range(1, args.turns + 1):
+        prompt = f"turn {turn}: add 5 more kg to the second product please"
+        await client.send_prompt(prompt, session_id=session_id)
+        sent = sum(estimate_tokens(message.content) for message in agent.histories[-1])
+        print(f"{turn:4d}  {instructions + transcript + estimate_tokens(prompt):10d}  {sent:15d}")
+        tool_output = args.tool_result_chars if turn % 2 else 0
+        transcript += estimate_tokens(prompt) + tool_output // 4 + estimate_tokens(f"Here is what I found for: {prompt}")
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--tool-result-chars", type=int, default=3000)
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Cold start of the FastAPI service: import time, time to ready, time to warm.
+
+Usage::
+
+    python benchmarks/bench_startup.py --repeat 3
+
+Each measurement runs in a fresh interpreter:
+
+- import: ``import main`` with no Groq key and no Google credentials in the
+  environment (what a test worker sees); reports the time or the error.
+- ready: ``uvicorn main:app`` started as a subprocess, until ``/health``
+  answers.
+- warm: until ``/health`` reports every agent pool worker idle, i.e. spawned
+  and initialized (the ``server_code.py`` children are real). Without
+  prewarm the pool only fills as prompts come in, so it is not measured.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_MAIN = (
+    "import time; start = time.perf_counter(); import main; "
+    "print(f'{(time.perf_counter() - start) * 1000:.0f}')"
+)
+
+
+def clean_env(**extra):
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in ("GROQ_API_KEY", "GOOGLE_APPLICATION_CREDENTIALS")
+    }
+    env.update(MCP_USE_ANONYMIZED_TELEMETRY="false", args=os.path.join(ROOT, "server_code.py"), **extra)
+    return env
+
+
+def measure_import():
+    proc = subprocess.run(
+        [sys.executable, "-c", IMPORT_MAIN], cwd=ROOT, env=clean_env(), capture_output=True, text=True
+    )
+    if proc.returncode:
+        return None, proc.stderr.strip().splitlines()[-1]
+    return float(proc.stdout.strip().splitlines()[-1]), None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_serve(pool_size, prewarm, timeout):
+    port = free_port()
+    env = clean_env(GROQ_API_KEY="bench", AGENT_POOL_SIZE=str(pool_size), AGENT_PREWARM=prewarm)
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    ready = warm = None
+    try:
+        while time.perf_counter() - start < timeout and warm is None:
+            try:
+                pool = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).json()["agent_pool"]
+            except httpx.HTTPError:
+                time.sleep(0.02)
+                continue
+            now = time.perf_counter() - start
+            ready = ready or now
+            if pool["idle"] == pool["size"]:
+                warm = now
+            elif prewarm == "0":
+                # Nothing fills the pool until the first prompt.
+                break
+            else:
+                time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return ready, warm
+
+
+def ms(values):
+    values = [value for value in values if value is not None]
+    return f"{statistics.median(values) * 1000:7.0f} ms" if values else "      never"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.repeat)]
+    times = [elapsed for elapsed, _ in imports if elapsed is not None]
+    if times:
+        print(f"import main (no credentials): {statistics.median(times):7.0f} ms")
+    else:
+        print(f"import main (no credentials): fails: {imports[-1][1]}")
+
+    for prewarm in ("1", "0"):
+        runs = [measure_serve(args.pool_size, prewarm, args.timeout) for _ in range(args.repeat)]
+        print(
+            f"AGENT_PREWARM={prewarm}  ready {ms([ready for ready, _ in runs])}"
+            f"  warm ({args.pool_size} workers) {ms([warm for _, warm in runs])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
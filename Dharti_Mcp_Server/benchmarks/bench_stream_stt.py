@@ -0,0 +1,80 @@
+"""Batch /stt vs. streaming /stt/stream on a long recording.
+
+Usage::
+
+    python benchmarks/bench_stream_stt.py --seconds 120 --frame-ms 100
+
+Runs ``main.app`` in-process against the local fake recognizer in
+``fake_voice.py``. For each path it reports the peak Python heap while the
+request is served, how many transcript messages came back (batch: one, at
+the end), and whether the final transcript covers every utterance.
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+import voice_services  # noqa: E402
+from fake_voice import BYTES_PER_SECOND, FakeVoiceClient  # noqa: E402
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    messages, transcript = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return messages, elapsed, peak, transcript
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=120)
+    parser.add_argument("--frame-ms", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="fake recognizer delay per response")
+    args = parser.parse_args()
+
+    fake = FakeVoiceClient(args.latency)
+    voice_services.speech_client = fake
+    n_bytes = args.seconds * BYTES_PER_SECOND
+    frame = b"\x00" * (BYTES_PER_SECOND * args.frame_ms // 1000)
+    expected = fake.expected_transcript(n_bytes)
+    client = TestClient(main.app)
+
+    def batch():
+        audio = base64.b64encode(b"\x00" * n_bytes).decode()
+        response = client.post("/stt", json={"audio_base64": audio})
+        return 1, response.json()["transcript"]
+
+    def streaming():
+        messages = 0
+        with client.websocket_connect("/stt/stream?sample_rate_hertz=16000") as ws:
+            for _ in range(n_bytes // len(frame)):
+                ws.send_bytes(frame)
+            ws.send_text("end")
+            while True:
+                event = ws.receive_json()
+                messages += 1
+                if event["type"] in ("done", "error"):
+                    return messages, event.get("transcript", event.get("detail"))
+
+    print(f"clip={args.seconds}s ({n_bytes / 1e6:.1f} MB LINEAR16) frame={args.frame_ms}ms")
+    for name, fn in (("batch", batch), ("stream", streaming)):
+        messages, elapsed, peak, transcript = measure(fn)
+        print(
+            f"{name:>6}: {messages:4d} messages  total {elapsed * 1000:8.1f} ms  "
+            f"peak heap {peak / 1e6:6.1f} MB  complete={transcript == expected}"
+        )
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,137 @@
+"""Prompt tokens and step latency per agent step: every tool vs. tool groups.
+
+Usage::
+
+    python benchmarks/bench_tool_groups.py --prefill-tps 2000
+
+Runs a fixed set of scripted conversations through ``LLM_Client.send_prompt``
+with a real pool worker (a ``server_code.py`` child process and the real
+LangChain tools built from it), once with every tool exposed and once with
+tool groups. The chat model is a local stand-in: it records what it is sent
+(messages plus the bound tool schemas), answers right away, and sleeps
+``tokens / --prefill-tps`` seconds to stand for the provider reading the
+prompt. "offered" counts the turns whose expected tool was in the exposed
+set; a turn that needs a tool the model cannot see is a wrong answer.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ["INTENT_ROUTER_ENABLED"] = "0"
+os.environ["MCP_USE_ANONYMIZED_TELEMETRY"] = "false"
+os.environ["args"] = os.path.join(os.path.dirname(HERE), "server_code.py")
+
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+from langchain_core.utils.function_calling import convert_to_openai_tool  # noqa: E402
+
+import client_api  # noqa: E402
+from client_api import LLM_Client  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from sessions import estimate_tokens  # noqa: E402
+
+# (prompt, tool the turn needs or None) per conversation.
+CONVERSATIONS = [
+    [("I want to add a new product", None),
+     ("Tomato, fresh red tomatoes, 20 rupees per kg, vegetables, 50 kg", None),
+     ("yes, add it", "create_product")],
+    [("I sold 5 kg tomato to Ramesh for 100 rupees", "create_transaction"),
+     ("he paid, mark it as completed", "complete_transaction")],
+    [("make a catalog for my summer vegetables", "create_catalog"),
+     ("put tomato and onion in it", "update_catalog")],
+    [("what should I restock before Diwali", "get_all_restock_reminders"),
+     ("remind me to reorder 40 kg onion", "create_restock_reminder")],
+    [("my name is Sita", "login_user"),
+     ("change my phone number to 9876543210", "update_user")],
+    [("who are you", None), ("what can you do", None)],
+    [("show the AI logs from today", "get_all_ai_logs")],
+    [("tamatar ka daam 25 kar do", "update_product")],
+    [("kitne pending payments hain", "get_all_transactions")],
+    [("delete the onion", "delete_product")],
+]
+
+CALLS = []
+
+
+class MeteredLLM(BaseChatModel):
+    """Answers at once; sleeps for the prompt's prefill time and records its size."""
+
+    prefill_tps: float = 2000.0
+    tools: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "metered"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"tools": [convert_to_openai_tool(tool) for tool in tools]})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError("async only")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        schema_tokens = estimate_tokens(json.dumps(self.tools))
+        message_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        CALLS.append({
+            "tools": {tool["function"]["name"] for tool in self.tools},
+            "schema_tokens": schema_tokens,
+            "prompt_tokens": schema_tokens + message_tokens,
+        })
+        await asyncio.sleep((schema_tokens + message_tokens) / self.prefill_tps)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+
+async def run(grouped, args):
+    client_api.TOOL_GROUPS_ENABLED = grouped
+    client_api.response_cache = ResponseCache(maxsize=0, similarity=0)
+    client = LLM_Client(pool_size=1)
+    client.llm = MeteredLLM(prefill_tps=args.prefill_tps)
+    await client.start()
+    await client.pool.warm()
+    CALLS.clear()
+    latencies, offered, needed = [], 0, 0
+    try:
+        for conversation in CONVERSATIONS:
+            session_id = client.sessions.get().id
+            for prompt, tool in conversation:
+                start = time.perf_counter()
+                await client.send_prompt(prompt, session_id=session_id)
+                latencies.append(time.perf_counter() - start)
+                if tool:
+                    needed += 1
+                    offered += tool in CALLS[-1]["tools"]
+    finally:
+        await client.close()
+
+    print(
+        f"{'groups' if grouped else 'all tools':9s}  steps={len(CALLS)}  "
+        f"tools/step={statistics.mean(len(call['tools']) for call in CALLS):5.1f}  "
+        f"schema tokens/step={statistics.mean(call['schema_tokens'] for call in CALLS):6.0f}  "
+        f"prompt tokens/step={statistics.mean(call['prompt_tokens'] for call in CALLS):6.0f}  "
+        f"step latency mean={statistics.mean(latencies) * 1000:6.1f} ms "
+        f"p95={sorted(latencies)[int(len(latencies) * 0.95)] * 1000:6.1f} ms  "
+        f"offered={offered}/{needed}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prefill-tps", type=float, default=2000.0, help="prompt tokens the provider reads per second")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for grouped in (False, True):
+        asyncio.run(run(grouped, args))
+
+
+if __name__ == "__main__":
+    main()
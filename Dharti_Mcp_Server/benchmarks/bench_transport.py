@@ -0,0 +1,73 @@
+"""Tool-layer throughput: per-call ``requests`` vs. the pooled async client.
+
+Usage::
+
+    python benchmarks/bench_transport.py --calls 500 --concurrency 16 --latency 0.005
+
+"Before" replays the old tool body (a fresh ``requests.get`` per call, one at
+a time). "After" drives ``backend_tools.get_all_products`` through the shared
+``httpx.AsyncClient`` with ``--concurrency`` tool calls in flight. The tool
+is called past its ``@cached_tool`` wrapper, so every call is a request.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+import backend_client  # noqa: E402
+import backend_tools  # noqa: E402
+from benchmarks.stub_backend import start_stub_backend  # noqa: E402
+
+
+def bench_requests(base_url, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        requests.get(f"{base_url}/products/").json()
+    return calls / (time.perf_counter() - start)
+
+
+async def bench_pooled(calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_call():
+        async with semaphore:
+            await backend_tools.get_all_products.__wrapped__()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    await backend_client.close_client()
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated backend time per request (s)")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server, base_url = start_stub_backend(latency=args.latency)
+    backend_client.DJANGO_API = base_url
+    try:
+        before = bench_requests(base_url, args.calls)
+        after_serial = asyncio.run(bench_pooled(args.calls, 1))
+        after = asyncio.run(bench_pooled(args.calls, args.concurrency))
+    finally:
+        server.shutdown()
+
+    print(f"calls={args.calls} latency={args.latency * 1000:.1f}ms")
+    print(f"before  requests, new connection per call : {before:8.1f} calls/s")
+    print(f"after   pooled async, 1 in flight         : {after_serial:8.1f} calls/s")
+    print(f"after   pooled async, {args.concurrency:>2} in flight        : {after:8.1f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
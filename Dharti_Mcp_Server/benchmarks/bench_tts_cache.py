@@ -0,0 +1,68 @@
+"""/tts/audio latency and TTS cache hit ratio on a repetitive phrase mix.
+
+Usage::
+
+    python benchmarks/bench_tts_cache.py --requests 500 --phrases 200 --latency 0.15
+
+Phrases are drawn with a Zipf-like skew (a few confirmations dominate, like
+real assistant replies). The fake TTS client blocks for ``--latency`` seconds
+per synthesis. The disk tier lives in a temporary directory; the second pass
+starts with an empty memory tier to show disk hits.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+import voice_services  # noqa: E402
+from fake_voice import FakeVoiceClient  # noqa: E402
+from tts_cache import TTSCache  # noqa: E402
+
+
+def run(client, texts):
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        response = client.post("/tts/audio", json={"text": text})
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200 and response.headers["content-type"] == "audio/mpeg"
+    return latencies
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--phrases", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.15)
+    args = parser.parse_args()
+
+    voice_services.tts_client = FakeVoiceClient(args.latency)
+    rng = random.Random(7)
+    phrases = [f"Aapka order number {i} confirm ho gaya hai" for i in range(args.phrases)]
+    weights = [1 / (rank + 1) for rank in range(args.phrases)]
+    texts = rng.choices(phrases, weights=weights, k=args.requests)
+    client = TestClient(main.app)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("cold", "disk"):
+            voice_services.tts_cache = TTSCache(directory=directory)
+            latencies = run(client, texts)
+            stats = voice_services.tts_cache.stats()
+            print(
+                f"{name:>4}: p50={statistics.median(latencies) * 1000:7.1f} ms "
+                f"mean={statistics.mean(latencies) * 1000:7.1f} ms  hit_ratio={stats['hit_ratio']:.3f} "
+                f"(memory {stats['memory_hits']}, disk {stats['disk_hits']}, miss {stats['misses']})"
+            )
+
+
+if __name__ == "__main__":
+    main_()
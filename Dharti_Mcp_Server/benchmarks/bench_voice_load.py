@@ -0,0 +1,125 @@
+"""/prompt latency while /stt and /tts traffic is running.
+
+Usage::
+
+    python benchmarks/bench_voice_load.py --voice-users 8 --voice-latency 0.3
+
+Drives the real FastAPI ``main.app`` in-process. The agent pool holds fake
+agents (``--agent-latency`` per run) and the Google clients are replaced by a
+local fake that blocks its calling thread for ``--voice-latency`` seconds,
+just like a gRPC ``recognize``/``synthesize_speech`` round trip does.
+
+Three scenarios are measured:
+
+- ``idle``:   /prompt alone.
+- ``pooled``: /prompt while voice users hammer /stt and /tts (worker pool).
+- ``inline``: the same load with the old code path, which calls the blocking
+  client straight from the ``async def`` endpoint.
+"""
+import argparse
+import asyncio
+import base64
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+import httpx  # noqa: E402
+
+import client_api  # noqa: E402
+import main  # noqa: E402
+import voice_services  # noqa: E402
+from client_api import AgentPool  # noqa: E402
+from bench_agent_pool import FakeAgent  # noqa: E402
+from fake_voice import FakeVoiceClient  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from tts_cache import TTSCache  # noqa: E402
+
+
+async def _inline_transcribe(base64_audio, language_code="en-IN"):
+    return voice_services.transcribe_audio(base64_audio, language_code)
+
+
+async def _inline_synthesize(text, language_code="en-IN"):
+    return voice_services.synthesize_text(text, language_code)
+
+
+async def scenario(name, args, voice_users, prompts):
+    if name == "inline":
+        main.transcribe_audio_async, main.synthesize_text_async = _inline_transcribe, _inline_synthesize
+    else:
+        main.transcribe_audio_async = voice_services.transcribe_audio_async
+        main.synthesize_text_async = voice_services.synthesize_text_async
+
+    main.llm_client.pool = AgentPool(lambda: FakeAgent(args.agent_latency), size=args.pool_size)
+    await main.llm_client.start()
+    transport = httpx.ASGITransport(app=main.app)
+    audio = base64.b64encode(b"\x00" * 32000).decode()
+    stop = asyncio.Event()
+    voice_calls = 0
+
+    async def voice_user(client, i):
+        nonlocal voice_calls
+        while not stop.is_set():
+            if i % 2:
+                await client.post("/stt", json={"audio_base64": audio})
+            else:
+                await client.post("/tts", json={"text": "Aapka order bhej diya gaya hai"})
+            voice_calls += 1
+            # A real socket would yield here; ASGITransport does not.
+            await asyncio.sleep(0)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        voice = [asyncio.create_task(voice_user(client, i)) for i in range(voice_users)]
+        await asyncio.sleep(0.05)
+        latencies = []
+        for _ in range(prompts):
+            start = time.perf_counter()
+            response = await client.post("/prompt", json={"prompt": "hello"})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+        stop.set()
+        await asyncio.gather(*voice)
+    await main.llm_client.close()
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{name:>6}: prompt p50={statistics.median(latencies) * 1000:7.1f} ms "
+        f"p95={p95 * 1000:7.1f} ms  voice calls={voice_calls}"
+    )
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--agent-latency", type=float, default=0.05)
+    parser.add_argument("--voice-users", type=int, default=8)
+    parser.add_argument("--voice-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    fake = FakeVoiceClient(args.voice_latency)
+    voice_services.speech_client = voice_services.tts_client = fake
+    # Every /tts call must reach the (blocking) fake, not the audio cache.
+    voice_services.tts_cache = TTSCache(memory_bytes=0, disk_bytes=0)
+    # Likewise every /prompt must lease an agent.
+    client_api.response_cache = ResponseCache(maxsize=0)
+    print(
+        f"agent_latency={args.agent_latency}s voice_latency={args.voice_latency}s "
+        f"voice_users={args.voice_users} voice_workers={voice_services.VOICE_WORKERS}"
+    )
+    asyncio.run(scenario("idle", args, 0, args.prompts))
+    asyncio.run(scenario("pooled", args, args.voice_users, args.prompts))
+    # Every await inside /prompt waits out a full round of blocking voice
+    # calls here, so a handful of samples is plenty.
+    asyncio.run(scenario("inline", args, args.voice_users, min(args.prompts, 3)))
+
+
+if __name__ == "__main__":
+    main_()
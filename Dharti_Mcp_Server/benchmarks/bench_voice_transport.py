@@ -0,0 +1,95 @@
+"""Bytes on the wire and CPU per request: base64 JSON vs. binary voice endpoints.
+
+Usage::
+
+    python benchmarks/bench_voice_transport.py --seconds 10 --requests 50
+
+Drives ``main.app`` in-process over ``httpx.ASGITransport`` with the local
+fake recognizer/TTS from ``fake_voice.py`` (zero latency). Request bodies are
+built once up front and responses are not decoded, so the CPU column is the
+server's JSON/base64/multipart work plus a constant in-process HTTP overhead.
+The TTS cache is disabled so every call synthesizes.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+import voice_services  # noqa: E402
+from fake_voice import BYTES_PER_SECOND, FakeVoiceClient  # noqa: E402
+from tts_cache import TTSCache  # noqa: E402
+
+
+class FakeLongTTS(FakeVoiceClient):
+    def __init__(self, audio_bytes):
+        super().__init__()
+        self.audio = b"\xff\xfb" * (audio_bytes // 2)
+
+    def synthesize_speech(self, input, voice, audio_config, timeout=None):
+        return type("Response", (), {"audio_content": self.audio})
+
+
+async def measure(client, requests, build):
+    sent = received = 0
+    cpu = time.process_time()
+    for _ in range(requests):
+        response = await build(client)
+        assert response.status_code == 200, response.text
+        sent += len(response.request.content)
+        received += len(response.content)
+    cpu = time.process_time() - cpu
+    return sent / requests, received / requests, cpu / requests
+
+
+async def bench(args):
+    audio = b"\x00" * (args.seconds * BYTES_PER_SECOND)
+    stt_json = json.dumps({"audio_base64": base64.b64encode(audio).decode()}).encode()
+    boundary = "benchboundary"
+    multipart = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="clip.wav"\r\n'
+        f"Content-Type: audio/wav\r\n\r\n"
+    ).encode() + audio + f"\r\n--{boundary}--\r\n".encode()
+    text = "Aapka order confirm ho gaya hai, kal tak pahunch jayega"
+
+    cases = {
+        "stt json/base64": lambda c: c.post("/stt", content=stt_json, headers={"content-type": "application/json"}),
+        "stt raw body": lambda c: c.post("/stt/audio", content=audio, headers={"content-type": "audio/l16"}),
+        "stt multipart": lambda c: c.post(
+            "/stt/audio", content=multipart, headers={"content-type": f"multipart/form-data; boundary={boundary}"}
+        ),
+        "tts json/base64": lambda c: c.post("/tts", json={"text": text}),
+        "tts audio/mpeg": lambda c: c.post("/tts/audio", json={"text": text}),
+    }
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        print(f"stt clip={len(audio) / 1e6:.2f} MB  tts clip={args.tts_kb} KB  requests={args.requests}")
+        for name, build in cases.items():
+            await build(client)
+            sent, received, cpu = await measure(client, args.requests, build)
+            print(f"{name:>16}: sent {sent / 1e3:9.1f} KB  received {received / 1e3:8.1f} KB  cpu {cpu * 1000:7.2f} ms/req")
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=10, help="STT clip length (16 kHz LINEAR16)")
+    parser.add_argument("--tts-kb", type=int, default=64, help="size of the fake MP3 reply")
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    voice_services.speech_client = FakeVoiceClient()
+    voice_services.tts_client = FakeLongTTS(args.tts_kb * 1024)
+    voice_services.tts_cache = TTSCache(memory_bytes=0, disk_bytes=0)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,68 @@
+"""Hit rate and accuracy of the intent fast path on a labelled corpus.
+
+Usage::
+
+    python benchmarks/eval_intent_router.py [--corpus benchmarks/intent_corpus.jsonl] [-v]
+
+Each corpus line is ``{"prompt", "user_id", "intent", "args"}``; ``intent``
+is ``null`` for prompts that must go to the agent. Reported:
+
+- hit rate: share of the corpus answered without the agent,
+- accuracy: routed prompts whose intent and tool arguments are right,
+- false routes: agent-only prompts that were routed anyway (must stay 0),
+- misses: routable prompts that fell back to the agent (costly, not wrong).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_router import match  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join(HERE, "intent_corpus.jsonl"))
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every wrong or missed prompt")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    routed = correct = false_routes = misses = 0
+    start = time.perf_counter()
+    for case in corpus:
+        intent = match(case["prompt"], case["user_id"])
+        if intent is None:
+            if case["intent"] is not None:
+                misses += 1
+                if args.verbose:
+                    print(f"miss   {case['prompt']!r} (want {case['intent']})")
+            continue
+        routed += 1
+        if case["intent"] is None:
+            false_routes += 1
+            if args.verbose:
+                print(f"FALSE  {case['prompt']!r} -> {intent.name} {intent.args}")
+        elif (intent.name, intent.args) == (case["intent"], case["args"]):
+            correct += 1
+        elif args.verbose:
+            print(f"WRONG  {case['prompt']!r} -> {intent.name} {intent.args}, want {case['intent']} {case['args']}")
+    elapsed = time.perf_counter() - start
+
+    routable = sum(case["intent"] is not None for case in corpus)
+    print(f"corpus: {len(corpus)} prompts, {routable} routable")
+    print(f"hit rate:     {routed / len(corpus):.1%} of all traffic ({routed}/{len(corpus)})")
+    print(f"accuracy:     {correct / routed if routed else 0:.1%} of routed prompts ({correct}/{routed})")
+    print(f"false routes: {false_routes}")
+    print(f"misses:       {misses} of {routable} routable")
+    print(f"match cost:   {elapsed / len(corpus) * 1e6:.0f} us per prompt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Local stand-in for the Google speech and text-to-speech clients.
+
+Install it with::
+
+    voice_services.speech_client = voice_services.tts_client = FakeVoiceClient()
+
+Recognition is deterministic: every ``bytes_per_word`` bytes of audio become
+one word of ``WORDS`` and every ``words_per_utterance`` words close a result,
+so a caller can check that nothing after the first utterance is dropped.
+"""
+import time
+from types import SimpleNamespace
+
+WORDS = "mere paas kitna stock hai aur kal ka order kab aayega".split()
+
+# One second of 16 kHz, 16-bit mono LINEAR16.
+BYTES_PER_SECOND = 32000
+
+
+def _result(transcript, is_final=True):
+    return SimpleNamespace(alternatives=[SimpleNamespace(transcript=transcript)], is_final=is_final)
+
+
+class FakeVoiceClient:
+    """Stands in for both SpeechClient and TextToSpeechClient.
+
+    ``latency`` seconds of blocking sleep are spent per call (per response
+    for streaming), like a gRPC round trip.
+    """
+
+    def __init__(self, latency=0.0, bytes_per_word=BYTES_PER_SECOND, words_per_utterance=3):
+        self.latency = latency
+        self.bytes_per_word = bytes_per_word
+        self.words_per_utterance = words_per_utterance
+
+    def _utterances(self, n_bytes):
+        words = [WORDS[i % len(WORDS)] for i in range(n_bytes // self.bytes_per_word)]
+        size = self.words_per_utterance
+        return [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+    def expected_transcript(self, n_bytes):
+        return " ".join(self._utterances(n_bytes))
+
+    def recognize(self, config, audio, timeout=None):
+        time.sleep(self.latency)
+        return SimpleNamespace(results=[_result(text) for text in self._utterances(len(audio.content))])
+
+    def streaming_recognize(self, config, requests, timeout=None):
+        received, words = 0, []
+        for request in requests:
+            received += len(request.audio_content)
+            while len(words) < received // self.bytes_per_word:
+                words.append(WORDS[len(words) % len(WORDS)])
+                current = words[-((len(words) - 1) % self.words_per_utterance + 1):]
+                time.sleep(self.latency)
+                is_final = len(current) == self.words_per_utterance
+                yield SimpleNamespace(results=[_result(" ".join(current), is_final)])
+        tail = len(words) % self.words_per_utterance
+        if tail:
+            yield SimpleNamespace(results=[_result(" ".join(words[-tail:]))])
+
+    def synthesize_speech(self, input, voice, audio_config, timeout=None):
+        time.sleep(self.latency)
+        return SimpleNamespace(audio_content=b"\xff\xfb" * 2048)
@@ -0,0 +1,128 @@
+"""Minimal stand-in for the Django REST backend used by the benchmarks.
+
+Serves the same ``/api/<resource>/`` routes as ``api/urls.py`` (plus bulk
+create) from an in-memory store, with an optional per-request delay to
+imitate database time.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+RESOURCES = ("products", "catalogs", "transactions", "users", "restock-reminders", "ai-logs")
+
+
+class StubStore:
+    def __init__(self, rows_per_resource=10):
+        self.lock = threading.Lock()
+        self.rows = {
+            name: {i: {"id": i, "name": f"{name}-{i}"} for i in range(1, rows_per_resource + 1)}
+            for name in RESOURCES
+        }
+        self.next_id = rows_per_resource + 1
+
+
+def _make_handler(store, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=None):
+            payload = b"" if body is None else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _route(self):
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if len(parts) < 2 or parts[0] != "api" or parts[1] not in store.rows:
+                return None, None
+            pk = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else None
+            return parts[1], pk
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"null")
+
+        def _page(self, resource, rows):
+            # Same shape as IdCursorPagination: newest first, opaque next link.
+            query = parse_qs(urlsplit(self.path).query)
+            page_size = int(query.get("page_size", ["10"])[0])
+            cursor = int(query.get("cursor", ["0"])[0]) or None
+            ids = sorted((i for i in rows if cursor is None or i < cursor), reverse=True)
+            results = [rows[i] for i in ids[:page_size]]
+            next_link = None
+            if len(ids) > page_size:
+                next_link = (
+                    f"http://{self.headers['Host']}/api/{resource}/"
+                    f"?cursor={results[-1]['id']}&page_size={page_size}"
+                )
+            return {"next": next_link, "previous": None, "results": results}
+
+        def do_GET(self):
+            time.sleep(latency)
+            resource, pk = self._route()
+            if resource is None:
+                return self._send(404, {"detail": "Not found."})
+            rows = store.rows[resource]
+            if pk is None:
+                return self._send(200, self._page(resource, rows))
+            if pk not in rows:
+                return self._send(404, {"detail": "Not found."})
+            return self._send(200, rows[pk])
+
+        def do_POST(self):
+            time.sleep(latency)
+            resource, _ = self._route()
+            if resource is None:
+                return self._send(404, {"detail": "Not found."})
+            data = self._read_body()
+            if self.path.split("?")[0].rstrip("/").endswith("/bulk"):
+                # Same shape as BulkModelMixin.bulk_create: one result per item.
+                with store.lock:
+                    results = []
+                    for index, item in enumerate(data):
+                        row = dict(item, id=store.next_id)
+                        store.rows[resource][row["id"]] = row
+                        store.next_id += 1
+                        results.append({"index": index, "status": "created", "data": row})
+                return self._send(201, {"results": results})
+            with store.lock:
+                row = dict(data, id=store.next_id)
+                store.rows[resource][row["id"]] = row
+                store.next_id += 1
+            return self._send(201, row)
+
+        def do_PUT(self):
+            time.sleep(latency)
+            resource, pk = self._route()
+            if resource is None or pk not in store.rows[resource]:
+                return self._send(404, {"detail": "Not found."})
+            row = dict(self._read_body(), id=pk)
+            store.rows[resource][pk] = row
+            return self._send(200, row)
+
+        def do_DELETE(self):
+            time.sleep(latency)
+            resource, pk = self._route()
+            if resource is None or store.rows[resource].pop(pk, None) is None:
+                return self._send(404, {"detail": "Not found."})
+            return self._send(204)
+
+    return Handler
+
+
+def start_stub_backend(latency=0.0, rows_per_resource=10, port=0):
+    """Start the stub in a daemon thread; returns ``(server, base_url)``."""
+    store = StubStore(rows_per_resource)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(store, latency))
+    server.daemon_threads = True
+    server.store = store
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api"
@@ -1,17 +1,187 @@
 import asyncio
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from mcp_use import MCPAgent, MCPClient
+from intent_router import route, select_groups
+from response_cache import response_cache, tool_family
+from backend_tools import TOOL_GROUPS
+from sessions import SESSION_RECENT_TURNS, SessionStore
+
+
+# Each pool worker is an MCPAgent with its own MCPClient, i.e. its own
+# server_code.py child process. Workers are leased to one request at a time.
+AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "4"))
+AGENT_LEASE_TIMEOUT = float(os.getenv("AGENT_LEASE_TIMEOUT", "30"))
+AGENT_HEALTH_INTERVAL = float(os.getenv("AGENT_HEALTH_INTERVAL", "60"))
+AGENT_PING_TIMEOUT = float(os.getenv("AGENT_PING_TIMEOUT", "5"))
+# Workers are spawned on first use. With prewarm on, start() also fills the
+# pool in the background; the service answers requests meanwhile.
+AGENT_PREWARM = os.getenv("AGENT_PREWARM", "1") == "1"
+
+# Tool results can be whole product lists; streamed tool_end events carry a preview.
+STREAM_TOOL_OUTPUT_CHARS = int(os.getenv("STREAM_TOOL_OUTPUT_CHARS", "500"))
+
+# Show the model only the tool groups a conversation is about; every tool
+# schema is resent on each agent step. Unclear prompts still get every tool.
+TOOL_GROUPS_ENABLED = os.getenv("TOOL_GROUPS_ENABLED", "1") == "1"
+# Tools every run keeps, whatever the prompt (the login flow of the instructions).
+ALWAYS_EXPOSED = ("login_user",)
+# Called on a worker's server when it is leased, so a run never reads tool
+# results cached before another worker changed the data. Hidden from the model.
+RESET_TOOL = "clear_tool_cache"
+
+
+class PoolExhausted(Exception):
+    """No agent became free within the lease timeout."""
+
+
+class AgentPool:
+    """A pool of at most ``size`` initialized agents, spawned on first use."""
+
+    def __init__(self, factory, size=AGENT_POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._health_task = None
+        self._prewarm_task = None
+        self.spawned = 0
+        self.leased = 0
+        self.replaced = 0
+
+    async def start(self, prewarm=AGENT_PREWARM):
+        """Start the health checks and, with ``prewarm``, fill the pool in the background."""
+        self._health_task = asyncio.create_task(self._health_loop())
+        if prewarm:
+            self._prewarm_task = asyncio.create_task(self.warm())
+
+    async def warm(self):
+        """Spawn workers until the pool is full; failures are logged, not raised."""
+        results = await asyncio.gather(*(self._grow() for _ in range(self.size)), return_exceptions=True)
+        for error in results:
+            if isinstance(error, Exception):
+                print(f"Error prewarming agent: {error}")
+
+    async def _grow(self):
+        """Add one worker to the idle queue, unless the pool is already full."""
+        if self.spawned >= self.size:
+            return
+        self.spawned += 1
+        try:
+            agent = await self._spawn()
+        except Exception:
+            self.spawned -= 1
+            raise
+        self._idle.put_nowait(agent)
+
+    async def _spawn(self):
+        # The first worker imports the agent stack; doing that off the event
+        # loop keeps /health and the fast paths answering meanwhile.
+        agent = await asyncio.to_thread(self.factory)
+        await agent.initialize()
+        return agent
+
+    async def _is_healthy(self, agent):
+        sessions = agent.client.get_all_active_sessions() if agent.client else {}
+        if not sessions:
+            return False
+        try:
+            for session in sessions.values():
+                if not session.is_connected:
+                    return False
+                await asyncio.wait_for(session.connector.client_session.send_ping(), AGENT_PING_TIMEOUT)
+        except Exception:
+            return False
+        return True
+
+    async def _reset(self, agent):
+        sessions = agent.client.get_all_active_sessions() if agent.client else {}
+        for session in sessions.values():
+            await session.connector.call_tool(RESET_TOOL, {})
+
+    async def _replace(self, agent):
+        """Close ``agent`` and return a fresh worker, or None if none could be started.
+
+        Without a replacement the slot is given up, so the next lease spawns
+        a worker again instead of getting the broken one.
+        """
+        try:
+            fresh = await self._spawn()
+        except Exception as e:
+            print(f"Error replacing agent: {e}")
+            fresh = None
+            self.spawned -= 1
+        else:
+            self.replaced += 1
+        try:
+            await agent.close()
+        except Exception as e:
+            print(f"Error closing unhealthy agent: {e}")
+        return fresh
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(AGENT_HEALTH_INTERVAL)
+            # Check only idle workers; leased ones are proven by their request.
+            for _ in range(self._idle.qsize()):
+                agent = self._idle.get_nowait()
+                try:
+                    if not await self._is_healthy(agent):
+                        agent = await self._replace(agent)
+                except Exception as e:
+                    print(f"Health check failed: {e}")
+                if agent is not None:
+                    self._idle.put_nowait(agent)
+
+    @asynccontextmanager
+    async def lease(self, timeout=AGENT_LEASE_TIMEOUT):
+        if self._idle.empty():
+            # Cold or busy pool: start another worker if there is room for one.
+            await self._grow()
+        try:
+            agent = await asyncio.wait_for(self._idle.get(), timeout)
+        except asyncio.TimeoutError:
+            raise PoolExhausted(f"no agent free after {timeout}s") from None
+        self.leased += 1
+        broken = False
+        try:
+            await self._reset(agent)
+            yield agent
+        except Exception:
+            broken = not await self._is_healthy(agent)
+            raise
+        finally:
+            self.leased -= 1
+            # Nothing from one request may leak into the next one's context.
+            agent.clear_conversation_history()
+            if broken:
+                agent = await self._replace(agent)
+            if agent is not None:
+                self._idle.put_nowait(agent)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "spawned": self.spawned,
+            "idle": self._idle.qsize(),
+            "leased": self.leased,
+            "replaced": self.replaced,
+        }
+
+    async def close(self):
+        for task in (self._prewarm_task, self._health_task):
+            if task:
+                task.cancel()
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
 
 
 class LLM_Client:
-    def __init__(self):
+    def __init__(self, pool_size=AGENT_POOL_SIZE):
          # Load environment variables
         load_dotenv()
 
         # Create configuration dictionary
-        config = {
+        self.config = {
             "mcpServers": {
             "DhartiMCPServer": {
             "command": "python",
@@ -25,14 +195,11 @@ class LLM_Client:
         }
         }
 
-        # Create MCPClient from configuration dictionary
-        client = MCPClient.from_dict(config)
-
-        # Create LLM
-        llm = ChatGroq(model="llama3-70b-8192")
+        # The Groq client is built with the first pool worker (see llm below).
+        self._llm = None
 
-        # Create agent with the client
-        self.agent = MCPAgent(llm=llm, client=client, max_steps=30)
+        self.pool = AgentPool(self._create_agent, size=pool_size)
+        self.sessions = SessionStore()
 
         self.system_prompt = """
                     You are an intelligent assistant for a digital product catalog system.
@@ -55,16 +222,160 @@ class LLM_Client:
                     """
 
 
-    async def send_prompt(self, prompt:str):
-        
-        prompt=f"System:{self.system_prompt}\nUser:{prompt}"
-        # Run the query
-        result = await self.agent.run(
-            prompt
-        )
+    @property
+    def llm(self):
+        if self._llm is None:
+            from langchain_groq import ChatGroq
+            self._llm = ChatGroq(model="llama3-70b-8192")
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm):
+        self._llm = llm
+
+    def _create_agent(self):
+        from agent_worker import ScopedAgent
+        from mcp_use import MCPClient
+
+        # Create MCPClient from configuration dictionary
+        client = MCPClient.from_dict(self.config)
+
+        # Create agent with the client. The instructions are the agent's system
+        # message; conversation history comes from the session store per run.
+        return ScopedAgent(llm=self.llm, client=client, max_steps=30, system_prompt=self.system_prompt, memory_enabled=False,
+                           disallowed_tools=[RESET_TOOL])
+
+    def _tool_names(self, session, prompt):
+        """Names of the tools to offer for ``prompt``, or ``None`` for all of them."""
+        if not TOOL_GROUPS_ENABLED:
+            return None
+        # Follow-ups like "50" or "yes" lean on what the last turns were about.
+        recent = session.turns[-SESSION_RECENT_TURNS:]
+        groups = select_groups(*(turn.prompt for turn in recent), prompt)
+        if groups is None:
+            return None
+        groups.update(tool_family(tool) for turn in recent for tool, _ in turn.tool_results)
+        return {*ALWAYS_EXPOSED, *(name for group in groups for name in TOOL_GROUPS.get(group, ()))}
+
+    async def start(self):
+        """Start the agent pool; workers come up in the background or on first use."""
+        await self.pool.start()
+
+    async def close(self):
+        await self.pool.close()
+
+    async def stream_prompt(self, prompt:str, user_id:int | None = None, session_id:str | None = None):
+        """Run the agent and yield ``(event, data)`` pairs as the run progresses.
+
+        Events are ``token`` (a piece of model output), ``reset`` (drop the
+        tokens since the last ``tool_end``: that model call went on to call
+        tools), ``tool_start``, ``tool_end`` and, last, ``done`` with the
+        executor's final answer, or ``error`` when the run stopped without
+        one (step limit, step errors). The generator is pulled by the HTTP
+        response, so a slow client pauses the run instead of piling up
+        output in memory.
+        """
+        session = self.sessions.get(session_id)
+        async with session.lock:
+            routed = await route(prompt, user_id)
+            if routed:
+                intent, reply = routed
+                yield "tool_start", {"tool": intent.tool, "input": intent.args}
+                yield "tool_end", {"tool": intent.tool, "output": reply[:STREAM_TOOL_OUTPUT_CHARS]}
+                self.sessions.record(session, prompt, reply, [(intent.tool, reply)])
+                yield "done", {"response": reply, "session_id": session.id}
+                return
+            # A cached answer only fits a conversation that has no earlier turns.
+            cached = None if session.turns else response_cache.get(prompt, user_id)
+            if cached is not None:
+                self.sessions.record(session, prompt, cached)
+                yield "done", {"response": cached, "session_id": session.id}
+                return
+            history = self.sessions.history(session)
+            result, tool_results = "", []
+            root, streamed = None, False
+            async with self.pool.lease() as agent:
+                agent.expose(self._tool_names(session, prompt))
+                async for event in agent.stream_events(prompt, external_history=history):
+                    kind = event.get("event")
+                    data = event.get("data", {})
+                    # The first event is the executor's own chain start.
+                    root = root or event.get("run_id")
+                    if kind == "on_chat_model_stream":
+                        text = getattr(data.get("chunk"), "content", "")
+                        if isinstance(text, str) and text:
+                            streamed = True
+                            yield "token", {"text": text}
+                    elif kind == "on_chat_model_end":
+                        if streamed and getattr(data.get("output"), "tool_calls", None):
+                            # A planning step, not the answer.
+                            yield "reset", {}
+                        streamed = False
+                    elif kind == "on_tool_start":
+                        yield "tool_start", {"tool": event.get("name"), "input": data.get("input")}
+                    elif kind == "on_tool_end":
+                        output = str(getattr(data.get("output"), "content", data.get("output")))
+                        tool_results.append((event.get("name"), output))
+                        yield "tool_end", {"tool": event.get("name"), "output": output[:STREAM_TOOL_OUTPUT_CHARS]}
+                    elif kind == "on_chain_end" and event.get("run_id") == root:
+                        output = data.get("output")
+                        result = str(output.get("output", "")) if isinstance(output, dict) else str(output or "")
+                finished = agent.finished
+            self._remember(session, prompt, user_id, result, tool_results, bool(history), finished)
+            if finished:
+                yield "done", {"response": result, "session_id": session.id}
+            else:
+                yield "error", {"detail": result or "Agent stopped without an answer", "session_id": session.id}
+
+    async def send_prompt(self, prompt:str, user_id:int | None = None, session_id:str | None = None):
+        session = self.sessions.get(session_id)
+        async with session.lock:
+            # Simple lookups skip the agent (and Groq) altogether.
+            routed = await route(prompt, user_id)
+            if routed:
+                intent, reply = routed
+                self.sessions.record(session, prompt, reply, [(intent.tool, reply)])
+                return (f"\nResult: {reply}")
+            # A cached answer only fits a conversation that has no earlier turns.
+            cached = None if session.turns else response_cache.get(prompt, user_id)
+            if cached is not None:
+                self.sessions.record(session, prompt, cached)
+                return (f"\nResult: {cached}")
+
+            history = self.sessions.history(session)
+            # Run the query on a leased worker. Same as agent.run(), but keeps the
+            # tool calls for the session history and the response cache.
+            result, tool_results = "", []
+            async with self.pool.lease() as agent:
+                agent.expose(self._tool_names(session, prompt))
+                async for item in agent.stream(prompt, external_history=history):
+                    if isinstance(item, str):
+                        result = item
+                        break
+                    action, observation = item
+                    tool_results.append((action.tool, observation))
+                finished = agent.finished
+            self._remember(session, prompt, user_id, result, tool_results, bool(history), finished)
         print (f"\nResult: {result}")
         return (f"\nResult: {result}")
 
+    def _remember(self, session, prompt, user_id, answer, tool_results, had_history, finished):
+        tools_used = [tool for tool, _ in tool_results]
+        if had_history or not finished:
+            # The answer leaned on earlier turns, or is an error or step-limit
+            # message; it is no use to other sessions.
+            response_cache.observe(tools_used)
+        else:
+            response_cache.store(prompt, user_id, answer, tools_used)
+        self.sessions.record(session, prompt, answer, tool_results)
+
+async def _example():
+    client = LLM_Client(pool_size=1)
+    await client.start()
+    try:
+        await client.send_prompt("आप कौन हो? give answer in english")
+    finally:
+        await client.close()
+
 if __name__ == "__main__":
-    client = LLM_Client()
-    asyncio.run(client.send_prompt("आप कौन हो? give answer in english"))  # Example prompt
\ No newline at end of file
+    asyncio.run(_example())  # Example prompt
\ No newline at end of file
@@ -0,0 +1,213 @@
+import os
+import re
+from dataclasses import dataclass, field
+
+import httpx
+
+import backend_tools
+
+# Short, structured prompts ("show my products", "tamatar ka stock kitna hai",
+# "pending orders") are answered by calling the tool directly instead of a
+# full agent run. The grammar is deliberately strict: every word must be
+# understood, otherwise the prompt goes to the agent.
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "1") == "1"
+INTENT_MAX_WORDS = int(os.getenv("INTENT_MAX_WORDS", "12"))
+LOW_STOCK_THRESHOLD = int(os.getenv("LOW_STOCK_THRESHOLD", "10"))
+# Rows spelled out in a reply; the rest is summarized as a count.
+INTENT_REPLY_ROWS = int(os.getenv("INTENT_REPLY_ROWS", "10"))
+
+FILLER = {
+    "please", "pls", "plz", "kindly", "show", "list", "display", "view", "see", "get", "give", "tell", "me",
+    "all", "the", "a", "an", "of", "for", "what", "whats", "are", "is", "current", "can", "you", "do", "does",
+    "there", "in", "any", "now", "have", "has", "got", "dikhao", "dikha", "dikhaiye", "dikhana", "batao", "bata", "bataiye", "btao",
+    "mujhe", "muje", "sab", "sabhi", "saare", "sare", "ka", "ki", "ke", "hai", "hain", "kya", "ko", "bhi",
+    "abhi", "zara", "mein", "which", "on", "wale", "wala", "kaun", "kin", "किन", "कौन", "वाले", "मुझे", "सभी", "सारे", "सब", "दिखाओ", "दिखाइए", "दिखा", "बताओ", "बताइए",
+    "बता", "का", "की", "के", "है", "हैं", "क्या", "को", "ज़रा", "जरा", "अभी", "लिस्ट", "में", "भी",
+}
+OWNER = {"my", "mine", "i", "we", "our", "mere", "mera", "meri", "hamare", "मेरे", "मेरा", "मेरी", "हमारे"}
+ENTITIES = {
+    "products": {
+        "product", "products", "item", "items", "saman", "samaan", "maal", "उत्पाद", "उत्पादों", "प्रोडक्ट", "प्रोडक्ट्स",
+        "सामान", "माल",
+    },
+    "transactions": {
+        "transaction", "transactions", "sale", "sales", "order", "orders", "bikri", "lenden", "बिक्री",
+        "लेनदेन", "ऑर्डर", "ट्रांजैक्शन",
+    },
+    "catalogs": {"catalog", "catalogs", "catalogue", "catalogues", "कैटलॉग"},
+    "restock_reminders": {"reminder", "reminders", "restock", "रिमाइंडर"},
+}
+STATUSES = {
+    "pending": {"pending", "baaki", "baki", "बाकी", "लंबित", "पेंडिंग"},
+    "completed": {"completed", "done", "finished", "pure", "poore", "पूरे", "पूरी", "पूरा", "पूर्ण"},
+    "failed": {"failed", "fail", "असफल", "फेल"},
+}
+STOCK = {
+    "stock", "inventory", "quantity", "left", "how", "much", "many", "kitna", "kitne", "kitni", "bacha",
+    "bache", "bachi", "स्टॉक", "कितना", "कितने", "कितनी", "बचा", "बचे", "बची",
+}
+LOW = {"low", "kam", "कम"}
+# Anything that changes data, needs an ID or asks for advice is the agent's job.
+BLOCKED = {
+    "add", "create", "new", "delete", "remove", "update", "change", "edit", "set", "increase", "decrease",
+    "reduce", "sell", "sold", "buy", "make", "complete", "cancel", "banao", "jodo", "hatao", "badlo", "why",
+    "kyun", "kaise", "should", "suggest", "बनाओ", "जोड़ो", "हटाओ", "बदलो", "क्यों", "कैसे", "not", "nahi", "नहीं",
+}
+# Words that tie a prompt to a tool group (see backend_tools.TOOL_GROUPS) when
+# choosing which tools the agent is shown.
+GROUP_WORDS = {
+    "products": ENTITIES["products"] | STOCK | LOW | {
+        "price", "prices", "daam", "dam", "keemat", "kimat", "category", "kg", "kilo", "gram", "grams", "litre",
+        "liter", "dozen", "piece", "pieces", "packet", "packets", "rupees", "rs", "rupaye", "rupay", "दाम", "कीमत",
+        "किलो", "रुपये", "रुपए", "दर्जन",
+    },
+    "catalogs": ENTITIES["catalogs"],
+    "transactions": ENTITIES["transactions"] | set().union(*STATUSES.values()) | {
+        "sell", "sold", "bech", "becha", "bechi", "beche", "bechna", "customer", "customers", "buyer", "payment",
+        "payments", "paid", "bill", "grahak", "bhugtan", "बेचा", "बेची", "बेचे", "बेचना", "ग्राहक", "भुगतान",
+        "earn", "earned", "earning", "earnings", "revenue", "income", "turnover", "bestseller", "bestselling",
+        "kamai", "kamaai", "kamaya", "aamdani", "bika", "biki", "bike", "कमाई", "कमाया", "आमदनी", "बिका", "बिकी", "बिके",
+    },
+    "users": {
+        "user", "users", "account", "profile", "login", "signup", "register", "username", "name", "naam", "लॉगिन",
+        "खाता", "नाम",
+    },
+    "restock_reminders": ENTITIES["restock_reminders"] | {"reorder", "restocking", "mangana", "mangao", "मंगाना", "मंगाओ"},
+    "ai_logs": {"log", "logs", "लॉग"},
+}
+# Groups whose tools take product IDs, so the product tools come along.
+GROUP_NEEDS = {"catalogs": ("products",), "transactions": ("products",), "restock_reminders": ("products",)}
+KNOWN = FILLER | OWNER | STOCK | LOW | set().union(*ENTITIES.values()) | set().union(*STATUSES.values())
+
+_WORD = re.compile(r"[a-z0-9ऀ-ॿ]+")
+_DEVANAGARI = re.compile(r"[ऀ-ॿ]")
+
+
+@dataclass
+class Intent:
+    name: str
+    tool: str
+    args: dict = field(default_factory=dict)
+    hindi: bool = False
+
+
+def match(prompt: str, user_id: int | None = None) -> Intent | None:
+    """Map ``prompt`` onto a read-only tool call, or ``None`` when unsure."""
+    words = _WORD.findall(prompt.lower())
+    if not words or len(words) > INTENT_MAX_WORDS:
+        return None
+    if any(word in BLOCKED or word.isdigit() for word in words):
+        return None
+    if user_id is None and any(word in OWNER for word in words):
+        # "my products" without knowing who is asking needs the login flow.
+        return None
+
+    entities = {name for name, vocab in ENTITIES.items() if vocab.intersection(words)}
+    statuses = {name for name, vocab in STATUSES.items() if vocab.intersection(words)}
+    stock = bool(STOCK.intersection(words))
+    low = bool(LOW.intersection(words))
+    rest = [word for word in words if word not in KNOWN]
+    scope = {"user": user_id} if user_id is not None else {}
+    hindi = bool(_DEVANAGARI.search(prompt))
+
+    if len(entities) > 1 or len(statuses) > 1:
+        return None
+    entity = next(iter(entities), None)
+
+    if low and stock and not rest and not statuses and entity in (None, "products"):
+        return Intent("low_stock", "get_all_products", {**scope, "max_stock": LOW_STOCK_THRESHOLD}, hindi)
+    if stock and not low and rest and not statuses and entity in (None, "products") and len(rest) <= 4:
+        return Intent("product_stock", "get_all_products", {**scope, "search": " ".join(rest)}, hindi)
+    if rest or low:
+        return None
+    if statuses and entity == "transactions":
+        return Intent("list_transactions", "get_all_transactions", {**scope, "status": statuses.pop()}, hindi)
+    if statuses or entity is None:
+        return None
+    return Intent(f"list_{entity}", f"get_all_{entity}", scope, hindi)
+
+
+def select_groups(*texts: str) -> set[str] | None:
+    """Tool groups the conversation ``texts`` are about, or ``None`` (all tools) when unsure."""
+    words = set(_WORD.findall(" ".join(texts).lower()))
+    groups = {group for group, vocab in GROUP_WORDS.items() if vocab & words}
+    if not groups:
+        return None
+    for group in list(groups):
+        groups.update(GROUP_NEEDS.get(group, ()))
+    return groups
+
+
+async def answer(intent: Intent, user_id: int | None = None) -> str | None:
+    """Run the intent's tool and phrase the result, or ``None`` to defer to the agent."""
+    # Call past @cached_tool: writes made by the agents invalidate the cache in
+    # their own server_code processes, not in this one.
+    tool = getattr(backend_tools, intent.tool).__wrapped__
+    result = await tool(**intent.args)
+    if not isinstance(result, dict) or not isinstance(result.get("results"), list):
+        # An error body ({"detail": ...} or field errors) rather than a page.
+        return None
+    rows = result["results"]
+    if intent.name == "product_stock" and not rows:
+        # Maybe a synonym or a translation the agent can work out.
+        return None
+    return _reply(intent, rows, result.get("has_more", False))
+
+
+def _reply(intent, rows, has_more):
+    hindi = intent.hindi
+    lines = [_line(intent.tool, row, hindi) for row in rows[:INTENT_REPLY_ROWS]]
+    hidden = len(rows) - len(lines)
+    if hidden or has_more:
+        more = f"{hidden}{'+' if has_more else ''} " if hidden else ""
+        lines.append(f"...और {more}भी" if hindi else f"...and {more}more")
+    if intent.name == "product_stock":
+        header = "स्टॉक:" if hindi else "Stock:"
+    elif not rows:
+        return _EMPTY[intent.name][hindi]
+    else:
+        header = _HEADERS[intent.name][hindi].format(n=f"{len(rows)}+" if has_more else len(rows))
+    return "\n".join([header, *lines])
+
+
+def _line(tool, row, hindi):
+    if tool == "get_all_products":
+        unit = "स्टॉक में" if hindi else "in stock"
+        return f"- {row.get('name')}: {row.get('stock_qty')} {unit}, ₹{row.get('price')}"
+    if tool == "get_all_transactions":
+        return f"- #{row.get('id')}: ₹{row.get('amount')} ({row.get('status')})"
+    if tool == "get_all_catalogs":
+        return f"- {row.get('title')}"
+    unit = "और मंगाएं" if hindi else "to reorder"
+    return f"- {row.get('product_name')}: {row.get('suggested_qty')} {unit} ({row.get('season_note')})"
+
+
+_HEADERS = {
+    "list_products": ("You have {n} products:", "आपके {n} उत्पाद हैं:"),
+    "low_stock": ("{n} products are running low:", "{n} उत्पादों का स्टॉक कम है:"),
+    "list_transactions": ("{n} transactions:", "{n} लेनदेन:"),
+    "list_catalogs": ("You have {n} catalogs:", "आपके {n} कैटलॉग हैं:"),
+    "list_restock_reminders": ("{n} restock reminders:", "{n} रीस्टॉक रिमाइंडर:"),
+}
+_EMPTY = {
+    "list_products": ("You have no products yet.", "अभी आपका कोई उत्पाद नहीं है।"),
+    "low_stock": ("No product is running low on stock.", "किसी भी उत्पाद का स्टॉक कम नहीं है।"),
+    "list_transactions": ("No transactions found.", "कोई लेनदेन नहीं मिला।"),
+    "list_catalogs": ("You have no catalogs yet.", "अभी आपका कोई कैटलॉग नहीं है।"),
+    "list_restock_reminders": ("No restock reminders.", "कोई रीस्टॉक रिमाइंडर नहीं है।"),
+}
+
+
+async def route(prompt: str, user_id: int | None = None) -> tuple[Intent, str] | None:
+    """Answer ``prompt`` without the agent when it matches a known intent."""
+    if not INTENT_ROUTER_ENABLED:
+        return None
+    intent = match(prompt, user_id)
+    if intent is None:
+        return None
+    try:
+        reply = await answer(intent, user_id)
+    except (httpx.HTTPError, ValueError):
+        # Backend trouble or a body that is not JSON: let the agent explain it.
+        return None
+    return (intent, reply) if reply is not None else None
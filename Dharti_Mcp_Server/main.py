@@ -1,13 +1,37 @@
 # main.py
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sse_starlette.sse import EventSourceResponse
 import asyncio
-from client_api import LLM_Client
-from voice_services import transcribe_audio, synthesize_text
+import json
+from backend_client import close_client
+from client_api import LLM_Client, PoolExhausted
+from response_cache import response_cache
+from tts_cache import tts_cache
+from voice_services import (
+    STT_MAX_UPLOAD_BYTES, VOICE_TIMEOUT, transcribe_audio_async, transcribe_bytes_async, synthesize_audio_async,
+    synthesize_text_async, stream_transcribe_async, tts_key,
+)
 
-app = FastAPI()
+# Cheap to build: no Groq client, agent worker or Google client exists until
+# first use, so the app imports without credentials.
 llm_client = LLM_Client()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve right away; with AGENT_PREWARM the pool fills in the background.
+    await llm_client.start()
+    try:
+        yield
+    finally:
+        await llm_client.close()
+        # The intent router calls tools in this process, on the shared client.
+        await close_client()
+
+app = FastAPI(lifespan=lifespan)
+
 class STTRequest(BaseModel):
     audio_base64: str
     language_code: str = "en-IN"
@@ -18,28 +42,158 @@ class TTSRequest(BaseModel):
 
 class PromptRequest(BaseModel):
     prompt: str
+    # Lets "my products"-style prompts be answered without the agent.
+    user_id: int | None = None
+    # Continue a conversation; omitted, a new session is started and its ID returned.
+    session_id: str | None = Field(default=None, max_length=64)
+
+@app.get("/health")
+async def health():
+    return {
+        "agent_pool": llm_client.pool.stats(),
+        "prompt_cache": response_cache.stats(),
+        "sessions": llm_client.sessions.stats(),
+        "tts_cache": tts_cache.stats(),
+    }
 
 @app.post("/prompt")
 async def get_response(req: PromptRequest):
-    result = await llm_client.send_prompt(req.prompt)
+    session_id = llm_client.sessions.get(req.session_id).id
+    try:
+        result = await llm_client.send_prompt(req.prompt, req.user_id, session_id)
+    except PoolExhausted:
+        raise HTTPException(status_code=503, detail="All assistants are busy, please try again")
     if isinstance(result, dict) and "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
-    return {"response": result}
+    return {"response": result, "session_id": session_id}
+
+@app.delete("/prompt/sessions/{session_id}")
+async def end_session(session_id: str):
+    if not llm_client.sessions.end(session_id):
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return {"ended": session_id}
+
+@app.post("/prompt/stream")
+async def stream_response(req: PromptRequest):
+    """Server-sent events: ``token``, ``reset``, ``tool_start``, ``tool_end``, then ``done`` (or ``error``)."""
+    async def events():
+        try:
+            async for event, data in llm_client.stream_prompt(req.prompt, req.user_id, req.session_id):
+                yield {"event": event, "data": json.dumps(data, ensure_ascii=False, default=str)}
+        except PoolExhausted:
+            yield {"event": "error", "data": json.dumps({"detail": "All assistants are busy, please try again"})}
+        except Exception as e:
+            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+
+    # Comment pings keep idle mobile connections open during long tool steps.
+    return EventSourceResponse(events(), ping=15)
 
 @app.post("/stt")
 async def speech_to_text(req: STTRequest):
     try:
-        transcript = transcribe_audio(req.audio_base64, req.language_code)
+        transcript = await transcribe_audio_async(req.audio_base64, req.language_code)
+        return {"transcript": transcript}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Speech recognition timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/stt/audio")
+async def speech_to_text_audio(request: Request, language_code: str = "en-IN"):
+    """``/stt`` without base64: the body is the audio itself, or a multipart form with a ``file`` field."""
+    if int(request.headers.get("content-length") or 0) > STT_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Audio too large, use /stt/stream")
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=422, detail="Expected an audio file in the 'file' field")
+        audio = await upload.read()
+    else:
+        audio = await request.body()
+    if not audio:
+        raise HTTPException(status_code=422, detail="Empty audio")
+    if len(audio) > STT_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Audio too large, use /stt/stream")
+    try:
+        transcript = await transcribe_bytes_async(audio, language_code)
         return {"transcript": transcript}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Speech recognition timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.websocket("/stt/stream")
+async def speech_to_text_stream(ws: WebSocket, language_code: str = "en-IN", sample_rate_hertz: int | None = None):
+    """Binary frames carry raw LINEAR16 audio; a text frame ``end`` finishes the clip.
+
+    Sends ``{"type": "interim" | "final", "transcript"}`` as results arrive,
+    then ``{"type": "done", "transcript": <full text>}`` (or ``error``).
+    """
+    await ws.accept()
+
+    async def frames():
+        while True:
+            message = await asyncio.wait_for(ws.receive(), VOICE_TIMEOUT)
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("text") == "end":
+                return
+            if message.get("bytes"):
+                yield message["bytes"]
+
+    try:
+        async for event in stream_transcribe_async(frames(), language_code, sample_rate_hertz):
+            await ws.send_json(event)
+    except WebSocketDisconnect:
+        return
+    except asyncio.TimeoutError:
+        await ws.send_json({"type": "error", "detail": "Speech stream timed out, closing it"})
+    except Exception as e:
+        await ws.send_json({"type": "error", "detail": str(e)})
+    await ws.close()
+
 @app.post("/tts")
 async def text_to_speech(req: TTSRequest):
     try:
-        audio_base64 = synthesize_text(req.text, req.language_code)
+        audio_base64 = await synthesize_text_async(req.text, req.language_code)
         return {"audio_base64": audio_base64}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Speech synthesis timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# MP3 frames go out in chunks so a player can start before the clip is sent.
+TTS_CHUNK_BYTES = 16 * 1024
+
+@app.get("/tts/audio")
+@app.post("/tts/audio")
+async def text_to_speech_audio(request: Request, text: str | None = None, language_code: str = "en-IN"):
+    """Same as ``/tts`` but streams ``audio/mpeg`` instead of base64 JSON.
+
+    ``POST`` takes the ``/tts`` JSON body; ``GET ?text=...`` works as an
+    ``<audio src>`` URL.
+    """
+    if request.method == "POST":
+        try:
+            req = TTSRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+        text, language_code = req.text, req.language_code
+    if not text:
+        raise HTTPException(status_code=422, detail="text is required")
+    try:
+        audio = await synthesize_audio_async(text, language_code)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Speech synthesis timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def chunks():
+        view = memoryview(audio)
+        for start in range(0, len(view), TTS_CHUNK_BYTES):
+            yield view[start:start + TTS_CHUNK_BYTES]
 
+    # The cache key is a hash of the content inputs, so it doubles as a strong ETag.
+    headers = {"Content-Length": str(len(audio)), "ETag": f'"{tts_key(text, language_code)}"'}
+    return StreamingResponse(chunks(), media_type="audio/mpeg", headers=headers)
@@ -0,0 +1,171 @@
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+from intent_router import FILLER
+from backend_tools import PRODUCT_CASCADE, TOOL_GROUPS
+
+# Repeated /prompt questions are answered from memory instead of a new agent
+# run. Answers that read shop data expire quickly and are dropped when one of
+# our agents writes to the same data; answers from runs that wrote anything
+# are never stored.
+PROMPT_CACHE_SIZE = int(os.getenv("PROMPT_CACHE_SIZE", "512"))
+PROMPT_CACHE_TTL = float(os.getenv("PROMPT_CACHE_TTL", "3600"))
+PROMPT_CACHE_DATA_TTL = float(os.getenv("PROMPT_CACHE_DATA_TTL", "30"))
+# Character-trigram Jaccard similarity needed to reuse the answer of a
+# differently worded prompt; 0 turns the similarity lookup off. The prompts
+# must also share every word but filler ("please", "me", "the", ...), so
+# "delete product 16" never gets the answer stored for "delete product 15".
+PROMPT_CACHE_SIMILARITY = float(os.getenv("PROMPT_CACHE_SIMILARITY", "0.7"))
+
+_NOT_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+_TOOL_VERBS = ("bulk_create_", "bulk_update_", "bulk_delete_", "get_all_", "get_", "create_", "update_", "delete_", "complete_")
+_WRITE_VERBS = ("bulk_", "create_", "update_", "delete_", "complete_", "login_")
+_GROUP_OF = {tool: family for family, tools in TOOL_GROUPS.items() for tool in tools}
+
+
+def normalize(prompt: str) -> str:
+    text = unicodedata.normalize("NFKC", prompt).casefold()
+    return _SPACES.sub(" ", _NOT_WORD.sub(" ", text)).strip()
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def content_words(text: str) -> frozenset:
+    """Words of a normalized prompt other than filler; numbers and names included."""
+    return frozenset(word for word in text.split() if word not in FILLER)
+
+
+def tool_family(tool: str) -> str:
+    """``get_all_products`` -> ``products``, ``complete_transaction`` -> ``transactions``."""
+    if tool in _GROUP_OF:
+        # Tools not named after their entity, e.g. get_sales_summary.
+        return _GROUP_OF[tool]
+    name = next((tool[len(verb):] for verb in _TOOL_VERBS if tool.startswith(verb)), tool)
+    if name in ("user", "login_user"):
+        return "users"
+    return name if name.endswith("s") else f"{name}s"
+
+
+def is_write(tool: str) -> bool:
+    return tool.startswith(_WRITE_VERBS)
+
+
+def written_families(tool: str) -> tuple:
+    # Completing a sale also takes the quantity out of the product's stock.
+    family = tool_family(tool)
+    return PRODUCT_CASCADE if family == "products" or tool.startswith("complete_") else (family,)
+
+
+class ResponseCache:
+    """Bounded LRU of agent answers keyed on the normalized prompt (and user).
+
+    Lookups try the exact normalized prompt first, then, for answers that did
+    not touch shop data, the most similar stored prompt above ``similarity``.
+    """
+
+    def __init__(self, maxsize=PROMPT_CACHE_SIZE, ttl=PROMPT_CACHE_TTL, data_ttl=PROMPT_CACHE_DATA_TTL,
+                 similarity=PROMPT_CACHE_SIMILARITY):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data_ttl = data_ttl
+        self.similarity = similarity
+        self._entries = OrderedDict()
+        self.hits = self.similar_hits = self.misses = self.invalidations = 0
+
+    def _key(self, prompt, user_id):
+        return (user_id, normalize(prompt))
+
+    def get(self, prompt: str, user_id: int | None = None) -> str | None:
+        key = self._key(prompt, user_id)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry["expires_at"] < now:
+            del self._entries[key]
+            entry = None
+        if entry is None and self.similarity > 0:
+            key, entry = self._most_similar(key, now)
+            if entry is not None:
+                self.similar_hits += 1
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["answer"]
+
+    def _most_similar(self, key, now):
+        user_id, text = key
+        grams, words = trigrams(text), content_words(text)
+        best, best_score = (None, None), self.similarity
+        for other, entry in self._entries.items():
+            if other[0] != user_id or entry["families"] or entry["expires_at"] < now:
+                # Data answers only match exactly: "stock of tomato" and
+                # "stock of potato" are close strings but different questions.
+                continue
+            if entry["words"] != words:
+                # Answers without data are often questions about the very
+                # product, amount or id in the prompt.
+                continue
+            size = len(entry["grams"])
+            if min(size, len(grams)) < best_score * max(size, len(grams)):
+                continue
+            score = len(grams & entry["grams"]) / len(grams | entry["grams"])
+            if score >= best_score:
+                best, best_score = (other, entry), score
+        return best
+
+    def store(self, prompt: str, user_id: int | None, answer: str, tools_used=()) -> bool:
+        """Remember ``answer`` unless the run wrote data; returns whether it was stored."""
+        if self.observe(tools_used) or not answer:
+            return False
+        key = self._key(prompt, user_id)
+        families = frozenset(tool_family(tool) for tool in tools_used)
+        self._entries[key] = {
+            "answer": answer,
+            "families": families,
+            "grams": trigrams(key[1]),
+            "words": content_words(key[1]),
+            "expires_at": time.monotonic() + (self.data_ttl if families else self.ttl),
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+    def observe(self, tools_used) -> bool:
+        """Evict answers that the write tools in ``tools_used`` made stale; returns whether there were any."""
+        writes = [tool for tool in tools_used if is_write(tool)]
+        for tool in writes:
+            self.invalidate(*written_families(tool))
+        return bool(writes)
+
+    def invalidate(self, *families):
+        stale = [key for key, entry in self._entries.items() if entry["families"] & set(families)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+# Multi-turn /prompt conversations ("add product" -> "what's the price?" ->
+# "50") keep their history here, server side, keyed by session ID. What is
+# sent back to the model each turn is capped at SESSION_TOKEN_BUDGET.
+SESSION_MAX = int(os.getenv("SESSION_MAX", "1000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "2000"))
+# Tool results are cut to this many characters when stored, and only the last
+# SESSION_RECENT_TURNS turns keep them; older turns just name the tools used.
+SESSION_TOOL_RESULT_CHARS = int(os.getenv("SESSION_TOOL_RESULT_CHARS", "300"))
+SESSION_RECENT_TURNS = int(os.getenv("SESSION_RECENT_TURNS", "2"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 UTF-8 bytes per token (Devanagari is 3 bytes a letter)."""
+    return len(text.encode("utf-8")) // 4 + 1
+
+
+@dataclass
+class Turn:
+    prompt: str
+    answer: str
+    tool_results: list = field(default_factory=list)
+
+    def messages(self, recent: bool) -> list:
+        if not self.tool_results:
+            reply = self.answer
+        elif recent:
+            notes = "\n".join(f"[{tool}] {result}" for tool, result in self.tool_results)
+            reply = f"{notes}\n{self.answer}"
+        else:
+            reply = f"[used {', '.join(dict.fromkeys(tool for tool, _ in self.tool_results))}]\n{self.answer}"
+        return [HumanMessage(content=self.prompt), AIMessage(content=reply)]
+
+
+@dataclass
+class Session:
+    id: str
+    turns: list = field(default_factory=list)
+    last_used: float = field(default_factory=time.monotonic)
+    # Turns of one conversation run one after another.
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionStore:
+    """LRU of conversation sessions, evicting idle ones after ``idle_ttl`` seconds."""
+
+    def __init__(self, maxsize=SESSION_MAX, idle_ttl=SESSION_IDLE_TTL, token_budget=SESSION_TOKEN_BUDGET):
+        self.maxsize = maxsize
+        self.idle_ttl = idle_ttl
+        self.token_budget = token_budget
+        self._sessions = OrderedDict()
+        self.created = self.evicted = 0
+
+    def get(self, session_id: str | None = None) -> Session:
+        """Return the session for ``session_id``, starting a new one if it is unknown or expired."""
+        self._evict_idle()
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            session = Session(id=session_id or uuid.uuid4().hex)
+            self._sessions[session.id] = session
+            self.created += 1
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session.id)
+        return session
+
+    def end(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def history(self, session: Session) -> list:
+        """The newest turns of ``session`` that fit in the token budget, oldest first."""
+        messages, tokens = [], 0
+        for age, turn in enumerate(reversed(session.turns)):
+            turn_messages = turn.messages(recent=age < SESSION_RECENT_TURNS)
+            cost = sum(estimate_tokens(message.content) for message in turn_messages)
+            if tokens + cost > self.token_budget:
+                break
+            messages[:0] = turn_messages
+            tokens += cost
+        return messages
+
+    def record(self, session: Session, prompt: str, answer: str, tool_results=()):
+        results = [(tool, str(result)[:SESSION_TOOL_RESULT_CHARS]) for tool, result in tool_results]
+        session.turns.append(Turn(prompt, answer, results))
+        # Older turns that no longer fit the budget are dropped for good.
+        while len(session.turns) > 1 and len(self.history(session)) < 2 * len(session.turns):
+            session.turns.pop(0)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "maxsize": self.maxsize,
+            "idle_ttl_seconds": self.idle_ttl,
+            "token_budget": self.token_budget,
+            "created": self.created,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,17 @@
+from unittest import mock
+
+
+class Clock:
+    """A ``time.monotonic`` stand-in that only moves when told to."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def patch(self, module):
+        return mock.patch.object(module.time, "monotonic", self)
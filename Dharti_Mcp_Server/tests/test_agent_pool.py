@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+os.environ["MCP_USE_ANONYMIZED_TELEMETRY"] = "false"
+
+from benchmarks.stub_backend import start_stub_backend  # noqa: E402
+from client_api import AgentPool  # noqa: E402
+
+
+class ToolWorker:
+    """A pool worker with a real ``server_code.py`` process and no model; tools are called directly."""
+
+    def __init__(self, base_url):
+        from mcp_use import MCPClient
+
+        self.client = MCPClient.from_dict({"mcpServers": {"DhartiMCPServer": {
+            "command": sys.executable,
+            "args": [os.path.join(os.path.dirname(HERE), "server_code.py")],
+            "env": {"DJANGO_API": base_url},
+        }}})
+
+    async def initialize(self):
+        await self.client.create_all_sessions()
+
+    async def call(self, tool, arguments):
+        session = next(iter(self.client.get_all_active_sessions().values()))
+        result = await session.connector.call_tool(tool, arguments)
+        return json.loads(result.content[0].text)
+
+    def clear_conversation_history(self):
+        pass
+
+    async def close(self):
+        await self.client.close_all_sessions()
+
+
+class AgentPoolToolCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server, self.base_url = start_stub_backend()
+        self.addCleanup(self.server.shutdown)
+
+    async def test_read_after_write_through_another_worker(self):
+        pool = AgentPool(lambda: ToolWorker(self.base_url), size=2)
+        await pool.warm()
+        try:
+            async with pool.lease() as first:
+                self.assertEqual((await first.call("get_product", {"product_id": 1}))["name"], "products-1")
+                # Cached in the first worker's process now.
+                async with pool.lease() as second:
+                    self.assertIsNot(second, first)
+                    await second.call("update_product", {"product_id": 1, "data": {"name": "Tamatar", "stock_qty": 42}})
+
+            async with pool.lease() as one, pool.lease() as other:
+                reader = one if one is first else other
+                self.assertIs(reader, first)
+                product = await reader.call("get_product", {"product_id": 1})
+            self.assertEqual((product["name"], product["stock_qty"]), ("Tamatar", 42))
+        finally:
+            await pool.close()
+
+
+class BrokenAgent:
+    """Fails every health check (no MCP client)."""
+
+    client = None
+    closed = False
+
+    async def initialize(self):
+        pass
+
+    def clear_conversation_history(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class AgentPoolReplaceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_replacement_gives_up_the_slot(self):
+        agents, failing = [], False
+
+        def factory():
+            if failing:
+                raise RuntimeError("server did not start")
+            agents.append(BrokenAgent())
+            return agents[-1]
+
+        pool = AgentPool(factory, size=1)
+        with self.assertRaises(ValueError):
+            async with pool.lease() as agent:
+                failing = True
+                raise ValueError("run failed")
+        # The closed worker is not handed out again; the next lease starts a new one.
+        self.assertTrue(agent.closed)
+        self.assertEqual(pool.stats()["spawned"], 0)
+        self.assertEqual(pool.stats()["idle"], 0)
+
+        failing = False
+        async with pool.lease() as fresh:
+            self.assertIsNot(fresh, agent)
+            self.assertFalse(fresh.closed)
+        self.assertEqual(pool.stats()["spawned"], 1)
+
+    async def test_broken_worker_is_replaced(self):
+        pool = AgentPool(BrokenAgent, size=1)
+        with self.assertRaises(ValueError):
+            async with pool.lease() as agent:
+                raise ValueError("run failed")
+        async with pool.lease() as fresh:
+            self.assertIsNot(fresh, agent)
+        self.assertTrue(agent.closed)
+        self.assertEqual(pool.stats()["replaced"], 1)
@@ -0,0 +1,24 @@
+import contextlib
+import io
+import unittest
+
+import httpx
+
+from ai_log_queue import AILogQueue
+
+
+class AILogQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_send_errors_are_logged_not_printed(self):
+        async def unreachable(batch):
+            raise httpx.ConnectError("backend down")
+
+        queue = AILogQueue(sender=unreachable)
+        queue.log({"action_type": "voice"})
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertLogs("ai_log_queue", "WARNING") as logs:
+            self.assertFalse(await queue.flush())
+            await queue.close(timeout=1)
+        # stdout is the MCP server's JSON-RPC stream.
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(queue.stats()["pending"], 1)
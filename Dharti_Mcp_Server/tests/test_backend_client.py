@@ -0,0 +1,74 @@
+import unittest
+
+import httpx
+
+import backend_client
+from benchmarks.stub_backend import start_stub_backend
+
+
+class StubBackendListTests(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.base_url = start_stub_backend(rows_per_resource=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.original_api = backend_client.DJANGO_API
+        backend_client.DJANGO_API = self.base_url
+
+    async def asyncTearDown(self):
+        await backend_client.close_client()
+        backend_client.DJANGO_API = self.original_api
+
+    async def test_iter_rows_follows_cursor_links(self):
+        ids = [row["id"] async for row in backend_client.iter_rows("products/", page_size=4)]
+        self.assertEqual(ids, list(range(10, 0, -1)))
+
+    async def test_limit_stops_early_and_reports_has_more(self):
+        page = await backend_client.api_list("products/", limit=4)
+        self.assertEqual([row["id"] for row in page["results"]], [10, 9, 8, 7])
+        self.assertEqual((page["count"], page["has_more"]), (4, True))
+
+    async def test_limit_covering_every_row_has_no_more(self):
+        page = await backend_client.api_list("products/", limit=10)
+        self.assertEqual((page["count"], page["has_more"]), (10, False))
+
+    async def test_fields_projects_each_row(self):
+        page = await backend_client.api_list("catalogs/", limit=2, fields=["id", "missing"])
+        self.assertEqual(page["results"], [{"id": 10}, {"id": 9}])
+
+    async def test_unknown_list_returns_the_backend_error(self):
+        page = await backend_client.api_list("nothing-here/")
+        self.assertEqual(page, {"detail": "Not found."})
+
+    async def test_iter_rows_raises_on_an_error_page(self):
+        with self.assertRaises(backend_client.BackendError) as caught:
+            [row async for row in backend_client.iter_rows("nothing-here/")]
+        self.assertEqual(caught.exception.status_code, 404)
+
+
+class ErrorPageTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await backend_client.close_client()
+
+    def serve(self, response):
+        backend_client._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: response))
+
+    async def test_bad_filter_returns_the_validation_errors(self):
+        self.serve(httpx.Response(400, json={"created_after": ["Enter a valid date/time."]}))
+        page = await backend_client.api_list("products/", {"created_after": "soon"})
+        self.assertEqual(page, {"created_after": ["Enter a valid date/time."]})
+
+    async def test_html_server_error_becomes_a_detail(self):
+        self.serve(httpx.Response(500, html="<h1>Server Error (500)</h1>"))
+        page = await backend_client.api_list("products/")
+        self.assertEqual(page, {"detail": "Backend error 500 Internal Server Error"})
+        self.assertEqual(await backend_client.api_get("products/1/"), page)
+
+
+if __name__ == "__main__":
+    unittest.main()
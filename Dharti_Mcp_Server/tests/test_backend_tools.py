@@ -0,0 +1,28 @@
+import asyncio
+import subprocess
+import sys
+import unittest
+
+from backend_tools import TOOL_GROUPS
+
+# Server-side tools the model is never shown by group.
+UNGROUPED = {"get_tool_cache_stats", "clear_tool_cache"}
+
+
+class ToolGroupTests(unittest.TestCase):
+    def test_groups_name_exactly_the_registered_tools(self):
+        import server_code
+
+        registered = {tool.name for tool in asyncio.run(server_code.app.list_tools())}
+        grouped = {name for names in TOOL_GROUPS.values() for name in names}
+        self.assertEqual(grouped, registered - UNGROUPED)
+
+    def test_fastapi_side_does_not_build_the_mcp_server(self):
+        # A fresh interpreter: this test process may have imported server_code already.
+        code = "import sys, client_api, intent_router, response_cache; print(sorted({'server_code', 'ai_log_queue', 'mcp.server.fastmcp'} & set(sys.modules)))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ["MCP_USE_ANONYMIZED_TELEMETRY"] = "false"
+
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult  # noqa: E402
+
+import client_api  # noqa: E402
+from benchmarks.stub_backend import start_stub_backend  # noqa: E402
+from client_api import LLM_Client  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+class ScriptedLLM(BaseChatModel):
+    """Answers "hello", fails on "boom" and calls a tool forever on "loop"."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError("async only")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = next(m.content for m in reversed(messages) if isinstance(m, HumanMessage))
+        if prompt == "boom":
+            raise RuntimeError("model unavailable")
+        if prompt == "loop":
+            call = {"name": "get_tool_cache_stats", "args": {}, "id": f"call_{len(messages)}", "type": "tool_call"}
+            message = AIMessage(content="still working", tool_calls=[call])
+        else:
+            message = AIMessage(content=f"answer to {prompt}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        # One chunk, so stream_prompt sees the text as tokens.
+        message = (await self._agenerate(messages)).generations[0].message
+        chunks = [{"name": c["name"], "args": "{}", "id": c["id"], "index": 0} for c in message.tool_calls]
+        chunk = ChatGenerationChunk(message=AIMessageChunk(content=message.content, tool_call_chunks=chunks))
+        if run_manager:
+            await run_manager.on_llm_new_token(message.content, chunk=chunk)
+        yield chunk
+
+
+class ResponseCacheStoreTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        server, base_url = start_stub_backend()
+        self.addCleanup(server.shutdown)
+        self.cache = ResponseCache()
+        previous, client_api.response_cache = client_api.response_cache, self.cache
+        self.addCleanup(setattr, client_api, "response_cache", previous)
+
+        self.client = LLM_Client(pool_size=1)
+        self.client.config["mcpServers"]["DhartiMCPServer"].update({
+            "command": sys.executable,
+            "args": [os.path.join(os.path.dirname(HERE), "server_code.py")],
+            "env": {"DJANGO_API": base_url},
+        })
+        self.client.llm = ScriptedLLM()
+        await self.client.pool.warm()
+        async with self.client.pool.lease() as agent:
+            agent.max_steps = 3
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_only_finished_answers_are_stored(self):
+        self.assertIn("answer to hello", await self.client.send_prompt("hello"))
+        self.assertEqual(self.cache.get("hello"), "answer to hello")
+
+        for prompt in ("boom", "loop"):
+            reply = await self.client.send_prompt(prompt)
+            self.assertIn("Agent stopped", reply)
+            self.assertIsNone(self.cache.get(prompt), msg=prompt)
+
+    async def test_streamed_step_limit_is_an_error_and_not_stored(self):
+        events = [event async for event in self.client.stream_prompt("loop")]
+        kinds = [kind for kind, _ in events]
+        # Every "still working" token is taken back before its tool call runs.
+        self.assertEqual(kinds[:4], ["token", "reset", "tool_start", "tool_end"])
+        self.assertEqual(kinds.count("token"), kinds.count("reset"))
+        self.assertNotIn("done", kinds)
+        self.assertEqual(events[-1][0], "error")
+        self.assertIn("Agent stopped", events[-1][1]["detail"])
+        self.assertIsNone(self.cache.get("loop"))
+
+    async def test_streamed_answer_comes_from_the_executor(self):
+        events = [event async for event in self.client.stream_prompt("hello")]
+        self.assertEqual(events[0], ("token", {"text": "answer to hello"}))
+        self.assertEqual(events[-1], ("done", {"response": "answer to hello", "session_id": events[-1][1]["session_id"]}))
+        self.assertEqual(self.cache.get("hello"), "answer to hello")
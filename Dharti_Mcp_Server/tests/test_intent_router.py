@@ -0,0 +1,84 @@
+import inspect
+import json
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+
+import backend_tools
+from intent_router import match, route, select_groups
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "intent_corpus.jsonl")
+
+
+class IntentCorpusTests(unittest.TestCase):
+    """The labelled corpus of eval_intent_router.py: every routable prompt right, no false routes."""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(CORPUS, encoding="utf-8") as f:
+            cls.corpus = [json.loads(line) for line in f if line.strip()]
+
+    def test_every_routable_prompt_gets_its_intent_and_arguments(self):
+        for case in self.corpus:
+            if case["intent"] is None:
+                continue
+            with self.subTest(prompt=case["prompt"]):
+                intent = match(case["prompt"], case["user_id"])
+                self.assertIsNotNone(intent)
+                self.assertEqual((intent.name, intent.args), (case["intent"], case["args"]))
+
+    def test_agent_prompts_are_never_routed(self):
+        for case in self.corpus:
+            if case["intent"] is None:
+                with self.subTest(prompt=case["prompt"]):
+                    self.assertIsNone(match(case["prompt"], case["user_id"]))
+
+
+class SelectGroupsTests(unittest.TestCase):
+    def test_groups_follow_the_words_and_bring_products_along(self):
+        self.assertEqual(select_groups("how much did I earn this week"), {"transactions", "products"})
+        self.assertEqual(select_groups("show my catalog"), {"catalogs", "products"})
+        self.assertIsNone(select_groups("hello there"))
+
+
+class IntentScopeTests(unittest.TestCase):
+    def test_lists_are_filtered_by_user_in_the_tool_call(self):
+        for prompt, tool in [("show my catalogs", "get_all_catalogs"),
+                             ("my reminders", "get_all_restock_reminders"),
+                             ("show my products", "get_all_products"),
+                             ("pending orders", "get_all_transactions")]:
+            intent = match(prompt, 7)
+            self.assertEqual((intent.tool, intent.args.get("user")), (tool, 7), msg=prompt)
+            # The filter must be an argument the tool (and so the backend) understands.
+            self.assertIn("user", inspect.signature(getattr(backend_tools, tool)).parameters, msg=tool)
+
+    def test_anonymous_lists_are_not_filtered(self):
+        self.assertEqual(match("list catalogues").args, {})
+
+
+class RouteDeferralTests(unittest.IsolatedAsyncioTestCase):
+    async def route_with(self, outcome):
+        async def tool(**kwargs):
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with mock.patch.object(backend_tools, "get_all_products", SimpleNamespace(__wrapped__=tool)):
+            return await route("show my products", 7)
+
+    async def test_a_page_is_answered_directly(self):
+        routed = await self.route_with({"results": [{"id": 1, "name": "Tomato"}], "count": 1, "has_more": False})
+        self.assertIsNotNone(routed)
+        self.assertIn("Tomato", routed[1])
+
+    async def test_errors_defer_to_the_agent(self):
+        for outcome in [{"detail": "Not found."},
+                        {"created_after": ["Enter a valid date/time."]},
+                        {"results": "unavailable"},
+                        httpx.ConnectError("refused"),
+                        ValueError("Expecting value")]:
+            with self.subTest(outcome=outcome):
+                self.assertIsNone(await self.route_with(outcome))
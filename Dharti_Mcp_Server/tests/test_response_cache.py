@@ -0,0 +1,89 @@
+import unittest
+
+import response_cache as response_cache_module
+from response_cache import ResponseCache, tool_family, written_families
+from tests.clock import Clock
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = self.clock.patch(response_cache_module)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ResponseCache(maxsize=10, ttl=3600, data_ttl=30, similarity=0.7)
+
+    def test_exact_match_ignores_case_punctuation_and_spacing(self):
+        self.cache.store("Who are you?", None, "I am RFAI.")
+        self.assertEqual(self.cache.get("  who are   you "), "I am RFAI.")
+
+    def test_answers_are_scoped_to_the_user(self):
+        self.cache.store("show my products", 1, "Rice, Dal", ["get_all_products"])
+        self.assertEqual(self.cache.get("show my products", 1), "Rice, Dal")
+        self.assertIsNone(self.cache.get("show my products", 2))
+        self.assertIsNone(self.cache.get("show my products"))
+
+    def test_runs_that_wrote_or_said_nothing_are_not_stored(self):
+        self.assertFalse(self.cache.store("add tomato", 1, "Added.", ["get_all_products", "create_product"]))
+        self.assertFalse(self.cache.store("hello", 1, ""))
+        self.assertIsNone(self.cache.get("add tomato", 1))
+        self.assertIsNone(self.cache.get("hello", 1))
+
+    def test_data_answers_expire_sooner(self):
+        self.cache.store("what can you do", None, "Lots.")
+        self.cache.store("show my products", 1, "Rice", ["get_all_products"])
+        self.clock.advance(31)
+        self.assertIsNone(self.cache.get("show my products", 1))
+        self.assertEqual(self.cache.get("what can you do"), "Lots.")
+        self.clock.advance(3600)
+        self.assertIsNone(self.cache.get("what can you do"))
+
+    def test_a_write_evicts_answers_of_the_families_it_touches(self):
+        self.cache.store("show my products", 1, "Rice", ["get_all_products"])
+        self.cache.store("my catalogs", 1, "Summer", ["get_all_catalogs"])
+        self.cache.store("my users", 1, "Me", ["get_all_users"])
+        self.cache.store("how to add a product", 1, "Say 'add ...'")
+        # Completing a sale changes stock, and catalogs show products.
+        self.assertTrue(self.cache.observe(["complete_transaction"]))
+        self.assertIsNone(self.cache.get("show my products", 1))
+        self.assertIsNone(self.cache.get("my catalogs", 1))
+        self.assertEqual(self.cache.get("my users", 1), "Me")
+        self.assertEqual(self.cache.get("how to add a product", 1), "Say 'add ...'")
+
+    def test_similar_prompts_reuse_only_answers_without_data(self):
+        self.cache.store("how do I add a product", None, "Tell me its name and price.")
+        self.cache.store("stock of tomato", None, "12 kg", ["get_all_products"])
+        self.assertEqual(self.cache.get("how do i add product"), "Tell me its name and price.")
+        self.assertEqual(self.cache.similar_hits, 1)
+        self.assertIsNone(self.cache.get("stock of potato"))
+
+    def test_similar_prompts_must_share_numbers_and_names(self):
+        question = "Are you sure you want to delete product 15 (Rice)?"
+        self.cache.store("delete product 15", 1, question)
+        self.cache.store("add rice at 50 rupees", 1, "Add rice at 50?")
+        self.cache.store("delete tomato", 1, "Delete Tomato?")
+        self.assertIsNone(self.cache.get("delete product 16", 1))
+        self.assertIsNone(self.cache.get("add rice at 60 rupees", 1))
+        self.assertIsNone(self.cache.get("delete potato", 1))
+        self.assertEqual(self.cache.get("delete the product 15", 1), question)
+
+    def test_least_recently_used_answer_is_evicted(self):
+        cache = ResponseCache(maxsize=2, similarity=0)
+        cache.store("one", None, "1")
+        cache.store("two", None, "2")
+        cache.get("one")
+        cache.store("three", None, "3")
+        self.assertEqual([cache.get(p) for p in ("one", "two", "three")], ["1", None, "3"])
+
+
+class ToolFamilyTests(unittest.TestCase):
+    def test_tool_names_map_to_their_family(self):
+        self.assertEqual(tool_family("get_all_products"), "products")
+        self.assertEqual(tool_family("bulk_update_restock_reminders"), "restock_reminders")
+        self.assertEqual(tool_family("login_user"), "users")
+        self.assertEqual(tool_family("get_sales_summary"), "transactions")
+
+    def test_product_writes_reach_everything_that_shows_products(self):
+        self.assertIn("catalogs", written_families("update_product"))
+        self.assertIn("products", written_families("complete_transaction"))
+        self.assertEqual(written_families("create_catalog"), ("catalogs",))
@@ -0,0 +1,62 @@
+import unittest
+
+import sessions as sessions_module
+from sessions import SESSION_TOOL_RESULT_CHARS, SessionStore, estimate_tokens
+from tests.clock import Clock
+
+
+class SessionStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = self.clock.patch(sessions_module)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sessions_are_kept_by_id(self):
+        store = SessionStore()
+        session = store.get()
+        self.assertIs(store.get(session.id), session)
+        self.assertIsNot(store.get("unknown"), session)
+        self.assertTrue(store.end(session.id))
+        self.assertIsNot(store.get(session.id), session)
+
+    def test_idle_sessions_expire(self):
+        store = SessionStore(idle_ttl=60)
+        session = store.get()
+        self.clock.advance(61)
+        self.assertIsNot(store.get(session.id), session)
+        self.assertEqual(store.evicted, 1)
+
+    def test_least_recently_used_session_is_evicted(self):
+        store = SessionStore(maxsize=2)
+        first, second = store.get("a"), store.get("b")
+        store.get("a")
+        store.get("c")
+        self.assertIs(store.get("a"), first)
+        self.assertIsNot(store.get("b"), second)
+
+    def test_only_recent_turns_carry_tool_results(self):
+        store = SessionStore(token_budget=10_000)
+        session = store.get()
+        for i in range(3):
+            store.record(session, f"q{i}", f"a{i}", [("get_all_products", f"rows {i}")])
+        replies = [message.content for message in store.history(session)[1::2]]
+        self.assertEqual(replies, ["[used get_all_products]\na0", "[get_all_products] rows 1\na1",
+                                   "[get_all_products] rows 2\na2"])
+
+    def test_stored_tool_results_are_cut(self):
+        store = SessionStore()
+        session = store.get()
+        store.record(session, "list", "done", [("get_all_products", "x" * 10_000)])
+        self.assertEqual(len(session.turns[0].tool_results[0][1]), SESSION_TOOL_RESULT_CHARS)
+
+    def test_history_keeps_the_newest_turns_within_the_budget(self):
+        store = SessionStore(token_budget=60)
+        session = store.get()
+        for i in range(20):
+            store.record(session, f"question {i} " * 3, f"answer {i} " * 3)
+        history = store.history(session)
+        self.assertLessEqual(sum(estimate_tokens(message.content) for message in history), 60)
+        self.assertTrue(history[-1].content.startswith("answer 19"))
+        # Turns that fell out of the budget are gone from the session too.
+        self.assertEqual(len(history), 2 * len(session.turns))
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+import tool_cache as tool_cache_module
+from tests.clock import Clock
+from tool_cache import ToolCache, cached_tool, invalidates
+
+
+class ToolCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = self.clock.patch(tool_cache_module)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire_after_ttl(self):
+        cache = ToolCache(ttl=30)
+        cache.set("k", "products", 1)
+        self.clock.advance(29)
+        self.assertEqual(cache.get("k"), 1)
+        self.clock.advance(2)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual((cache.hits, cache.misses, cache.stats()["size"]), (1, 1, 0))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ToolCache(maxsize=2)
+        cache.set("a", "products", 1)
+        cache.set("b", "products", 2)
+        cache.get("a")
+        cache.set("c", "products", 3)
+        self.assertEqual([cache.get(key) for key in "abc"], [1, None, 3])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_invalidate_drops_only_the_given_families(self):
+        cache = ToolCache()
+        cache.set("p", "products", 1)
+        cache.set("c", "catalogs", 2)
+        cache.set("u", "users", 3)
+        cache.invalidate("products", "catalogs")
+        self.assertEqual([cache.get(key) for key in "pcu"], [None, None, 3])
+        self.assertEqual(cache.invalidations, 2)
+
+    def test_read_started_before_a_write_is_not_stored(self):
+        cache = ToolCache()
+        generation = cache.generation("products")
+        cache.invalidate("products")
+        cache.set("p", "products", "old", generation)
+        self.assertIsNone(cache.get("p"))
+        cache.set("p", "products", "new", cache.generation("products"))
+        self.assertEqual(cache.get("p"), "new")
+
+
+class CachedToolTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = ToolCache()
+        patcher = mock.patch.object(tool_cache_module, "tool_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = []
+
+        @cached_tool("products")
+        async def get_product(product_id: int, fields: list | None = None) -> dict:
+            self.calls.append(product_id)
+            return {"id": product_id, "tags": []}
+
+        @invalidates("products")
+        async def update_product(product_id: int) -> dict:
+            raise ValueError("backend said no")
+
+        self.get_product, self.update_product = get_product, update_product
+
+    async def test_same_arguments_are_fetched_once(self):
+        first = await self.get_product(1)
+        # Positional and keyword spellings of the same call share an entry.
+        self.assertEqual(await self.get_product(product_id=1, fields=None), first)
+        await self.get_product(2)
+        self.assertEqual(self.calls, [1, 2])
+
+    async def test_callers_get_copies(self):
+        (await self.get_product(1))["tags"].append("changed")
+        self.assertEqual((await self.get_product(1))["tags"], [])
+
+    async def test_write_invalidates_even_when_it_fails(self):
+        await self.get_product(1)
+        with self.assertRaises(ValueError):
+            await self.update_product(1)
+        await self.get_product(1)
+        self.assertEqual(self.calls, [1, 1])
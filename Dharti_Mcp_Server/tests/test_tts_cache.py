@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tts_cache import TTSCache
+
+
+class TTSCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def files(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_memory_tier_is_bounded_by_bytes(self):
+        cache = TTSCache(memory_bytes=10, disk_bytes=0, directory=self.directory)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+        self.assertEqual([cache.get_memory(key) for key in "abc"], [b"aaaa", None, b"cccc"])
+        cache.set("big", b"x" * 11)
+        self.assertIsNone(cache.get("big"))
+        stats = cache.stats()
+        self.assertEqual((stats["memory_bytes"], stats["memory_evictions"]), (8, 1))
+
+    def test_disk_tier_evicts_least_recently_used_files(self):
+        cache = TTSCache(memory_bytes=0, disk_bytes=10, directory=self.directory)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        self.assertEqual(cache.get("a"), b"aaaa")
+        cache.set("c", b"cccc")
+        self.assertEqual(self.files(), ["a.audio", "c.audio"])
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats["disk_bytes"], stats["disk_evictions"], stats["disk_hits"]), (8, 1, 1))
+
+    def test_disk_index_is_reloaded_at_startup(self):
+        cache = TTSCache(memory_bytes=0, disk_bytes=100, directory=self.directory)
+        for index, key in enumerate("abc"):
+            cache.set(key, key.encode() * 4)
+            # Oldest first, whatever the file system's timestamp resolution.
+            os.utime(os.path.join(self.directory, f"{key}.audio"), (1000 + index, 1000 + index))
+
+        reloaded = TTSCache(memory_bytes=100, disk_bytes=100, directory=self.directory)
+        self.assertEqual(reloaded.stats()["disk_entries"], 3)
+        self.assertEqual(reloaded.get("b"), b"bbbb")
+        self.assertEqual(reloaded.get_memory("b"), b"bbbb")
+
+        smaller = TTSCache(memory_bytes=0, disk_bytes=8, directory=self.directory)
+        self.assertEqual(smaller.stats()["disk_entries"], 2)
+        self.assertEqual(self.files(), ["b.audio", "c.audio"])
+
+    def test_disk_errors_keep_the_memory_copy(self):
+        cache = TTSCache(memory_bytes=100, disk_bytes=100, directory=self.directory)
+        with mock.patch("tts_cache.os.replace", side_effect=OSError(28, "No space left on device")):
+            with self.assertLogs("tts_cache", "WARNING"):
+                cache.set("a", b"aaaa")
+        self.assertEqual(cache.get("a"), b"aaaa")
+        self.assertEqual(cache.stats()["disk_entries"], 0)
+        self.assertEqual(self.files(), [])
+
+    def test_a_file_removed_behind_the_cache_is_a_miss(self):
+        cache = TTSCache(memory_bytes=0, disk_bytes=100, directory=self.directory)
+        cache.set("a", b"aaaa")
+        os.remove(os.path.join(self.directory, "a.audio"))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual((cache.stats()["disk_entries"], cache.misses), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import voice_services
+from benchmarks.fake_voice import FakeVoiceClient
+
+# Four bytes of audio per word keeps the clips tiny.
+WORD = b"\x00" * 4
+
+
+async def clip(words, hold=None):
+    for _ in range(words):
+        yield WORD
+    if hold is not None:
+        await hold.wait()
+
+
+class StreamTranscribeTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeVoiceClient(bytes_per_word=len(WORD), words_per_utterance=3)
+        for name, value in [("speech_client", self.fake), ("_stream_slots", asyncio.Semaphore(1)),
+                            ("_slots", asyncio.Semaphore(1))]:
+            patcher = mock.patch.object(voice_services, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def collect(self, frames, **kwargs):
+        return [event async for event in voice_services.stream_transcribe_async(frames, **kwargs)]
+
+    def assertSlotFree(self):
+        self.assertFalse(voice_services._stream_slots.locked())
+
+    async def test_interim_and_final_results_are_stitched(self):
+        events = await self.collect(clip(7))
+        self.assertEqual([event["type"] for event in events],
+                         ["interim", "interim", "final", "interim", "interim", "final", "interim", "final", "done"])
+        self.assertEqual(events[2]["transcript"], "mere paas kitna")
+        self.assertEqual(events[-1]["transcript"], self.fake.expected_transcript(7 * len(WORD)))
+        self.assertSlotFree()
+
+    async def test_client_disconnect_ends_the_stream(self):
+        async def frames():
+            yield WORD
+            raise ConnectionResetError("client went away")
+
+        with self.assertRaises(ConnectionResetError):
+            await self.collect(frames())
+        self.assertSlotFree()
+
+    async def test_caller_leaving_early_frees_the_slot(self):
+        hold = asyncio.Event()
+        stream = voice_services.stream_transcribe_async(clip(1, hold))
+        self.assertEqual((await anext(stream))["type"], "interim")
+        await stream.aclose()
+        self.assertSlotFree()
+        self.assertEqual((await self.collect(clip(3)))[-1]["transcript"], "mere paas kitna")
+
+    async def test_busy_streams_time_out_without_blocking_other_voice_calls(self):
+        hold = asyncio.Event()
+        first = voice_services.stream_transcribe_async(clip(1, hold))
+        await anext(first)
+        with mock.patch.object(voice_services, "VOICE_TIMEOUT", 0.05):
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.collect(clip(1))
+        # One-shot recognition has its own workers.
+        self.assertEqual(await voice_services.transcribe_bytes_async(WORD * 3), "mere paas kitna")
+        hold.set()
+        self.assertEqual([event["type"] async for event in first], ["final", "done"])
+        self.assertSlotFree()
+
+    async def test_recognition_is_cut_off_after_the_stream_timeout(self):
+        with mock.patch.object(voice_services, "STT_STREAM_TIMEOUT", 0.05):
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.collect(clip(1, asyncio.Event()))
+        self.assertSlotFree()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import copy
+import functools
+import inspect
+import json
+import os
+import time
+from collections import OrderedDict
+
+# Read-only tool results are memoized per (tool, arguments) for a short TTL so
+# that an agent run asking the same question twice only pays for it once.
+# Every pool worker is its own process with its own cache, and a write only
+# invalidates the cache of the worker that made it, so client_api.AgentPool
+# empties a worker's cache each time it leases the worker out.
+TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", "256"))
+TOOL_CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", "30"))
+
+
+class ToolCache:
+    """Size-bounded LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Entries are tagged with an entity family ("products", "transactions", ...)
+    so a write can drop everything it may have made stale.
+    """
+
+    def __init__(self, maxsize=TOOL_CACHE_SIZE, ttl=TOOL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self, family):
+        return self._generations.get(family, 0)
+
+    def set(self, key, family, value, generation=None):
+        if generation is not None and generation != self.generation(family):
+            # A write to this family landed while the read was in flight.
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, family, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *families):
+        for family in families:
+            self._generations[family] = self.generation(family) + 1
+        stale = [key for key, (_, family, _) in self._entries.items() if family in families]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+tool_cache = ToolCache()
+
+
+def cached_tool(family: str):
+    """Memoize an async read tool under ``family``, keyed on its bound arguments."""
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (fn.__name__, json.dumps(bound.arguments, sort_keys=True, default=str))
+            result = tool_cache.get(key)
+            if result is None:
+                generation = tool_cache.generation(family)
+                result = await fn(*args, **kwargs)
+                tool_cache.set(key, family, result, generation)
+            return copy.deepcopy(result)
+
+        return wrapper
+    return decorator
+
+
+def invalidates(*families: str):
+    """Drop cached reads of ``families`` once the wrapped write tool has run."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                tool_cache.invalidate(*families)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+# Synthesized audio is content-addressed: the same phrase in the same voice is
+# only ever sent to Google once. Hot clips live in memory, the long tail on disk.
+TTS_CACHE_MEMORY_BYTES = int(os.getenv("TTS_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+TTS_CACHE_DISK_BYTES = int(os.getenv("TTS_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tts_cache"))
+
+logger = logging.getLogger(__name__)
+
+
+def audio_key(text, language_code, voice, encoding) -> str:
+    payload = json.dumps([text, language_code, voice, encoding], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Two-tier (memory LRU, then disk) cache of synthesized audio bytes.
+
+    Both tiers are bounded by total bytes and evict least recently used clips.
+    Calls come from the voice worker threads, so every method takes a lock,
+    but files are read and written outside it: ``get_memory`` runs on the
+    event loop and must not wait for the disk. A disk size of 0 disables the
+    disk tier; a disk that fails only costs the clip its disk copy.
+    """
+
+    def __init__(self, memory_bytes=TTS_CACHE_MEMORY_BYTES, disk_bytes=TTS_CACHE_DISK_BYTES, directory=TTS_CACHE_DIR):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.directory = directory
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.memory_hits = self.disk_hits = self.misses = 0
+        self.memory_evictions = self.disk_evictions = 0
+        if self.disk_bytes:
+            self._load_disk_index()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def _load_disk_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".audio"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+
+    def get_memory(self, key):
+        """Memory tier only; cheap enough to call from the event loop."""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return audio
+
+    def get(self, key):
+        audio = self.get_memory(key)
+        if audio is not None:
+            return audio
+        with self._lock:
+            on_disk = key in self._disk
+            if not on_disk:
+                self.misses += 1
+        if not on_disk:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            # Evicted meanwhile, or removed behind our back.
+            with self._lock:
+                if key in self._disk:
+                    self._disk_size -= self._disk.pop(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def set(self, key, audio: bytes):
+        with self._lock:
+            self._remember(key, audio)
+            if not self.disk_bytes or key in self._disk or len(audio) > self.disk_bytes:
+                return
+        tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning("TTS cache could not write %s to disk: %s", key, e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if key not in self._disk:
+                self._disk[key] = len(audio)
+                self._disk_size += len(audio)
+                self._evict_disk()
+
+    def _remember(self, key, audio):
+        if len(audio) > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.memory_evictions += 1
+
+    def _evict_disk(self):
+        while self._disk_size > self.disk_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self.disk_evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "memory_max_bytes": self.memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size,
+                "disk_max_bytes": self.disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_evictions": self.memory_evictions,
+                "disk_evictions": self.disk_evictions,
+            }
+
+
+tts_cache = TTSCache()
@@ -1,32 +1,210 @@
-from google.cloud import speech, texttospeech
+import asyncio
 import base64
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from tts_cache import audio_key, tts_cache
 
 load_dotenv()
-# Initialize Clients (Recommended to initialize globally)
-speech_client = speech.SpeechClient()
-tts_client = texttospeech.TextToSpeechClient()
+# Clients are created on first use (one per process) so importing this module
+# needs no credentials, and tests/benchmarks can swap in a local fake. The
+# Google libraries themselves are imported on first use too (~1 s together).
+speech_client = None
+tts_client = None
+
+# The Google clients are blocking gRPC calls. They run on a bounded pool of
+# worker threads so the event loop (and every in-flight /prompt) keeps going.
+VOICE_WORKERS = int(os.getenv("VOICE_WORKERS", "8"))
+# Upper bound for one voice request, including time spent waiting for a worker.
+VOICE_TIMEOUT = float(os.getenv("VOICE_TIMEOUT", "30"))
+
+# Synchronous recognize accepts at most 10 MB of inline audio.
+STT_MAX_UPLOAD_BYTES = int(os.getenv("STT_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# A streaming recognition holds one thread for the whole clip. Google closes
+# streams after ~5 minutes of audio. Streams get their own threads and limit,
+# so a few long recordings cannot starve /stt and /tts of workers.
+STT_STREAM_TIMEOUT = float(os.getenv("STT_STREAM_TIMEOUT", "300"))
+STT_STREAMS = int(os.getenv("STT_STREAMS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=VOICE_WORKERS, thread_name_prefix="voice")
+_slots = asyncio.Semaphore(VOICE_WORKERS)
+_stream_executor = ThreadPoolExecutor(max_workers=STT_STREAMS, thread_name_prefix="voice-stream")
+_stream_slots = asyncio.Semaphore(STT_STREAMS)
+
+
+async def run_in_voice_pool(fn, *args):
+    """Run a blocking voice call on the worker pool.
+
+    Raises ``asyncio.TimeoutError`` if no worker frees up and finishes the
+    call within ``VOICE_TIMEOUT``.
+    """
+    async def call():
+        async with _slots:
+            return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+    return await asyncio.wait_for(call(), VOICE_TIMEOUT)
+
+
+def get_speech_client():
+    global speech_client
+    if speech_client is None:
+        from google.cloud import speech
+        speech_client = speech.SpeechClient()
+    return speech_client
+
+
+def get_tts_client():
+    global tts_client
+    if tts_client is None:
+        from google.cloud import texttospeech
+        tts_client = texttospeech.TextToSpeechClient()
+    return tts_client
+
 
 def transcribe_audio(base64_audio: str, language_code="en-IN") -> str:
-    audio_content = base64.b64decode(base64_audio)
+    return transcribe_bytes(base64.b64decode(base64_audio), language_code)
+
+def transcribe_bytes(audio_content: bytes, language_code="en-IN") -> str:
+    from google.cloud import speech
     audio = speech.RecognitionAudio(content=audio_content)
     config = speech.RecognitionConfig(
         encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
         language_code=language_code,
     )
-    response = speech_client.recognize(config=config, audio=audio)
-    return response.results[0].alternatives[0].transcript if response.results else ""
+    response = get_speech_client().recognize(config=config, audio=audio, timeout=VOICE_TIMEOUT)
+    return stitch_transcript(response.results)
 
-def synthesize_text(text: str, language_code="en-IN") -> str:
+def stitch_transcript(results) -> str:
+    """Join the best alternative of every result; each utterance is its own result."""
+    return " ".join(
+        result.alternatives[0].transcript.strip() for result in results if result.alternatives
+    ).strip()
+
+def stream_transcribe(chunks, language_code="en-IN", sample_rate_hertz=None):
+    """Blocking streaming recognition over ``chunks``, an iterable of LINEAR16 bytes.
+
+    Yields ``("interim" | "final", transcript)`` as the recognizer produces them.
+    """
+    from google.cloud import speech
+    config = speech.StreamingRecognitionConfig(
+        config=speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate_hertz,
+            language_code=language_code,
+        ),
+        interim_results=True,
+    )
+    requests = (speech.StreamingRecognizeRequest(audio_content=chunk) for chunk in chunks)
+    responses = get_speech_client().streaming_recognize(config, requests, timeout=STT_STREAM_TIMEOUT)
+    for response in responses:
+        for result in response.results:
+            if result.alternatives:
+                yield ("final" if result.is_final else "interim"), result.alternatives[0].transcript
+
+# Names of texttospeech.SsmlVoiceGender / texttospeech.AudioEncoding members.
+TTS_GENDER = "MALE"
+TTS_ENCODING = "MP3"
+
+def tts_key(text: str, language_code="en-IN") -> str:
+    return audio_key(text, language_code, TTS_GENDER, TTS_ENCODING)
+
+def synthesize_audio(text: str, language_code="en-IN") -> bytes:
+    """MP3 bytes for ``text``, from the TTS cache when this phrase was synthesized before."""
+    key = tts_key(text, language_code)
+    audio = tts_cache.get(key)
+    if audio is not None:
+        return audio
+    from google.cloud import texttospeech
     input_text = texttospeech.SynthesisInput(text=text)
     voice = texttospeech.VoiceSelectionParams(
         language_code=language_code,
-        ssml_gender=texttospeech.SsmlVoiceGender.MALE,
+        ssml_gender=texttospeech.SsmlVoiceGender[TTS_GENDER],
     )
     audio_config = texttospeech.AudioConfig(
-        audio_encoding=texttospeech.AudioEncoding.MP3,
+        audio_encoding=texttospeech.AudioEncoding[TTS_ENCODING],
     )
-    response = tts_client.synthesize_speech(
-        input=input_text, voice=voice, audio_config=audio_config
+    response = get_tts_client().synthesize_speech(
+        input=input_text, voice=voice, audio_config=audio_config, timeout=VOICE_TIMEOUT
     )
-    return base64.b64encode(response.audio_content).decode("utf-8")
\ No newline at end of file
+    tts_cache.set(key, response.audio_content)
+    return response.audio_content
+
+def synthesize_text(text: str, language_code="en-IN") -> str:
+    return base64.b64encode(synthesize_audio(text, language_code)).decode("utf-8")
+
+async def transcribe_audio_async(base64_audio: str, language_code="en-IN") -> str:
+    return await run_in_voice_pool(transcribe_audio, base64_audio, language_code)
+
+async def transcribe_bytes_async(audio_content: bytes, language_code="en-IN") -> str:
+    return await run_in_voice_pool(transcribe_bytes, audio_content, language_code)
+
+async def synthesize_audio_async(text: str, language_code="en-IN") -> bytes:
+    # Memory hits skip the worker pool altogether.
+    audio = tts_cache.get_memory(tts_key(text, language_code))
+    if audio is not None:
+        return audio
+    return await run_in_voice_pool(synthesize_audio, text, language_code)
+
+async def synthesize_text_async(text: str, language_code="en-IN") -> str:
+    return base64.b64encode(await synthesize_audio_async(text, language_code)).decode("utf-8")
+
+async def stream_transcribe_async(frames, language_code="en-IN", sample_rate_hertz=None):
+    """Stream audio ``frames`` (an async iterator of bytes) through the recognizer.
+
+    Yields ``{"type": "interim" | "final", "transcript": ...}`` while audio is
+    still arriving, then ``{"type": "done", "transcript": <all finals>}``.
+    Frames are handed to the worker as they come in, so the clip is never held
+    in memory as a whole.
+
+    Raises ``asyncio.TimeoutError`` if no stream slot frees up within
+    ``VOICE_TIMEOUT``, or the recognition outlasts ``STT_STREAM_TIMEOUT``.
+    """
+    loop = asyncio.get_running_loop()
+    audio = queue.Queue()
+    events = asyncio.Queue()
+
+    def chunks():
+        while (chunk := audio.get()) is not None:
+            yield chunk
+
+    def recognize():
+        try:
+            for event in stream_transcribe(chunks(), language_code, sample_rate_hertz):
+                loop.call_soon_threadsafe(events.put_nowait, event)
+        except Exception as e:
+            loop.call_soon_threadsafe(events.put_nowait, ("error", e))
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    async def pump():
+        try:
+            async for frame in frames:
+                audio.put(frame)
+        except Exception as e:
+            events.put_nowait(("error", e))
+        finally:
+            audio.put(None)
+
+    finals = []
+    await asyncio.wait_for(_stream_slots.acquire(), VOICE_TIMEOUT)
+    try:
+        deadline = loop.time() + STT_STREAM_TIMEOUT
+        worker = loop.run_in_executor(_stream_executor, recognize)
+        feeder = asyncio.create_task(pump())
+        try:
+            while (event := await asyncio.wait_for(events.get(), deadline - loop.time())) is not None:
+                kind, payload = event
+                if kind == "error":
+                    raise payload
+                if kind == "final":
+                    finals.append(payload.strip())
+                yield {"type": kind, "transcript": payload}
+        finally:
+            feeder.cancel()
+            audio.put(None)
+            await asyncio.gather(feeder, return_exceptions=True)
+            await asyncio.wait([worker])
+    finally:
+        _stream_slots.release()
+    yield {"type": "done", "transcript": " ".join(filter(None, finals))}